@@ -13,11 +13,12 @@ from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 import joblib
-import librosa
 import numpy as np
 from dotenv import load_dotenv
 
 from session_pipeline.audio_processing import prepare_clean_audio
+from session_pipeline.chunk_view import ChunkView
+from session_pipeline.clean_cache import default_clean_cache
 
 # Reuse the FeatureExtractor implementation from training.
 from train_speaker_classifier import FeatureExtractor, resolve_hf_token  # type: ignore
@@ -94,6 +95,11 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         default="zoom-audio",
         help="Audio preprocessing profile (defaults to zoom-audio).",
     )
+    parser.add_argument(
+        "--no-audio-cache",
+        action="store_true",
+        help="Preprocess into a temporary file instead of the shared clean-audio cache.",
+    )
     parser.add_argument(
         "--hf-token",
         help="Optional Hugging Face token for gated models (overrides environment).",
@@ -147,26 +153,27 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         sample_rate=sample_rate,
         channels=1,
         output_format="wav",
+        cache=None if args.no_audio_cache else default_clean_cache(),
     )
     try:
-        audio_wave, sr = librosa.load(clean_path, sr=sample_rate, mono=True)
+        # Memory-map the clean WAV; each block is read (and scaled to float) on demand.
+        session_view = ChunkView.whole(clean_path)
+        assignments, stats = assign_segments(
+            diarization,
+            session_view.samples(),
+            session_view.frame_rate,
+            model,
+            label_encoder,
+            extractor,
+            min_segment_seconds=args.min_segment_seconds,
+            min_confidence=args.min_confidence,
+            aggregation_seconds=args.aggregation_seconds,
+            verbose=args.verbose,
+        )
     finally:
         if temp_path and temp_path.exists():
             temp_path.unlink(missing_ok=True)
 
-    assignments, stats = assign_segments(
-        diarization,
-        audio_wave,
-        sr,
-        model,
-        label_encoder,
-        extractor,
-        min_segment_seconds=args.min_segment_seconds,
-        min_confidence=args.min_confidence,
-        aggregation_seconds=args.aggregation_seconds,
-        verbose=args.verbose,
-    )
-
     output = {
         "summary": stats,
         "model": {
@@ -266,7 +273,11 @@ def extract_clip(audio: np.ndarray, sample_rate: int, start: float, end: float)
     end_idx = min(len(audio), int(round(end * sample_rate)))
     if end_idx <= start_idx:
         return np.array([], dtype=np.float32)
-    return audio[start_idx:end_idx]
+    clip = audio[start_idx:end_idx]
+    if np.issubdtype(clip.dtype, np.integer):
+        # Integer PCM (e.g. a memory-mapped WAV) -> float32 in [-1, 1), as librosa.load returns.
+        clip = clip.astype(np.float32) / float(np.iinfo(clip.dtype).max + 1)
+    return clip
 
 
 def predict_label(model, label_encoder, feature_vector: np.ndarray) -> Tuple[str, float]:
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""
+Microbenchmark chunk boundary planning over many synthetic silences.
+
+Planning is integer arithmetic over ``(start_ms, end_ms)`` pairs, so it should
+scale linearly with the number of silence splits.
+
+Example:
+    python3 benchmarks/benchmark_combine_segments.py --silences 10000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from session_pipeline.audio import plan_chunk_spans  # noqa: E402
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--silences", type=int, default=10_000, help="Synthetic silences (default: 10000).")
+    parser.add_argument("--hours", type=float, default=4.0, help="Synthetic session length (default: 4).")
+    parser.add_argument(
+        "--max-chunk-seconds",
+        type=float,
+        nargs="+",
+        default=[60.0, 300.0, 900.0],
+        help="Chunk limits to plan for (default: 60 300 900).",
+    )
+    parser.add_argument("--repeats", type=int, default=5, help="Timed runs per limit (default: 5).")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    length_ms = int(args.hours * 3600 * 1000)
+    silences = synthetic_silences(length_ms, args.silences)
+    print(f"session: {args.hours:.1f} h, {len(silences)} silences")
+
+    for max_chunk_seconds in args.max_chunk_seconds:
+        max_chunk_ms = int(max_chunk_seconds * 1000)
+        best = float("inf")
+        spans: List = []
+        for _ in range(max(1, args.repeats)):
+            started = time.perf_counter()
+            spans = plan_chunk_spans(length_ms, silences, max_chunk_ms)
+            best = min(best, time.perf_counter() - started)
+        assert spans[0][0] == 0 and spans[-1][1] == length_ms
+        print(f"max {max_chunk_seconds:6.0f} s: {len(spans):5d} chunks planned in {best * 1000:8.2f} ms")
+    return 0
+
+
+def synthetic_silences(length_ms: int, count: int, *, seed: int = 7) -> List[Dict[str, float]]:
+    rng = random.Random(seed)
+    starts = sorted(rng.uniform(0, length_ms - 2_000) for _ in range(count))
+    return [{"start": start / 1000.0, "end": (start + rng.uniform(500, 1_500)) / 1000.0} for start in starts]
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+"""
+Compare the streaming NumPy/soundfile normaliser against the pydub implementation.
+
+Each implementation runs in its own child process so peak RSS can be reported
+alongside wall-clock time; the outputs are then compared in dBFS.
+
+Examples:
+    python3 benchmarks/benchmark_normalize.py                 # 3-hour synthetic session
+    python3 benchmarks/benchmark_normalize.py --minutes 30
+    python3 benchmarks/benchmark_normalize.py path/to/session.m4a
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import resource
+import sys
+import tempfile
+import time
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Dict, Sequence
+
+import numpy as np
+import soundfile as sf
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.benchmark_silence_detection import write_synthetic_session  # noqa: E402
+from session_pipeline.audio_processing import _normalise_audio_in_memory  # noqa: E402
+from session_pipeline.normalize import normalise_audio_streaming  # noqa: E402
+
+TARGET_DBFS = -10.0
+HEADROOM_DB = 1.0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("audio_path", nargs="?", type=Path, help="Audio to normalise (default: synthesise one).")
+    parser.add_argument("--minutes", type=float, default=180.0, help="Synthetic audio length (default: 180).")
+    parser.add_argument(
+        "--skip-pydub",
+        action="store_true",
+        help="Only run the streaming normaliser (the pydub path needs several copies of the file in RAM).",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        audio_path = args.audio_path
+        if audio_path is None:
+            audio_path = Path(tmpdir) / "synthetic.wav"
+            write_synthetic_session(audio_path, minutes=args.minutes)
+        audio_path = audio_path.expanduser().resolve()
+        duration = sf.info(str(audio_path)).duration
+
+        results: Dict[str, Dict[str, float]] = {}
+        outputs: Dict[str, Path] = {}
+        for name in ("streaming", "pydub"):
+            if name == "pydub" and args.skip_pydub:
+                continue
+            outputs[name] = Path(tmpdir) / f"{name}.wav"
+            results[name] = _run_isolated(name, audio_path, outputs[name])
+            results[name]["dbfs"] = measure_dbfs(outputs[name])
+
+    print(f"audio: {audio_path.name} ({duration / 60:.1f} min)")
+    for name, result in results.items():
+        print(
+            f"{name:10s} {result['seconds']:8.2f} s  peak RSS {result['max_rss_mb']:8.1f} MB  "
+            f"output {result['dbfs']:7.3f} dBFS"
+        )
+    if len(results) == 2:
+        print(f"speedup: {results['pydub']['seconds'] / max(results['streaming']['seconds'], 1e-9):.1f}x")
+        print(f"output difference: {abs(results['pydub']['dbfs'] - results['streaming']['dbfs']):.4f} dB")
+    return 0
+
+
+def measure_dbfs(path: Path, block_frames: int = 1 << 20) -> float:
+    """Return the RMS level of a 16-bit file in dBFS, reading it block by block."""
+
+    sum_squares = 0.0
+    samples = 0
+    for block in sf.blocks(str(path), blocksize=block_frames, dtype="int16", always_2d=True):
+        values = block.astype(np.float64)
+        sum_squares += float(np.einsum("ij,ij->", values, values))
+        samples += block.size
+    if samples == 0 or sum_squares == 0.0:
+        return -math.inf
+    return 20 * math.log10(math.sqrt(sum_squares / samples) / 32768.0)
+
+
+def _run_isolated(name: str, source: Path, output: Path) -> Dict[str, float]:
+    with get_context("spawn").Pool(1) as pool:
+        return pool.apply(_normalise_and_measure, (name, str(source), str(output)))
+
+
+def _normalise_and_measure(name: str, source: str, output: str) -> Dict[str, float]:
+    started = time.perf_counter()
+    if name == "streaming":
+        normalise_audio_streaming(
+            Path(source),
+            Path(output),
+            sample_rate=16_000,
+            channels=1,
+            output_format="wav",
+            target_dbfs=TARGET_DBFS,
+            headroom_db=HEADROOM_DB,
+        )
+    else:
+        _normalise_audio_in_memory(
+            Path(source),
+            Path(output),
+            sample_rate=16_000,
+            channels=1,
+            sample_width=2,
+            output_format="wav",
+            target_dbfs=TARGET_DBFS,
+            headroom_db=HEADROOM_DB,
+            overwrite=True,
+        )
+    elapsed = time.perf_counter() - started
+    max_rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        max_rss_kb /= 1024  # macOS reports bytes
+    return {"seconds": elapsed, "max_rss_mb": max_rss_kb / 1024.0}
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
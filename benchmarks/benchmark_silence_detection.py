@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+"""
+Compare the NumPy RMS silence detector against ffmpeg ``silencedetect``.
+
+Reports wall-clock time for each detector and how closely their silence
+midpoints (the values the chunker actually splits on) agree.
+
+Examples:
+    python3 benchmarks/benchmark_silence_detection.py --minutes 60
+    python3 benchmarks/benchmark_silence_detection.py path/to/session-clean.wav
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from session_pipeline.audio import detect_silences_ffmpeg  # noqa: E402
+from session_pipeline.silence import detect_silences_in_wav  # noqa: E402
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "audio_path",
+        nargs="?",
+        type=Path,
+        help="16 kHz mono 16-bit WAV to analyse (default: synthesise one).",
+    )
+    parser.add_argument("--minutes", type=float, default=30.0, help="Synthetic audio length (default: 30).")
+    parser.add_argument("--min-silence-ms", type=int, default=500, help="Minimum silence length (default: 500).")
+    parser.add_argument("--silence-threshold", type=int, default=-40, help="Silence threshold dBFS (default: -40).")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per detector (default: 3).")
+    parser.add_argument(
+        "--tolerance-ms",
+        type=float,
+        default=50.0,
+        help="Midpoint distance that still counts as agreement (default: 50 ms).",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        audio_path = args.audio_path
+        if audio_path is None:
+            audio_path = Path(tmpdir) / "synthetic.wav"
+            write_synthetic_session(audio_path, minutes=args.minutes)
+        audio_path = audio_path.expanduser().resolve()
+
+        kwargs = dict(silence_thresh=args.silence_threshold, min_silence_len=args.min_silence_ms)
+        ffmpeg_time, ffmpeg_ranges = _time(lambda: detect_silences_ffmpeg(audio_path, **kwargs), args.repeats)
+        numpy_time, numpy_ranges = _time(lambda: detect_silences_in_wav(audio_path, **kwargs), args.repeats)
+        with wave.open(str(audio_path), "rb") as reader:
+            duration = reader.getnframes() / reader.getframerate()
+
+    print(f"audio: {audio_path.name} ({duration / 60:.1f} min)")
+    print(f"ffmpeg silencedetect: {ffmpeg_time:8.3f} s  {len(ffmpeg_ranges):6d} silences")
+    print(f"numpy rms detector:   {numpy_time:8.3f} s  {len(numpy_ranges):6d} silences")
+    if numpy_time > 0:
+        print(f"speedup: {ffmpeg_time / numpy_time:.1f}x")
+
+    report = compare_midpoints(ffmpeg_ranges, numpy_ranges, tolerance_ms=args.tolerance_ms)
+    print(
+        f"agreement: {report['matched']}/{len(ffmpeg_ranges)} ffmpeg midpoints within "
+        f"{args.tolerance_ms:.0f} ms; mean |delta| {report['mean_ms']:.1f} ms, "
+        f"max |delta| {report['max_ms']:.1f} ms; {report['numpy_only']} numpy-only silences"
+    )
+    return 0
+
+
+def write_synthetic_session(path: Path, *, minutes: float, frame_rate: int = 16_000) -> None:
+    """Write speech-like tone bursts separated by noisy pauses, one block at a time."""
+
+    rng = np.random.default_rng(1234)
+    total_frames = int(minutes * 60 * frame_rate)
+    written = 0
+    with wave.open(str(path), "wb") as writer:
+        writer.setnchannels(1)
+        writer.setsampwidth(2)
+        writer.setframerate(frame_rate)
+        while written < total_frames:
+            burst = int(rng.uniform(0.4, 6.0) * frame_rate)
+            pause = int(rng.uniform(0.1, 2.0) * frame_rate)
+            t = np.arange(burst) / frame_rate
+            tone = 0.3 * np.sin(2 * np.pi * rng.uniform(120, 400) * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 3 * t))
+            noise = rng.normal(0.0, 10 ** (-55 / 20), burst + pause)
+            block = noise
+            block[:burst] += tone
+            block = block[: total_frames - written]
+            writer.writeframes((np.clip(block, -1.0, 1.0) * 32767).astype("<i2").tobytes())
+            written += block.shape[0]
+
+
+def compare_midpoints(
+    reference: List[Dict[str, float]],
+    candidate: List[Dict[str, float]],
+    *,
+    tolerance_ms: float,
+) -> Dict[str, float]:
+    ref = np.array([(item["start"] + item["end"]) * 500.0 for item in reference])
+    cand = np.array([(item["start"] + item["end"]) * 500.0 for item in candidate])
+    if ref.size == 0 or cand.size == 0:
+        return {"matched": 0, "mean_ms": 0.0, "max_ms": 0.0, "numpy_only": int(cand.size)}
+
+    positions = np.clip(np.searchsorted(cand, ref), 1, cand.size - 1) if cand.size > 1 else np.zeros(ref.size, int)
+    left = cand[positions - 1] if cand.size > 1 else cand[positions]
+    right = cand[positions]
+    deltas = np.minimum(np.abs(ref - left), np.abs(ref - right))
+    matched = deltas <= tolerance_ms
+    return {
+        "matched": int(matched.sum()),
+        "mean_ms": float(deltas[matched].mean()) if matched.any() else 0.0,
+        "max_ms": float(deltas[matched].max()) if matched.any() else 0.0,
+        "numpy_only": int(max(0, cand.size - matched.sum())),
+    }
+
+
+def _time(fn, repeats: int):
+    best: Optional[float] = None
+    result = None
+    for _ in range(max(1, repeats)):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best or 0.0, result
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+
+"""
+Load-test the transcription engine and chunk merge against the in-process mock backend.
+
+No audio or network is involved: each synthetic chunk is answered by
+``MockBackend`` with latency from the backend profile (scaled by
+``--latency-scale``), optional injected 429s/500s and a server-side
+concurrency limit, and the responses are merged with
+``combine_chunk_transcripts``.
+
+Examples:
+    python3 benchmarks/benchmark_transcription.py                      # 40 x 5-minute chunks
+    python3 benchmarks/benchmark_transcription.py --concurrency-limit 8 --throttle-rate 0.05
+    python3 benchmarks/benchmark_transcription.py --backend elevenlabs --chunks 6 --chunk-seconds 3600
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from session_pipeline.backends import MOCK_RESPONSES, MockBackend, MockSettings  # noqa: E402
+from session_pipeline.transcription import TranscriptionEngine  # noqa: E402
+from transcribe_with_whisper import combine_chunk_transcripts  # noqa: E402
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", choices=sorted(MOCK_RESPONSES), default="whisper", help="Profile to mimic.")
+    parser.add_argument("--chunks", type=int, default=40, help="Number of chunks (default: 40).")
+    parser.add_argument("--chunk-seconds", type=float, default=300.0, help="Audio per chunk (default: 300).")
+    parser.add_argument(
+        "--latency-scale",
+        type=float,
+        default=0.02,
+        help="Multiplier on the profile's modelled request latency (default: 0.02).",
+    )
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered 429.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 500.")
+    parser.add_argument("--concurrency-limit", type=int, help="Mock server's in-flight limit before 429s.")
+    parser.add_argument("--retry-after", type=float, default=0.2, help="Retry-After sent with 429s (default: 0.2).")
+    parser.add_argument("--max-workers", type=int, help="Engine concurrency ceiling (default: profile maximum).")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0).")
+    parser.add_argument("--verbose", action="store_true", help="Log every retry.")
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING if args.verbose else logging.ERROR, format="%(message)s")
+    backend = MockBackend(
+        MockSettings(
+            flavor=args.backend,
+            latency_scale=args.latency_scale,
+            throttle_rate=args.throttle_rate,
+            error_rate=args.error_rate,
+            concurrency_limit=args.concurrency_limit,
+            retry_after_seconds=args.retry_after,
+            seed=args.seed,
+        )
+    )
+    engine = TranscriptionEngine(backend.profile, max_concurrency=args.max_workers, backoff_base=0.1, backoff_max=2.0)
+    chunk_ms = int(args.chunk_seconds * 1000)
+    chunks = [
+        {"index": index, "start_ms": index * chunk_ms, "end_ms": (index + 1) * chunk_ms, "path": f"chunk_{index:03d}.flac"}
+        for index in range(args.chunks)
+    ]
+
+    start = time.perf_counter()
+    outcomes = engine.run(chunks, backend.transcribe)
+    transcribe_seconds = time.perf_counter() - start
+
+    succeeded = [outcome for outcome in outcomes if outcome.ok]
+    merge_seconds = 0.0
+    word_count = 0
+    if args.backend == "whisper" and succeeded:
+        start = time.perf_counter()
+        merged = combine_chunk_transcripts(
+            [{"chunk": outcome.item, "transcript": outcome.result} for outcome in succeeded],
+            session_id="benchmark",
+            method="mock",
+            manifest_path=Path("chunk_manifest.json"),
+        )
+        merge_seconds = time.perf_counter() - start
+        word_count = len(merged["words"])
+
+    profile = backend.profile
+    slowest_chunk = args.latency_scale * (
+        profile.request_overhead_seconds + profile.seconds_per_audio_second * args.chunk_seconds
+    ) * (1.0 + backend.settings.latency_jitter)
+    stats = backend.stats
+    rate = f", {profile.requests_per_minute:g} requests/min" if profile.requests_per_minute else ""
+    print(
+        f"{args.chunks} chunk(s) x {args.chunk_seconds:.0f}s via mock {args.backend} "
+        f"(concurrency {engine.initial_concurrency} -> max {engine.max_concurrency}{rate})"
+    )
+    print(f"  transcribe: {transcribe_seconds:.2f}s wall (slowest single chunk <= {slowest_chunk:.2f}s)")
+    print(
+        f"  requests: {stats.requests} ({stats.throttled} throttled, {stats.errors} failed), "
+        f"peak {stats.peak_in_flight} in flight, {len(succeeded)}/{len(outcomes)} chunk(s) succeeded"
+    )
+    if word_count:
+        print(f"  merge: {word_count} words in {merge_seconds * 1000:.1f} ms")
+    return 0 if len(succeeded) == len(outcomes) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -62,8 +62,7 @@ Usage:
         --output-dir out_dir \
         [--gap-threshold 0.25] [--force] [--raw-audio-mapping raw_mapping.csv]
 
-This script requires the Python standard library plus ``pydub`` (for computing
-chunk durations).
+Chunk durations are read from audio headers via ``session_pipeline.probe``.
 """
 
 import argparse
@@ -74,7 +73,7 @@ import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from pydub import AudioSegment
+from session_pipeline.probe import ProbeError, audio_duration_seconds
 
 SOURCE_DURATION_TOLERANCE_SECONDS = 3.0
 
@@ -319,15 +318,14 @@ def compute_audio_duration(
     audio_path: str, diar_segments: Optional[List[Tuple[str, float, float]]] = None
 ) -> float:
     """
-    Determine the duration of ``audio_path`` in seconds by decoding the file.
+    Determine the duration of ``audio_path`` in seconds from its header.
 
     Falls back to the maximum diarization end time when the audio cannot be
     loaded (and diarization segments are available).
     """
     try:
-        audio = AudioSegment.from_file(audio_path)
-        return len(audio) / 1000.0
-    except Exception as exc:
+        return audio_duration_seconds(Path(audio_path))
+    except ProbeError as exc:
         print(f"Warning: failed to load audio {audio_path} for duration: {exc}", file=sys.stderr)
     if diar_segments:
         return max((end for _, _, end in diar_segments), default=0.0)
@@ -21,8 +21,8 @@ another in the file is skipped to avoid ambiguous audio boundaries.
 Before extracting, the source audio is run through the shared Taelgar
 audio processing pipeline, allowing you to apply any of the configured
 audio profiles (passthrough, zoom‑audio, voice‑memo, etc.). The pipeline
-converts the source into a consistent WAV file that is then sliced using
-Python's ``wave`` module.
+converts the source into a consistent WAV file whose byte ranges are then
+copied out through ``session_pipeline.chunk_view.ChunkView``.
 
 Usage example:
 
@@ -44,11 +44,12 @@ import argparse
 import json
 import random
 import sys
-import wave
 from pathlib import Path
 from typing import List, Tuple, Optional
 
 from session_pipeline.audio_processing import AUDIO_PROFILES, AudioProcessingError, prepare_clean_audio
+from session_pipeline.chunk_view import ChunkView
+from session_pipeline.clean_cache import default_clean_cache
 
 
 def load_segments(path: str) -> List[Tuple[float, float]]:
@@ -94,27 +95,14 @@ def extract_wav_segment(
     output_path: Path,
 ) -> bool:
     """
-    Extract a segment from a WAV file using Python's wave module.
+    Extract a segment from a WAV file through a ``ChunkView`` byte range.
     Returns True if successful, False otherwise.
     """
     try:
-        with wave.open(str(audio_path), "rb") as wf:
-            framerate = wf.getframerate()
-            nchannels = wf.getnchannels()
-            sampwidth = wf.getsampwidth()
-            # Compute frame indices
-            start_frame = int(start * framerate)
-            end_frame = int(end * framerate)
-            if end_frame <= start_frame:
-                return False
-            wf.setpos(start_frame)
-            frames = wf.readframes(end_frame - start_frame)
-            # Write out
-            with wave.open(str(output_path), "wb") as out:
-                out.setnchannels(nchannels)
-                out.setsampwidth(sampwidth)
-                out.setframerate(framerate)
-                out.writeframes(frames)
+        view = ChunkView.from_seconds(audio_path, start, end)
+        if view.frame_count <= 0:
+            return False
+        view.write_wav(output_path)
         return True
     except Exception as exc:
         print(f"Failed to extract WAV segment {start}-{end}: {exc}", file=sys.stderr)
@@ -161,6 +149,11 @@ def main():
         default=1,
         help="Channel count for processed audio prior to extraction (default: mono).",
     )
+    parser.add_argument(
+        "--no-audio-cache",
+        action="store_true",
+        help="Preprocess into a temporary file instead of the shared clean-audio cache.",
+    )
     args = parser.parse_args()
 
     segments = load_segments(args.segments)
@@ -206,6 +199,7 @@ def main():
             sample_rate=args.sample_rate,
             channels=args.channels,
             output_format="wav",
+            cache=None if args.no_audio_cache else default_clean_cache(),
         )
     except AudioProcessingError as exc:
         print(f"Failed to preprocess audio '{audio_path}': {exc}", file=sys.stderr)
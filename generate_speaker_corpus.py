@@ -14,13 +14,15 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, Iterable, List, MutableMapping, Optional, Sequence, Tuple
 
-import soundfile as sf
 import yaml
 
 from session_pipeline.audio_processing import (
     AUDIO_PROFILES,
     prepare_clean_audio,
 )
+from session_pipeline.chunk_view import ChunkView
+from session_pipeline.clean_cache import CleanAudioCache, default_clean_cache
+from session_pipeline.probe import ProbeError, audio_duration_seconds
 
 
 DEFAULT_MIN_CLIP_SECONDS = 3.0
@@ -138,6 +140,11 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="Overwrite clips if they already exist.",
     )
+    parser.add_argument(
+        "--no-audio-cache",
+        action="store_true",
+        help="Preprocess into temporary files instead of the shared clean-audio cache.",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
@@ -284,6 +291,7 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         clip_candidates,
         config,
         overwrite=args.overwrite,
+        cache=None if args.no_audio_cache else default_clean_cache(),
     )
     write_manifest_outputs(manifest_entries, config)
     print(f"Wrote {len(manifest_entries)} clip(s) to {config.clips_dir}")
@@ -626,6 +634,7 @@ def export_clips(
     config: CorpusConfig,
     *,
     overwrite: bool,
+    cache: Optional[CleanAudioCache] = None,
 ) -> List[Dict[str, object]]:
     entries: List[Dict[str, object]] = []
     clips_by_source: Dict[Path, List[ClipCandidate]] = defaultdict(list)
@@ -643,6 +652,7 @@ def export_clips(
             channels=config.channels,
             output_format=config.clip_format,
             log_fn=log_debug if VERBOSE else None,
+            cache=cache,
         )
         clean_duration = get_audio_duration_seconds(clean_path)
         try:
@@ -702,14 +712,9 @@ def export_clips(
 
 def get_audio_duration_seconds(path: Path) -> float:
     try:
-        with sf.SoundFile(path) as handle:
-            frames = len(handle)
-            samplerate = handle.samplerate or 1
-    except RuntimeError:
-        return 0.0
-    if samplerate <= 0:
+        return audio_duration_seconds(path)
+    except ProbeError:
         return 0.0
-    return frames / float(samplerate)
 
 
 def clamp_time(value: float, max_duration: float) -> float:
@@ -727,6 +732,10 @@ def extract_clean_clip(
     duration = max(0.0, end - start)
     if duration <= 0:
         raise ValueError("Clip duration must be positive.")
+    if clean_audio.suffix.lower() == ".wav" and destination.suffix.lower() == ".wav":
+        # Copy the byte range straight out of the clean WAV; no ffmpeg process per clip.
+        ChunkView.from_seconds(clean_audio, start, end).write_wav(destination)
+        return
     extract_cmd = [
         "ffmpeg",
         "-hide_banner",
@@ -9,7 +9,7 @@ import json
 from pathlib import Path
 from typing import Any, Dict, List
 
-from pydub import AudioSegment
+from session_pipeline.probe import audio_duration_seconds
 
 
 def parse_args() -> argparse.Namespace:
@@ -56,8 +56,7 @@ def main() -> int:
     audio_paths = expand_inputs(args.audio_files)
 
     for audio_path in audio_paths:
-        audio = AudioSegment.from_file(audio_path)
-        duration = len(audio) / 1000.0
+        duration = audio_duration_seconds(audio_path)
 
         entries.append(
             {
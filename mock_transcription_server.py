@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+
+"""
+Serve OpenAI and ElevenLabs speech-to-text endpoints locally for offline benchmarking.
+
+Both APIs are answered by ``session_pipeline.backends.MockBackend``: synthetic
+(or replayed) responses after a latency modelled on the backend profile, with
+optional injected 429s, 500s and a per-server concurrency limit. Point the
+runners at it with ``--base-url``:
+
+    python3 mock_transcription_server.py --latency-scale 0.1 --concurrency-limit 12
+    python3 transcribe_with_whisper.py session.m4a ... --base-url http://127.0.0.1:8765/v1
+    python3 transcribe_with_elevenlabs.py recording.wav --base-url http://127.0.0.1:8765
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from session_pipeline.backends import MockBackend, MockHTTPError, MockSettings
+from session_pipeline.probe import ProbeError, audio_duration_seconds
+
+OPENAI_PATH_SUFFIX = "/audio/transcriptions"
+ELEVENLABS_PATH_SUFFIX = "/speech-to-text"
+
+
+class MockTranscriptionServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256  # the default backlog of 5 refuses a burst of concurrent uploads
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765).")
+    parser.add_argument(
+        "--latency-scale",
+        type=float,
+        default=1.0,
+        help="Multiplier on the backend profile's modelled latency; 0 answers immediately (default: 1).",
+    )
+    parser.add_argument(
+        "--latency-jitter",
+        type=float,
+        default=0.2,
+        help="Uniform ± fraction applied to each request's latency (default: 0.2).",
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered 500.")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Fraction of requests answered 429.")
+    parser.add_argument(
+        "--concurrency-limit",
+        type=int,
+        help="Answer 429 whenever more than this many requests per API are in flight.",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=float,
+        default=1.0,
+        help="Retry-After seconds sent with 429 responses (default: 1).",
+    )
+    parser.add_argument(
+        "--replay-dir",
+        type=Path,
+        help="Directory of recorded responses (e.g. a chunk_transcripts/ folder) to serve by file name.",
+    )
+    parser.add_argument("--seed", type=int, help="Random seed for jitter and injected failures.")
+    return parser
+
+
+def build_backends(args: argparse.Namespace) -> Dict[str, MockBackend]:
+    backends = {}
+    for flavor in ("whisper", "elevenlabs"):
+        settings = MockSettings(
+            flavor=flavor,
+            latency_scale=args.latency_scale,
+            latency_jitter=args.latency_jitter,
+            error_rate=args.error_rate,
+            throttle_rate=args.throttle_rate,
+            concurrency_limit=args.concurrency_limit,
+            retry_after_seconds=args.retry_after,
+            replay_dir=args.replay_dir,
+            seed=args.seed,
+        )
+        backends[flavor] = MockBackend(settings)
+    return backends
+
+
+def make_handler(backends: Dict[str, MockBackend]) -> type:
+    class MockTranscriptionHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self) -> None:  # noqa: N802 - http.server naming
+            path = self.path.split("?", 1)[0].rstrip("/")
+            if path.endswith(OPENAI_PATH_SUFFIX):
+                flavor = "whisper"
+            elif path.endswith(ELEVENLABS_PATH_SUFFIX):
+                flavor = "elevenlabs"
+            else:
+                self._send_json(404, {"error": {"message": f"Unknown endpoint {self.path}"}})
+                return
+
+            fields, upload = parse_multipart(self.headers.get("Content-Type", ""), self._read_body())
+            if upload is None:
+                self._send_json(400, {"error": {"message": "Missing 'file' form field."}})
+                return
+            filename, content = upload
+            try:
+                duration = upload_duration_seconds(filename, content)
+                payload = backends[flavor].respond(filename, duration)
+            except MockHTTPError as exc:
+                self._send_json(exc.status_code, _error_body(flavor, exc), headers=exc.headers)
+                return
+
+            response_format = fields.get("response_format", "json")
+            if flavor == "whisper" and response_format in ("text", "vtt", "srt"):
+                self._send_text(200, render_text(payload, response_format))
+            else:
+                self._send_json(200, payload)
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - http.server signature
+            return
+
+        def _read_body(self) -> bytes:
+            length = self.headers.get("Content-Length")
+            if length is not None:
+                return self.rfile.read(int(length))
+            chunks = []
+            while True:  # Transfer-Encoding: chunked
+                size = int(self.rfile.readline().strip() or b"0", 16)
+                if size == 0:
+                    self.rfile.readline()
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b"".join(chunks)
+
+        def _send_json(self, status: int, payload: Any, *, headers: Optional[Dict[str, str]] = None) -> None:
+            self._send(status, json.dumps(payload).encode("utf-8"), "application/json", headers)
+
+        def _send_text(self, status: int, text: str) -> None:
+            self._send(status, text.encode("utf-8"), "text/plain; charset=utf-8", None)
+
+        def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]]) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+    return MockTranscriptionHandler
+
+
+def parse_multipart(content_type: str, body: bytes) -> Tuple[Dict[str, str], Optional[Tuple[str, bytes]]]:
+    """Return the text form fields and the ``file`` upload as ``(filename, bytes)``."""
+
+    message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {content_type}\r\n\r\n".encode("latin-1") + body)
+    fields: Dict[str, str] = {}
+    upload: Optional[Tuple[str, bytes]] = None
+    if not message.is_multipart():
+        return fields, upload
+    for part in message.iter_parts():
+        name = part.get_param("name", header="content-disposition")
+        payload = part.get_payload(decode=True) or b""
+        if name == "file":
+            upload = (part.get_filename() or "upload.bin", payload)
+        elif name:
+            fields[str(name)] = payload.decode("utf-8", errors="replace")
+    return fields, upload
+
+
+def upload_duration_seconds(filename: str, content: bytes) -> float:
+    with tempfile.TemporaryDirectory(prefix="mock-stt-") as temp_dir:
+        path = Path(temp_dir) / Path(filename).name
+        path.write_bytes(content)
+        try:
+            return audio_duration_seconds(path)
+        except ProbeError as exc:
+            raise MockHTTPError(400, f"Unreadable audio: {exc}") from exc
+
+
+def render_text(payload: Dict[str, Any], response_format: str) -> str:
+    if response_format == "text":
+        return payload.get("text", "")
+    separator = "," if response_format == "srt" else "."
+    lines = ["WEBVTT", ""] if response_format == "vtt" else []
+    for index, segment in enumerate(payload.get("segments") or [], start=1):
+        if response_format == "srt":
+            lines.append(str(index))
+        start = _timestamp(segment["start"], separator)
+        end = _timestamp(segment["end"], separator)
+        lines.extend([f"{start} --> {end}", segment.get("text", ""), ""])
+    return "\n".join(lines)
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def _error_body(flavor: str, exc: MockHTTPError) -> Dict[str, Any]:
+    if flavor == "whisper":
+        kind = "rate_limit_exceeded" if exc.status_code == 429 else "server_error"
+        return {"error": {"message": str(exc), "type": kind, "code": kind}}
+    return {"detail": {"status": "too_many_concurrent_requests" if exc.status_code == 429 else "error", "message": str(exc)}}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    backends = build_backends(args)
+    server = MockTranscriptionServer((args.host, args.port), make_handler(backends))
+    host, port = server.server_address[:2]
+    print(f"Mock transcription server on http://{host}:{port} (OpenAI: /v1{OPENAI_PATH_SUFFIX}, ElevenLabs: /v1{ELEVENLABS_PATH_SUFFIX})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        for flavor, backend in backends.items():
+            stats = backend.stats
+            print(
+                f"{flavor}: {stats.requests} request(s), {stats.throttled} throttled, {stats.errors} error(s), "
+                f"{stats.replayed} replayed, peak {stats.peak_in_flight} in flight",
+                file=sys.stderr,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -3,16 +3,32 @@
 from __future__ import annotations
 
 import argparse
+import os
+import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List
+from typing import Any, Callable, Collection, Dict, Iterable, List, Optional, Sequence, Tuple
 
+from session_pipeline.analysis import AudioAnalysis, analysis_sidecar_path, load_or_analyze
 from session_pipeline.audio_processing import (
     AUDIO_PROFILES,
+    AUTO_PROFILE,
     AudioProcessingError,
+    OutputSpec,
     SUPPORTED_OUTPUT_FORMATS,
     preprocess_audio_file,
+    recommend_profile,
+    resolve_profile,
+    warm_asset_cache,
 )
+from session_pipeline.ffmpeg_runner import FFmpegProgress
+from session_pipeline.io_utils import sha256_file
+from session_pipeline.parallel_filter import DEFAULT_PREROLL_SECONDS
+from session_pipeline.preprocess_state import STATE_FILE_NAME, PreprocessState, settings_key
+from session_pipeline.probe import ProbeError, audio_duration_seconds as probe_duration_seconds
 
 AUDIO_EXTENSIONS = {
     ".wav",
@@ -28,6 +44,18 @@ AUDIO_EXTENSIONS = {
     ".mov",
     ".m4v",
 }
+CLEAN_RENDITION_PATTERN = re.compile(r"-clean(-\d+hz-\d+ch)?$")
+
+
+@dataclass(frozen=True)
+class FileResult:
+    source: Path
+    output: Path
+    elapsed_seconds: float
+    audio_seconds: float = 0.0
+    error: Optional[str] = None
+    profile: Optional[str] = None
+    source_sha256: Optional[str] = None
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -36,15 +64,34 @@ def build_parser() -> argparse.ArgumentParser:
     )
     parser.add_argument(
         "inputs",
-        nargs="+",
+        nargs="*",
         type=Path,
         help="Audio file(s) or directories containing audio files.",
     )
+    parser.add_argument(
+        "--warm-cache",
+        action="store_true",
+        help=(
+            "Resolve every model the profiles need (search path, then download) before processing; "
+            "may be run without inputs to pre-stage a worker."
+        ),
+    )
     parser.add_argument(
         "--audio-profile",
-        choices=sorted(AUDIO_PROFILES.keys()),
+        choices=sorted(AUDIO_PROFILES.keys()) + [AUTO_PROFILE],
         default="voice-memo",
-        help="Processing profile to apply (default: voice-memo).",
+        help=(
+            "Processing profile to apply (default: voice-memo). 'auto' picks zoom-audio or voice-memo "
+            "per file from its cached loudness/noise analysis."
+        ),
+    )
+    parser.add_argument(
+        "--analyze",
+        action="store_true",
+        help=(
+            "Only analyse the inputs: print loudness, peak, noise floor, SNR, clipping and speech activity "
+            "with the recommended profile, caching each report in <file>.analysis.json."
+        ),
     )
     parser.add_argument(
         "--output-dir",
@@ -69,6 +116,17 @@ def build_parser() -> argparse.ArgumentParser:
         default=1,
         help="Target channel count (1=mono, 2=stereo). Default: 1.",
     )
+    parser.add_argument(
+        "--extra-output",
+        action="append",
+        default=[],
+        type=parse_output_spec,
+        metavar="FORMAT[:RATE[:CHANNELS]]",
+        help=(
+            "Also write this rendition from the same ffmpeg pass (repeatable), e.g. flac:44100:2. "
+            "Saved as <stem>-clean-<rate>hz-<channels>ch.<format>; rate and channels default to the primary output's."
+        ),
+    )
     parser.add_argument(
         "--bit-depth",
         type=int,
@@ -81,6 +139,30 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Overwrite outputs that already exist.",
     )
+    parser.add_argument(
+        "--no-state",
+        action="store_true",
+        help=(
+            f"Do not read or update the {STATE_FILE_NAME} manifest in each output directory "
+            "(by default files already processed with the same settings and unchanged since are skipped)."
+        ),
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of files to preprocess concurrently (default: 1).",
+    )
+    parser.add_argument(
+        "--ffmpeg-timeout",
+        type=float,
+        help="Kill and fail any single ffmpeg run that takes longer than this many seconds.",
+    )
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Show live ffmpeg progress on stderr (ignored with --jobs > 1).",
+    )
     parser.add_argument(
         "--recursive",
         action="store_true",
@@ -108,7 +190,33 @@ def build_parser() -> argparse.ArgumentParser:
     advanced.add_argument(
         "--rnnoise-model",
         type=Path,
-        help="Explicit path to an rnnoise model when using voice-memo (defaults to cached std.rnnn).",
+        help=(
+            "Explicit path to an rnnoise model when using voice-memo (defaults to std.rnnn from "
+            "$TAELGAR_RNNOISE_MODEL, $TAELGAR_RNNOISE_PATH, session_pipeline/models, then the download cache)."
+        ),
+    )
+    advanced.add_argument(
+        "--segment-jobs",
+        type=int,
+        default=1,
+        help=(
+            "Split each file at silences and run the filter chain on the segments in this many "
+            "parallel ffmpeg processes (default: 1, single pass)."
+        ),
+    )
+    advanced.add_argument(
+        "--segment-preroll",
+        type=float,
+        default=DEFAULT_PREROLL_SECONDS,
+        help=(
+            "Seconds of neighbouring audio filtered (then discarded) on each side of a segment so "
+            f"dynaudnorm and the compressor settle (default: {DEFAULT_PREROLL_SECONDS:g})."
+        ),
+    )
+    advanced.add_argument(
+        "--seam-report",
+        action="store_true",
+        help="With --segment-jobs, also run the single-pass chain and write <output>.seams.json comparing the seams.",
     )
 
     return parser
@@ -118,49 +226,295 @@ def main(argv: List[str] | None = None) -> int:
     parser = build_parser()
     args = parser.parse_args(argv)
 
+    if args.warm_cache:
+        try:
+            warm_asset_cache(log_fn=print)
+        except AudioProcessingError as exc:
+            print(f"[error] {exc}", file=sys.stderr)
+            return 1
+        if not args.inputs:
+            return 0
+    elif not args.inputs:
+        parser.error("At least one input is required (or pass --warm-cache).")
+
     files = list(collect_audio_files(args.inputs, recursive=args.recursive))
     if not files:
         parser.error("No audio files found for the provided inputs.")
 
     output_dir = args.output_dir.expanduser().resolve() if args.output_dir else None
-    bit_depth_bytes = args.bit_depth // 8
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1.")
+    if args.segment_jobs < 1:
+        parser.error("--segment-jobs must be at least 1.")
+    if args.segment_preroll < 0:
+        parser.error("--segment-preroll must be non-negative.")
+
+    options: Dict[str, Any] = {
+        "profile": args.audio_profile,
+        "sample_rate": args.sample_rate,
+        "channels": args.channels,
+        "sample_width": args.bit_depth // 8,
+        "output_format": args.output_format,
+        "overwrite": args.overwrite,
+        "highpass": args.highpass,
+        "lowpass": args.lowpass,
+        "disable_denoise": args.disable_denoise,
+        "disable_dynaudnorm": args.disable_dynaudnorm,
+        "disable_compression": args.disable_compression,
+        "rnnoise_model_path": args.rnnoise_model,
+        "segment_jobs": args.segment_jobs,
+        "segment_preroll_seconds": args.segment_preroll,
+        "seam_report": args.seam_report,
+        "ffmpeg_timeout": args.ffmpeg_timeout,
+        "show_progress": args.progress and args.jobs == 1,
+        "extra_output_specs": [
+            (fmt, rate or args.sample_rate, channels or args.channels) for fmt, rate, channels in args.extra_output
+        ],
+    }
+
+    if args.analyze:
+        return analyze_files(files)
+
+    use_state = not args.no_state
+    settings = settings_key(state_settings(options))
+    states: Dict[Path, PreprocessState] = {}
+    source_stats: Dict[Path, os.stat_result] = {}
+    stale: set = set()
+    skipped = 0
+    jobs = []
+    for path in files:
+        target_dir = output_dir or path.parent
+        target_dir.mkdir(parents=True, exist_ok=True)
+        output = target_dir / f"{path.stem}-clean.{args.output_format}"
+        if use_state:
+            state = states.get(target_dir) or PreprocessState.load(target_dir / STATE_FILE_NAME)
+            states[target_dir] = state
+            stat = path.stat()
+            if not args.overwrite and state.is_current(path, stat, settings, job_outputs(output, options)):
+                skipped += 1
+                continue
+            if state.has_entry(path):
+                stale.add(path)  # changed since its recorded run: replace the old outputs
+            source_stats[path] = stat
+        jobs.append((path, output))
+    for state in states.values():
+        state.save()  # persists refreshed mtimes of touched-but-unchanged files
+    if skipped:
+        print(f"Skipped {skipped} unchanged file(s) recorded in {STATE_FILE_NAME}.")
 
+    failures = 0
+    processed: List[FileResult] = []
+    wall_start = time.perf_counter()
+    run_options = dict(options, hash_source=use_state)
+    for result in run_preprocess_jobs(jobs, run_options, max_workers=args.jobs, overwrite=stale):
+        if result.error is not None:
+            failures += 1
+            print(f"[error] {result.source}: {result.error}", file=sys.stderr)
+            continue
+        processed.append(result)
+        if use_state and result.source_sha256:
+            state = states[result.output.parent]
+            state.record(
+                result.source,
+                source_stats[result.source],
+                sha256=result.source_sha256,
+                settings=settings,
+                profile=result.profile,
+                outputs=job_outputs(result.output, options),
+            )
+            state.save()
+        chosen = f" [{result.profile}]" if args.audio_profile == AUTO_PROFILE else ""
+        print(
+            f"{result.source} -> {result.output}{chosen} "
+            f"({result.audio_seconds / 60:.1f} min audio in {result.elapsed_seconds:.1f}s)"
+        )
+    wall_seconds = time.perf_counter() - wall_start
+
+    if processed:
+        print(format_throughput(processed, wall_seconds, jobs=args.jobs))
+
+    if failures:
+        print(f"{failures} file(s) failed.", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+def run_preprocess_jobs(
+    jobs: Sequence[Tuple[Path, Path]],
+    options: Dict[str, Any],
+    *,
+    max_workers: int = 1,
+    overwrite: Collection[Path] = (),
+) -> Iterable[FileResult]:
+    """
+    Preprocess each ``(source, output)`` pair, yielding results as files finish.
+
+    With ``max_workers`` > 1 files run in a bounded process pool (the normalize
+    profile is CPU-bound Python, the ffmpeg profiles spawn one encoder each).
+    ``AudioProcessingError`` is reported on the result instead of raised, so one
+    bad file never stops the batch. Sources in ``overwrite`` replace their
+    outputs regardless of ``options["overwrite"]``.
+    """
+
+    def options_for(source: Path) -> Dict[str, Any]:
+        return dict(options, overwrite=True) if source in overwrite else options
+
+    if max_workers <= 1 or len(jobs) <= 1:
+        for source, output in jobs:
+            yield _preprocess_one(source, output, options_for(source))
+        return
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+        futures = [
+            executor.submit(_preprocess_one, source, output, options_for(source)) for source, output in jobs
+        ]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _preprocess_one(source: Path, output: Path, options: Dict[str, Any]) -> FileResult:
+    started = time.perf_counter()
+    kwargs = dict(options)
+    source_sha256 = sha256_file(source) if kwargs.pop("hash_source", False) else None
+    if kwargs.pop("seam_report", False):
+        kwargs["seam_report_path"] = output.with_suffix(".seams.json")
+    kwargs["extra_outputs"] = [
+        OutputSpec(extra_output_path(output, fmt, rate, channels), sample_rate=rate, channels=channels, output_format=fmt)
+        for fmt, rate, channels in kwargs.pop("extra_output_specs", [])
+    ]
+    if kwargs.pop("show_progress", False):
+        kwargs["progress_fn"] = progress_printer(source, audio_duration_seconds(source))
+    try:
+        kwargs["profile"] = resolve_profile(source, kwargs["profile"])
+        preprocess_audio_file(source, output, **kwargs)
+    except AudioProcessingError as exc:
+        return FileResult(source, output, time.perf_counter() - started, error=str(exc))
+    elapsed = time.perf_counter() - started
+    return FileResult(
+        source,
+        output,
+        elapsed,
+        audio_seconds=audio_duration_seconds(output),
+        profile=kwargs["profile"],
+        source_sha256=source_sha256,
+    )
+
+
+def analyze_files(files: Sequence[Path]) -> int:
     failures = 0
     for path in files:
         try:
-            target_dir = output_dir or path.parent
-            target_dir.mkdir(parents=True, exist_ok=True)
-            output_path = target_dir / f"{path.stem}-clean.{args.output_format}"
-
-            preprocess_audio_file(
-                path,
-                output_path,
-                profile=args.audio_profile,
-                sample_rate=args.sample_rate,
-                channels=args.channels,
-                sample_width=bit_depth_bytes,
-                output_format=args.output_format,
-                overwrite=args.overwrite,
-                highpass=args.highpass,
-                lowpass=args.lowpass,
-                disable_denoise=args.disable_denoise,
-                disable_dynaudnorm=args.disable_dynaudnorm,
-                disable_compression=args.disable_compression,
-                rnnoise_model_path=args.rnnoise_model,
-            )
-            print(f"{path} -> {output_path}")
-        except AudioProcessingError as exc:
+            analysis = load_or_analyze(path)
+        except RuntimeError as exc:
             failures += 1
             print(f"[error] {path}: {exc}", file=sys.stderr)
-
+            continue
+        print(f"{path}: {format_analysis(analysis)} -> {recommend_profile(analysis)}")
+        print(f"  report: {analysis_sidecar_path(path)}")
     if failures:
         print(f"{failures} file(s) failed.", file=sys.stderr)
         return 1
-
     return 0
 
 
+def format_analysis(analysis: AudioAnalysis) -> str:
+    def fmt(value: Optional[float], unit: str) -> str:
+        return f"{value:.1f} {unit}" if value is not None else "n/a"
+
+    return (
+        f"{analysis.duration_seconds / 60:.1f} min, "
+        f"integrated {fmt(analysis.integrated_lufs, 'LUFS')}, "
+        f"peak {fmt(analysis.peak_dbfs, 'dBFS')}, "
+        f"noise floor {fmt(analysis.noise_floor_dbfs, 'dBFS')}, "
+        f"SNR {fmt(analysis.snr_db, 'dB')}, "
+        f"clipping {analysis.clipping_ratio * 100:.3f}%, "
+        f"speech {analysis.speech_activity_percent:.1f}%"
+    )
+
+
+def state_settings(options: Dict[str, Any]) -> Dict[str, Any]:
+    """The subset of ``options`` that changes what gets written (the manifest's settings key)."""
+
+    ignored = {"overwrite", "show_progress", "ffmpeg_timeout", "seam_report", "hash_source"}
+    return {key: value for key, value in options.items() if key not in ignored}
+
+
+def job_outputs(output: Path, options: Dict[str, Any]) -> List[Path]:
+    return [output] + [
+        extra_output_path(output, fmt, rate, channels) for fmt, rate, channels in options.get("extra_output_specs", [])
+    ]
+
+
+def parse_output_spec(value: str) -> Tuple[str, Optional[int], Optional[int]]:
+    """Parse ``FORMAT[:RATE[:CHANNELS]]`` for ``--extra-output``."""
+
+    parts = value.split(":")
+    if not 1 <= len(parts) <= 3 or parts[0] not in SUPPORTED_OUTPUT_FORMATS:
+        raise argparse.ArgumentTypeError(
+            f"expected FORMAT[:RATE[:CHANNELS]] with FORMAT in {sorted(SUPPORTED_OUTPUT_FORMATS)}, got '{value}'"
+        )
+    try:
+        numbers = [int(part) if part else None for part in parts[1:]]
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(f"invalid rate/channels in '{value}'") from exc
+    numbers += [None] * (2 - len(numbers))
+    return parts[0], numbers[0], numbers[1]
+
+
+def extra_output_path(primary: Path, output_format: str, sample_rate: int, channels: int) -> Path:
+    return primary.with_name(f"{primary.stem}-{sample_rate}hz-{channels}ch.{output_format}")
+
+
+def progress_printer(source: Path, total_seconds: float) -> Callable[[FFmpegProgress], None]:
+    """Return an ffmpeg progress callback that redraws one status line on stderr."""
+
+    def report(progress: FFmpegProgress) -> None:
+        done = f"{progress.out_seconds / 60:.1f}"
+        if total_seconds > 0:
+            done += f"/{total_seconds / 60:.1f} min ({min(100.0, 100 * progress.out_seconds / total_seconds):.0f}%)"
+        else:
+            done += " min"
+        speed = f", {progress.speed:.0f}x" if progress.speed else ""
+        end = "\n" if progress.done else ""
+        print(f"\r{source.name}: {done}{speed}", end=end, file=sys.stderr, flush=True)
+
+    return report
+
+
+def audio_duration_seconds(path: Path) -> float:
+    """Return the duration of ``path`` in seconds, or 0.0 if it cannot be probed."""
+
+    try:
+        return probe_duration_seconds(path)
+    except ProbeError:
+        return 0.0
+
+
+def format_throughput(results: List[FileResult], wall_seconds: float, *, jobs: int) -> str:
+    """Summarise a batch as audio-hours processed per wall-clock hour."""
+
+    audio_hours = sum(result.audio_seconds for result in results) / 3600.0
+    wall_hours = max(wall_seconds, 1e-9) / 3600.0
+    busy_seconds = sum(result.elapsed_seconds for result in results)
+    return (
+        f"Processed {len(results)} file(s): {audio_hours:.2f} audio-hours in "
+        f"{wall_seconds:.1f}s wall ({audio_hours / wall_hours:.1f} audio-hours/wall-hour, "
+        f"{busy_seconds:.1f}s busy across {jobs} job(s))"
+    )
+
+
 def collect_audio_files(inputs: Iterable[Path], *, recursive: bool) -> Iterable[Path]:
+    """
+    Yield the audio files named by ``inputs``, walking directories.
+
+    Files found by walking a directory are skipped when they are this script's
+    own outputs: anything recorded as an output in a ``.preprocess_state.json``
+    beside it, or named like a ``<stem>-clean`` rendition. Files passed
+    explicitly are always yielded.
+    """
+
+    recorded: Dict[Path, Collection[Path]] = {}
     for entry in inputs:
         path = entry.expanduser().resolve()
         if path.is_file() and path.suffix.lower() in AUDIO_EXTENSIONS:
@@ -168,8 +522,19 @@ def collect_audio_files(inputs: Iterable[Path], *, recursive: bool) -> Iterable[
         elif path.is_dir():
             iterator = path.rglob("*") if recursive else path.iterdir()
             for child in iterator:
-                if child.is_file() and child.suffix.lower() in AUDIO_EXTENSIONS:
-                    yield child
+                if not child.is_file() or child.suffix.lower() not in AUDIO_EXTENSIONS:
+                    continue
+                if child.parent not in recorded:
+                    recorded[child.parent] = PreprocessState.load(child.parent / STATE_FILE_NAME).recorded_outputs()
+                if child in recorded[child.parent] or is_clean_rendition(child):
+                    continue
+                yield child
+
+
+def is_clean_rendition(path: Path) -> bool:
+    """True for names this script writes: ``<stem>-clean.<ext>`` and ``<stem>-clean-<rate>hz-<n>ch.<ext>``."""
+
+    return CLEAN_RENDITION_PATTERN.search(path.stem) is not None
 
 
 if __name__ == "__main__":
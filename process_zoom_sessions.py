@@ -10,9 +10,9 @@ import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from pydub import AudioSegment
 from webvtt import Caption, WebVTT
 
+from session_pipeline.probe import ProbeError, audio_duration_seconds
 from session_pipeline.runner_utils import move_file, prompt_for_roster_edit, run_cli
 from session_pipeline.time_utils import format_timestamp, parse_vtt_timestamp
 
@@ -267,9 +267,8 @@ def find_matching_audio(vtt_path: Path) -> Optional[Path]:
 
 def get_audio_duration_seconds(audio_path: Path) -> Optional[float]:
     try:
-        audio = AudioSegment.from_file(audio_path)
-        return len(audio) / 1000.0
-    except Exception as exc:  # pragma: no cover - best-effort logging
+        return audio_duration_seconds(audio_path)
+    except ProbeError as exc:  # pragma: no cover - best-effort logging
         print(f"[warn] Failed to inspect {audio_path}: {exc}")
         return None
 
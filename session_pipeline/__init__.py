@@ -6,10 +6,12 @@ top-level task scripts can stay concise and easy to test.
 """
 
 from .audio import chunk_audio_file  # noqa: F401
+from .chunk_view import ChunkView  # noqa: F401
 from .chunking import prepare_audio_chunks  # noqa: F401
 from .transcription import transcribe_audio_chunks  # noqa: F401
 
 __all__ = [
+    "ChunkView",
     "chunk_audio_file",
     "prepare_audio_chunks",
     "transcribe_audio_chunks",
@@ -0,0 +1,228 @@
+"""Single-decode loudness and quality analysis with hash-keyed JSON sidecars."""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+import subprocess
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+
+from session_pipeline.ffmpeg_runner import FFmpegProcess
+from session_pipeline.io_utils import sha256_file, write_json
+
+ANALYSIS_VERSION = 1
+ANALYSIS_SAMPLE_RATE = 16_000
+ANALYSIS_WINDOW_MS = 50
+ANALYSIS_BLOCK_FRAMES = 1 << 19
+SIDECAR_SUFFIX = ".analysis.json"
+CLIP_LEVEL = 32_700  # within ~0.02 dB of full scale
+SILENT_WINDOW_DBFS = -120.0
+NOISE_FLOOR_PERCENTILE = 10
+SPEECH_LEVEL_PERCENTILE = 90
+SPEECH_MARGIN_DB = 12.0
+SPEECH_MIN_DBFS = -55.0
+
+_EBUR128_RE = {
+    "integrated_lufs": re.compile(r"^\s*I:\s+(-?[\d.]+|-inf)\s+LUFS", re.MULTILINE),
+    "loudness_range_lu": re.compile(r"^\s*LRA:\s+(-?[\d.]+)\s+LU", re.MULTILINE),
+}
+
+
+@dataclass(frozen=True)
+class AudioAnalysis:
+    duration_seconds: float
+    integrated_lufs: Optional[float]
+    loudness_range_lu: Optional[float]
+    peak_dbfs: Optional[float]
+    noise_floor_dbfs: Optional[float]
+    speech_level_dbfs: Optional[float]
+    snr_db: Optional[float]
+    clipping_ratio: float
+    speech_activity_percent: float
+
+
+def analysis_available() -> bool:
+    return np is not None
+
+
+def analyze_audio(source_path: Path, *, block_frames: int = ANALYSIS_BLOCK_FRAMES) -> AudioAnalysis:
+    """
+    Measure ``source_path`` in one streaming ffmpeg decode.
+
+    ffmpeg's ``ebur128`` filter reports integrated loudness (LUFS) and loudness
+    range on the source while the same process streams mono 16 kHz PCM to this
+    process. Block by block, NumPy computes the sample peak, the clipping ratio
+    and a 50 ms RMS envelope. The noise floor is the envelope's 10th percentile
+    and the speech level its 90th. SNR is the difference between them. Speech
+    activity is the share of windows at least 12 dB above the floor.
+    """
+
+    if np is None:
+        raise RuntimeError("NumPy is required for audio analysis.")
+
+    cmd = [
+        "-i",
+        str(source_path),
+        "-af",
+        "ebur128=framelog=quiet",
+        "-ac",
+        "1",
+        "-ar",
+        str(ANALYSIS_SAMPLE_RATE),
+        "-f",
+        "s16le",
+        "-acodec",
+        "pcm_s16le",
+        "pipe:1",
+    ]
+    window = ANALYSIS_SAMPLE_RATE * ANALYSIS_WINDOW_MS // 1000
+    envelopes: List[Any] = []
+    peak = 0
+    clipped = 0
+    samples = 0
+    pending = np.zeros(0, dtype=np.int16)
+    summary: List[str] = []
+
+    def collect_summary(line: str) -> None:
+        if summary or "Summary:" in line:
+            summary.append(line)
+
+    with FFmpegProcess(cmd, stdout=subprocess.PIPE, on_stderr_line=collect_summary) as process:
+        assert process.stdout is not None
+        while True:
+            data = process.stdout.read(block_frames * 2)
+            if not data:
+                break
+            block = np.frombuffer(data[: len(data) - len(data) % 2], dtype="<i2")
+            magnitudes = np.abs(block.astype(np.int32))
+            if len(magnitudes):
+                peak = max(peak, int(magnitudes.max()))
+            clipped += int(np.count_nonzero(magnitudes >= CLIP_LEVEL))
+            samples += len(block)
+            block = np.concatenate([pending, block])
+            usable = len(block) - len(block) % window
+            pending = block[usable:]
+            envelopes.append(_window_dbfs(block[:usable], window))
+        process.wait()
+    if len(pending):
+        envelopes.append(_window_dbfs(pending, len(pending)))
+
+    envelope = np.concatenate(envelopes) if envelopes else np.zeros(0)
+    noise_floor = speech_level = None
+    activity = 0.0
+    if len(envelope):
+        noise_floor = float(np.percentile(envelope, NOISE_FLOOR_PERCENTILE))
+        speech_level = float(np.percentile(envelope, SPEECH_LEVEL_PERCENTILE))
+        threshold = max(noise_floor + SPEECH_MARGIN_DB, SPEECH_MIN_DBFS)
+        activity = 100.0 * float(np.count_nonzero(envelope >= threshold)) / len(envelope)
+
+    loudness = _parse_ebur128("\n".join(summary))
+    return AudioAnalysis(
+        duration_seconds=round(samples / ANALYSIS_SAMPLE_RATE, 3),
+        integrated_lufs=loudness.get("integrated_lufs"),
+        loudness_range_lu=loudness.get("loudness_range_lu"),
+        peak_dbfs=_round(20 * math.log10(peak / 32768.0)) if peak else None,
+        noise_floor_dbfs=_round(noise_floor),
+        speech_level_dbfs=_round(speech_level),
+        snr_db=_round(speech_level - noise_floor) if noise_floor is not None and speech_level is not None else None,
+        clipping_ratio=round(clipped / samples, 6) if samples else 0.0,
+        speech_activity_percent=round(activity, 1),
+    )
+
+
+def analysis_sidecar_path(source_path: Path) -> Path:
+    source_path = Path(source_path)
+    return source_path.with_name(f"{source_path.name}{SIDECAR_SUFFIX}")
+
+
+def load_or_analyze(
+    source_path: Path,
+    *,
+    sidecar_path: Optional[Path] = None,
+    refresh: bool = False,
+) -> AudioAnalysis:
+    """
+    Return the analysis of ``source_path``, reusing its JSON sidecar when current.
+
+    The sidecar (``<name>.analysis.json`` beside the source by default) records
+    the source SHA-256. It is only trusted when that hash and
+    ``ANALYSIS_VERSION`` match, so an edited or replaced recording is measured
+    again.
+    """
+
+    source_path = Path(source_path)
+    sidecar_path = Path(sidecar_path) if sidecar_path else analysis_sidecar_path(source_path)
+    digest = sha256_file(source_path)
+    if not refresh:
+        cached = _read_sidecar(sidecar_path, digest)
+        if cached is not None:
+            return cached
+
+    analysis = analyze_audio(source_path)
+    payload: Dict[str, Any] = {
+        "version": ANALYSIS_VERSION,
+        "source": source_path.name,
+        "source_sha256": digest,
+        "analysis": asdict(analysis),
+    }
+    try:
+        write_json(sidecar_path, payload)
+    except OSError:
+        pass  # read-only source directories just skip the cache
+    return analysis
+
+
+def _read_sidecar(sidecar_path: Path, digest: str) -> Optional[AudioAnalysis]:
+    try:
+        payload = json.loads(sidecar_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if payload.get("version") != ANALYSIS_VERSION or payload.get("source_sha256") != digest:
+        return None
+    try:
+        return AudioAnalysis(**payload["analysis"])
+    except (KeyError, TypeError):
+        return None
+
+
+def _window_dbfs(samples: Any, window: int) -> Any:
+    if not len(samples):
+        return np.zeros(0)
+    frames = samples.astype(np.float64).reshape(-1, window)
+    mean_square = np.einsum("ij,ij->i", frames, frames) / window
+    with np.errstate(divide="ignore"):
+        levels = 10 * np.log10(mean_square / (32768.0**2))
+    return np.maximum(levels, SILENT_WINDOW_DBFS)
+
+
+def _parse_ebur128(stderr: str) -> Dict[str, Optional[float]]:
+    summary = stderr.rpartition("Summary:")[2]
+    values: Dict[str, Optional[float]] = {}
+    for name, pattern in _EBUR128_RE.items():
+        match = pattern.search(summary)
+        if match and match.group(1) != "-inf":
+            values[name] = float(match.group(1))
+        else:
+            values[name] = None
+    return values
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+__all__ = [
+    "AudioAnalysis",
+    "analysis_available",
+    "analysis_sidecar_path",
+    "analyze_audio",
+    "load_or_analyze",
+]
@@ -1,9 +1,42 @@
 import subprocess
+import wave
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type
 
 from pydub import AudioSegment
 
+from session_pipeline.ffmpeg_runner import FFmpegProcess, SilenceEventParser, detect_silences, run_ffmpeg
+from session_pipeline.silence import (
+    SILENCE_DETECTORS,
+    detect_silences_in_wav,
+    detect_silences_numpy,
+    pcm_to_array,
+)
+
+CHUNK_FRAME_RATE = 16_000
+CHUNK_CHANNELS = 1
+CHUNK_SAMPLE_WIDTH = 2
+STREAM_BLOCK_FRAMES = CHUNK_FRAME_RATE * 30  # 30 s of 16 kHz mono per read
+
+
+@dataclass(frozen=True)
+class ChunkFormat:
+    extension: str
+    codec: str  # ffmpeg encoder
+    container: str  # ffmpeg muxer
+    lossless: bool = True
+
+
+CHUNK_FORMATS: Dict[str, ChunkFormat] = {
+    "wav": ChunkFormat(extension=".wav", codec="pcm_s16le", container="wav"),
+    "flac": ChunkFormat(extension=".flac", codec="flac", container="flac"),
+    # Ogg-wrapped Opus; ".ogg" is an extension every upload endpoint accepts.
+    "opus": ChunkFormat(extension=".ogg", codec="libopus", container="ogg", lossless=False),
+}
+DEFAULT_OPUS_BITRATE = "32k"
+
 
 def chunk_audio_file(
     source_path: Path,
@@ -13,6 +46,12 @@ def chunk_audio_file(
     chunk_basename: Optional[str] = None,
     min_silence_len: int = 500,
     silence_thresh: int = -40,
+    streaming: bool = False,
+    max_workers: int = 1,
+    silence_detector: str = "ffmpeg",
+    overlap_seconds: float = 0.0,
+    chunk_format: str = "wav",
+    chunk_bitrate: Optional[str] = None,
 ) -> List[Dict[str, object]]:
     """
     Split ``source_path`` into audio chunks using silence midpoints and size limits.
@@ -21,10 +60,37 @@ def chunk_audio_file(
         1. Use FFmpeg ``silencedetect`` to find silence intervals (in seconds).
         2. Convert each silence to an exact midpoint (ms) and treat those as boundaries.
         3. Merge adjacent pieces until ``max_chunk_seconds`` would be exceeded.
-        4. Export each chunk as 16 kHz mono PCM WAV.
+        4. Export each chunk as 16 kHz mono audio in ``chunk_format``.
 
     Because the boundaries are midpoints, the exported chunks cover the source audio
     exactly—no samples are trimmed or duplicated.
+
+    When ``streaming`` is True the source is decoded exactly once and never held
+    in memory: a single ffmpeg pass produces the 16 kHz mono PCM stream and its
+    silence ranges, and each chunk is copied from that stream through a bounded
+    buffer. Peak memory is then independent of the session length, and for
+    16 kHz mono sources the chunks and metadata are byte-identical to the
+    in-memory path.
+
+    ``max_workers`` > 1 exports chunks concurrently (a process pool for the
+    in-memory resample/export, threads for the streaming frame copies). File
+    names and the order of the returned entries do not depend on it.
+
+    ``silence_detector`` selects how silences are found in step 1: ``"ffmpeg"``
+    (``silencedetect``) or ``"numpy"``, a vectorised RMS-energy detector that
+    reads samples already in memory or memory-maps 16 kHz mono WAVs, so it never
+    adds a decode of its own.
+
+    ``overlap_seconds`` > 0 pads every exported chunk with that much neighbouring
+    audio on each side (clamped to the source). ``start_ms``/``end_ms`` then
+    describe the padded audio actually written, and ``overlap_before_ms`` /
+    ``overlap_after_ms`` record the padding, so the unpadded spans still tile the
+    source exactly.
+
+    ``chunk_format`` is ``"wav"`` (16-bit PCM), ``"flac"`` (lossless, roughly half
+    the size) or ``"opus"`` (lossy Ogg Opus at ``chunk_bitrate``, default
+    ``DEFAULT_OPUS_BITRATE``). Every entry records its ``format``, ``codec`` and
+    ``bitrate`` (None for lossless formats).
     """
 
     source_path = Path(source_path).expanduser().resolve()
@@ -34,46 +100,94 @@ def chunk_audio_file(
     destination_dir = Path(destination_dir).expanduser().resolve()
     destination_dir.mkdir(parents=True, exist_ok=True)
 
+    if silence_detector not in SILENCE_DETECTORS:
+        raise ValueError(f"Unknown silence detector '{silence_detector}'.")
+
+    spec, bitrate = _resolve_chunk_format(chunk_format, chunk_bitrate)
+
+    if streaming:
+        return _chunk_audio_streaming(
+            source_path,
+            destination_dir,
+            max_chunk_seconds=max_chunk_seconds,
+            base_name=chunk_basename or source_path.stem,
+            min_silence_len=min_silence_len,
+            silence_thresh=silence_thresh,
+            max_workers=max_workers,
+            silence_detector=silence_detector,
+            overlap_ms=int(round(overlap_seconds * 1000)),
+            chunk_format=chunk_format,
+            bitrate=bitrate,
+        )
+
     with source_path.open("rb") as source_handle:
         audio = AudioSegment.from_file(source_handle)
 
-    silence_ranges = _detect_silences_ffmpeg(
-        source_path,
-        silence_thresh=silence_thresh,
-        min_silence_len=min_silence_len,
-    )
-
-    initial_segments = _split_audio_on_silence(audio, silence_ranges)
+    if silence_detector == "numpy":
+        analysed = audio if audio.sample_width in (1, 2, 4) else audio.set_sample_width(2)
+        silence_ranges = detect_silences_numpy(
+            pcm_to_array(
+                analysed.raw_data,
+                channels=analysed.channels,
+                sample_width=analysed.sample_width,
+            ),
+            analysed.frame_rate,
+            silence_thresh=silence_thresh,
+            min_silence_len=min_silence_len,
+            sample_width=analysed.sample_width,
+        )
+    else:
+        silence_ranges = detect_silences_ffmpeg(
+            source_path,
+            silence_thresh=silence_thresh,
+            min_silence_len=min_silence_len,
+        )
 
     if max_chunk_seconds is None or max_chunk_seconds <= 0:
         max_chunk_ms = len(audio)
     else:
         max_chunk_ms = int(max_chunk_seconds * 1000)
 
-    combined_segments = _combine_segments(initial_segments, max_chunk_ms)
+    spans = add_overlap(
+        plan_chunk_spans(len(audio), silence_ranges, max_chunk_ms),
+        len(audio),
+        int(round(overlap_seconds * 1000)),
+    )
 
-    chunks: List[Dict[str, object]] = []
     base_name = chunk_basename or source_path.stem
-    for index, segment in enumerate(combined_segments):
-        start_ms, end_ms, chunk_audio = segment
-        chunk_filename = destination_dir / f"{base_name}_chunk_{index:03d}.wav"
-        chunk_audio = (
-            chunk_audio.set_frame_rate(16_000).set_channels(1).set_sample_width(2)
-        )
-        export_handle = chunk_audio.export(chunk_filename, format="wav")
-        export_handle.close()
+    chunk_paths = [
+        destination_dir / f"{base_name}_chunk_{index:03d}{spec.extension}" for index in range(len(spans))
+    ]
+    export_formats = _map_exports(
+        _export_pydub_chunk,
+        [
+            (audio[span[0] : span[1]], chunk_path, chunk_format, bitrate)
+            for span, chunk_path in zip(spans, chunk_paths)
+        ],
+        max_workers=max_workers,
+        executor_cls=ProcessPoolExecutor,
+    )
 
+    chunks: List[Dict[str, object]] = []
+    for index, (span, chunk_filename, export_format) in enumerate(
+        zip(spans, chunk_paths, export_formats)
+    ):
+        start_ms, end_ms, overlap_before, overlap_after = span
+        frame_rate, channels, sample_width = export_format
         chunks.append(
             {
                 "index": index,
                 "start_ms": start_ms,
                 "end_ms": end_ms,
                 "path": chunk_filename,
-                "format": "wav",
-                "bitrate": None,
-                "frame_rate": chunk_audio.frame_rate,
-                "channels": chunk_audio.channels,
-                "sample_width": chunk_audio.sample_width,
+                "format": chunk_format,
+                "codec": spec.codec,
+                "bitrate": bitrate,
+                "frame_rate": frame_rate,
+                "channels": channels,
+                "sample_width": sample_width,
+                "overlap_before_ms": overlap_before,
+                "overlap_after_ms": overlap_after,
             }
         )
 
@@ -81,76 +195,392 @@ def chunk_audio_file(
         raise RuntimeError("No audio chunks were produced; check the source file.")
 
     return chunks
-def _detect_silences_ffmpeg(
+
+
+def encode_audio_bytes(source_path: Path, chunk_format: str, *, bitrate: Optional[str] = None) -> bytes:
+    """
+    Return ``source_path`` encoded as 16 kHz mono ``chunk_format`` (for uploads).
+
+    Sources already stored in ``chunk_format`` are returned as-is.
+    """
+
+    spec, bitrate = _resolve_chunk_format(chunk_format, bitrate)
+    source_path = Path(source_path)
+    if source_path.suffix.lower() == spec.extension:
+        return source_path.read_bytes()
+
+    with FFmpegProcess(_upload_encode_args(source_path, spec, bitrate, "pipe:1"), stdout=subprocess.PIPE) as process:
+        assert process.stdout is not None
+        encoded = process.stdout.read()
+        process.wait()
+    return encoded
+
+
+def encode_audio_file(
+    source_path: Path,
+    destination: Path,
+    chunk_format: str,
+    *,
+    bitrate: Optional[str] = None,
+) -> Path:
+    """
+    Encode ``source_path`` to ``destination`` like :func:`encode_audio_bytes`, without holding it in memory.
+
+    Returns the path to upload: ``source_path`` itself when it is already stored in
+    ``chunk_format``, otherwise ``destination``.
+    """
+
+    spec, bitrate = _resolve_chunk_format(chunk_format, bitrate)
+    source_path = Path(source_path)
+    if source_path.suffix.lower() == spec.extension:
+        return source_path
+    run_ffmpeg(["-y", *_upload_encode_args(source_path, spec, bitrate, str(destination))])
+    return Path(destination)
+
+
+def _upload_encode_args(source_path: Path, spec: ChunkFormat, bitrate: Optional[str], target: str) -> List[str]:
+    cmd = [
+        "-loglevel",
+        "error",
+        "-i",
+        str(source_path),
+        "-ar",
+        str(CHUNK_FRAME_RATE),
+        "-ac",
+        str(CHUNK_CHANNELS),
+        "-c:a",
+        spec.codec,
+    ]
+    if bitrate:
+        cmd.extend(["-b:a", bitrate])
+    cmd.extend(["-map_metadata", "-1", "-f", spec.container, target])
+    return cmd
+
+
+def _resolve_chunk_format(chunk_format: str, chunk_bitrate: Optional[str]) -> Tuple[ChunkFormat, Optional[str]]:
+    """Validate ``chunk_format`` and return its spec plus the bitrate to encode with."""
+
+    spec = CHUNK_FORMATS.get(chunk_format)
+    if spec is None:
+        raise ValueError(f"Unknown chunk format '{chunk_format}'.")
+    if spec.lossless:
+        return spec, None
+    return spec, chunk_bitrate or DEFAULT_OPUS_BITRATE
+
+
+def _export_pydub_chunk(
+    chunk_audio: AudioSegment,
+    chunk_path: Path,
+    chunk_format: str = "wav",
+    bitrate: Optional[str] = None,
+) -> Tuple[int, int, int]:
+    """Resample ``chunk_audio`` to 16 kHz mono, write it as ``chunk_format``, and return its format."""
+
+    chunk_audio = chunk_audio.set_frame_rate(16_000).set_channels(1).set_sample_width(2)
+    spec = CHUNK_FORMATS[chunk_format]
+    if chunk_format == "wav":
+        export_handle = chunk_audio.export(chunk_path, format="wav")
+    else:
+        export_handle = chunk_audio.export(
+            chunk_path,
+            format=spec.container,
+            codec=spec.codec,
+            bitrate=bitrate,
+            parameters=["-map_metadata", "-1"],
+        )
+    export_handle.close()
+    return chunk_audio.frame_rate, chunk_audio.channels, chunk_audio.sample_width
+
+
+def _map_exports(
+    export_fn: Callable[..., object],
+    jobs: Sequence[Tuple[object, ...]],
+    *,
+    max_workers: int,
+    executor_cls: Type[Executor],
+) -> List[object]:
+    """Run ``export_fn`` over ``jobs`` (optionally in parallel), preserving job order."""
+
+    if max_workers <= 1 or len(jobs) <= 1:
+        return [export_fn(*job) for job in jobs]
+    with executor_cls(max_workers=min(max_workers, len(jobs))) as executor:
+        return list(executor.map(export_fn, *zip(*jobs)))
+
+
+def _chunk_audio_streaming(
     source_path: Path,
+    destination_dir: Path,
+    *,
+    max_chunk_seconds: Optional[float],
+    base_name: str,
+    min_silence_len: int,
+    silence_thresh: int,
+    max_workers: int,
+    silence_detector: str,
+    overlap_ms: int,
+    chunk_format: str = "wav",
+    bitrate: Optional[str] = None,
+) -> List[Dict[str, object]]:
+    """
+    Chunk ``source_path`` with a single decode and a bounded read buffer.
+
+    16 kHz mono WAV sources are analysed with ``silencedetect`` and copied
+    directly. Anything else is decoded exactly once: one ffmpeg process
+    resamples to 16 kHz mono, runs ``silencedetect`` on that stream, and spools
+    the PCM to a temporary WAV beside the chunks, which are then cut from it.
+    Compressed chunk formats pipe each span's PCM through an ffmpeg encoder.
+    """
+
+    spec = CHUNK_FORMATS[chunk_format]
+
+    wav_params = read_wav_params(source_path)
+    is_chunk_format = wav_params is not None and wav_params[:3] == (
+        CHUNK_CHANNELS,
+        CHUNK_SAMPLE_WIDTH,
+        CHUNK_FRAME_RATE,
+    )
+
+    spool_path: Optional[Path] = None
+    try:
+        if is_chunk_format:
+            pcm_path = source_path
+            silence_ranges = None
+        else:
+            spool_path = destination_dir / f".{base_name}.spool.wav"
+            silence_ranges = _decode_with_silences_ffmpeg(
+                source_path,
+                spool_path,
+                silence_thresh=silence_thresh,
+                min_silence_len=min_silence_len,
+                detect_silences=silence_detector == "ffmpeg",
+            )
+            pcm_path = spool_path
+
+        if silence_detector == "numpy":
+            silence_ranges = detect_silences_in_wav(
+                pcm_path,
+                silence_thresh=silence_thresh,
+                min_silence_len=min_silence_len,
+            )
+        elif silence_ranges is None:
+            silence_ranges = detect_silences_ffmpeg(
+                pcm_path,
+                silence_thresh=silence_thresh,
+                min_silence_len=min_silence_len,
+            )
+
+        pcm_params = read_wav_params(pcm_path)
+        if pcm_params is None:
+            raise RuntimeError(f"Unable to read decoded PCM for {source_path}")
+        length_ms = round(1000 * (pcm_params[3] / CHUNK_FRAME_RATE))
+
+        if max_chunk_seconds is None or max_chunk_seconds <= 0:
+            max_chunk_ms = length_ms
+        else:
+            max_chunk_ms = int(max_chunk_seconds * 1000)
+
+        spans = add_overlap(
+            plan_chunk_spans(length_ms, silence_ranges, max_chunk_ms),
+            length_ms,
+            overlap_ms,
+        )
+
+        chunk_paths = [
+            destination_dir / f"{base_name}_chunk_{index:03d}{spec.extension}" for index in range(len(spans))
+        ]
+        if chunk_format == "wav":
+            export_fn: Callable[..., object] = _copy_wav_span
+            jobs = [(pcm_path, chunk_path, span[0], span[1]) for chunk_path, span in zip(chunk_paths, spans)]
+        else:
+            export_fn = _encode_wav_span
+            jobs = [
+                (pcm_path, chunk_path, span[0], span[1], chunk_format, bitrate)
+                for chunk_path, span in zip(chunk_paths, spans)
+            ]
+        _map_exports(export_fn, jobs, max_workers=max_workers, executor_cls=ThreadPoolExecutor)
+
+        chunks: List[Dict[str, object]] = []
+        for index, (span, chunk_filename) in enumerate(zip(spans, chunk_paths)):
+            start_ms, end_ms, overlap_before, overlap_after = span
+            chunks.append(
+                {
+                    "index": index,
+                    "start_ms": start_ms,
+                    "end_ms": end_ms,
+                    "path": chunk_filename,
+                    "format": chunk_format,
+                    "codec": spec.codec,
+                    "bitrate": bitrate,
+                    "frame_rate": CHUNK_FRAME_RATE,
+                    "channels": CHUNK_CHANNELS,
+                    "sample_width": CHUNK_SAMPLE_WIDTH,
+                    "overlap_before_ms": overlap_before,
+                    "overlap_after_ms": overlap_after,
+                }
+            )
+    finally:
+        if spool_path is not None:
+            spool_path.unlink(missing_ok=True)
+
+    if not chunks:
+        raise RuntimeError("No audio chunks were produced; check the source file.")
+
+    return chunks
+
+
+def read_wav_params(source_path: Path) -> Optional[Tuple[int, int, int, int]]:
+    """Return ``(channels, sample_width, frame_rate, frame_count)`` for PCM WAVs, else None."""
+
+    try:
+        with wave.open(str(source_path), "rb") as reader:
+            return (
+                reader.getnchannels(),
+                reader.getsampwidth(),
+                reader.getframerate(),
+                reader.getnframes(),
+            )
+    except (wave.Error, EOFError):
+        return None
+
+
+def _span_frames(start_ms: int, end_ms: int) -> Tuple[int, int]:
+    """Map a millisecond span onto 16 kHz frame offsets the same way pydub slices."""
+
+    start_frame = int(start_ms * (CHUNK_FRAME_RATE / 1000.0))
+    end_frame = int(end_ms * (CHUNK_FRAME_RATE / 1000.0))
+    return start_frame, end_frame
+
+
+def _iter_wav_span(source_path: Path, start_ms: int, end_ms: int) -> Iterator[bytes]:
+    """Yield the PCM of ``[start_ms, end_ms)`` of a 16 kHz mono WAV in bounded blocks."""
+
+    start_frame, end_frame = _span_frames(start_ms, end_ms)
+    frame_width = CHUNK_CHANNELS * CHUNK_SAMPLE_WIDTH
+    copied = 0
+    with wave.open(str(source_path), "rb") as reader:
+        available = reader.getnframes()
+        position = min(start_frame, available)
+        reader.setpos(position)
+        remaining = min(end_frame, available) - position
+        while remaining > 0:
+            block = reader.readframes(min(remaining, STREAM_BLOCK_FRAMES))
+            if not block:
+                break
+            yield block
+            remaining -= len(block) // frame_width
+            copied += len(block) // frame_width
+    # pydub pads a slice that runs past the end of the data with silence.
+    missing = (end_frame - start_frame) - copied
+    if missing > 0:
+        yield b"\x00" * (missing * frame_width)
+
+
+def _copy_wav_span(source_path: Path, chunk_path: Path, start_ms: int, end_ms: int) -> None:
+    """Copy ``[start_ms, end_ms)`` of a 16 kHz mono WAV into ``chunk_path`` block by block."""
+
+    start_frame, end_frame = _span_frames(start_ms, end_ms)
+    writer = wave.open(str(chunk_path), "wb")
+    try:
+        writer.setnchannels(CHUNK_CHANNELS)
+        writer.setsampwidth(CHUNK_SAMPLE_WIDTH)
+        writer.setframerate(CHUNK_FRAME_RATE)
+        writer.setnframes(end_frame - start_frame)
+        for block in _iter_wav_span(source_path, start_ms, end_ms):
+            writer.writeframesraw(block)
+    finally:
+        writer.close()
+
+
+def _encode_wav_span(
+    source_path: Path,
+    chunk_path: Path,
+    start_ms: int,
+    end_ms: int,
+    chunk_format: str,
+    bitrate: Optional[str] = None,
+) -> None:
+    """Encode ``[start_ms, end_ms)`` of a 16 kHz mono WAV to ``chunk_format`` via ffmpeg."""
+
+    spec = CHUNK_FORMATS[chunk_format]
+    cmd = [
+        "-loglevel",
+        "error",
+        "-y",
+        "-f",
+        "s16le",
+        "-ar",
+        str(CHUNK_FRAME_RATE),
+        "-ac",
+        str(CHUNK_CHANNELS),
+        "-i",
+        "pipe:0",
+        "-c:a",
+        spec.codec,
+    ]
+    if bitrate:
+        cmd.extend(["-b:a", bitrate])
+    cmd.extend(["-map_metadata", "-1", "-f", spec.container, str(chunk_path)])
+
+    with FFmpegProcess(cmd, stdin=subprocess.PIPE) as process:
+        assert process.stdin is not None
+        try:
+            for block in _iter_wav_span(source_path, start_ms, end_ms):
+                process.stdin.write(block)
+        except BrokenPipeError:
+            pass  # ffmpeg exited early; wait() reports why
+        process.wait()
+
+
+def _decode_with_silences_ffmpeg(
+    source_path: Path,
+    pcm_path: Path,
     *,
     silence_thresh: int,
     min_silence_len: int,
+    detect_silences: bool = True,
 ) -> List[Dict[str, float]]:
     """
-    Run ffmpeg ``silencedetect`` over ``source_path`` and return silence ranges.
+    Decode ``source_path`` once to 16 kHz mono PCM at ``pcm_path`` while running
+    ``silencedetect`` on the same stream; return the silence ranges.
+
+    With ``detect_silences`` False the stream is only decoded and ``[]`` is returned.
     """
 
+    audio_filter = f"aresample={CHUNK_FRAME_RATE},aformat=sample_fmts=s16:channel_layouts=mono"
+    if detect_silences:
+        audio_filter += f",silencedetect=noise={silence_thresh}dB:d={min_silence_len/1000.0}"
+
     cmd = [
-        "ffmpeg",
+        "-y",
         "-i",
         str(source_path),
         "-af",
-        f"silencedetect=noise={silence_thresh}dB:d={min_silence_len/1000.0}",
+        audio_filter,
+        "-c:a",
+        "pcm_s16le",
+        "-map_metadata",
+        "-1",
         "-f",
-        "null",
-        "-",
+        "wav",
+        str(pcm_path),
     ]
 
-    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    _, stderr = process.communicate()
-
-    silence_starts: List[float] = []
-    silence_ends: List[float] = []
-
-    for line in stderr.splitlines():
-        if "silence_start" in line:
-            try:
-                silence_start = float(line.split("silence_start: ")[1])
-                silence_starts.append(silence_start)
-            except (IndexError, ValueError):
-                continue
-        elif "silence_end" in line:
-            parts = line.split("silence_end: ")
-            if len(parts) < 2:
-                continue
-            try:
-                silence_part = parts[1].split(" |")[0]
-                silence_end = float(silence_part)
-                silence_ends.append(silence_end)
-            except ValueError:
-                continue
-
-    ranges: List[Dict[str, float]] = []
-    for start, end in zip(silence_starts, silence_ends):
-        ranges.append({"start": start, "end": end})
-
-    return ranges
-
-
-def _split_audio_on_silence(
-    audio: AudioSegment,
-    silence_ranges: List[Dict[str, float]],
-) -> List[List[object]]:
-    """Split audio at silence midpoints without trimming any content."""
+    parser = SilenceEventParser()
+    run_ffmpeg(cmd, on_stderr_line=parser.feed)
+    return parser.ranges
 
-    length_ms = len(audio)
-    boundaries = _build_split_boundaries(length_ms, silence_ranges)
-    segments: List[List[object]] = []
 
-    for start_ms, end_ms in zip(boundaries, boundaries[1:]):
-        if end_ms <= start_ms:
-            continue
-        chunk = audio[start_ms:end_ms]
-        if len(chunk) > 0:
-            segments.append([start_ms, end_ms, chunk])
+def detect_silences_ffmpeg(
+    source_path: Path,
+    *,
+    silence_thresh: int,
+    min_silence_len: int,
+) -> List[Dict[str, float]]:
+    """
+    Run ffmpeg ``silencedetect`` over ``source_path`` and return silence ranges.
+    """
 
-    return segments
+    return detect_silences(source_path, silence_thresh=silence_thresh, min_silence_len=min_silence_len)
 
 
 def _build_split_boundaries(
@@ -171,35 +601,68 @@ def _build_split_boundaries(
     return boundaries
 
 
-def _split_overlong_segments(segments: List[List[object]], max_length_ms: int) -> List[List[object]]:
+Span = List[int]
+
+
+def plan_chunk_spans(
+    length_ms: int,
+    silence_ranges: List[Dict[str, float]],
+    max_length_ms: int,
+) -> List[Tuple[int, int]]:
+    """
+    Plan ``(start_ms, end_ms)`` chunk spans from silence midpoints and ``max_length_ms``.
+
+    Planning is pure integer arithmetic and linear in the number of silences;
+    callers slice the audio once per returned span.
+    """
+
+    boundaries = _build_split_boundaries(length_ms, silence_ranges)
+    segments: List[Span] = [
+        [start_ms, end_ms] for start_ms, end_ms in zip(boundaries, boundaries[1:]) if end_ms > start_ms
+    ]
+    combined = _combine_segments(segments, max_length_ms)
+    return [(start_ms, end_ms) for start_ms, end_ms in combined]
+
+
+def add_overlap(
+    spans: List[Tuple[int, int]],
+    length_ms: int,
+    overlap_ms: int,
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Pad each span by ``overlap_ms`` on both sides, clamped to ``[0, length_ms]``.
+
+    Returns ``(start_ms, end_ms, overlap_before_ms, overlap_after_ms)`` tuples.
+    """
+
+    padded: List[Tuple[int, int, int, int]] = []
+    for start_ms, end_ms in spans:
+        padded_start = max(0, start_ms - max(0, overlap_ms))
+        padded_end = min(length_ms, end_ms + max(0, overlap_ms))
+        padded.append((padded_start, padded_end, start_ms - padded_start, padded_end - end_ms))
+    return padded
+
+
+def _split_overlong_segments(segments: List[Span], max_length_ms: int) -> List[Span]:
     """
-    Ensure no single candidate segment exceeds ``max_length_ms`` by slicing it directly.
+    Ensure no single candidate segment exceeds ``max_length_ms`` by cutting it directly.
     """
 
     if max_length_ms <= 0:
         return segments
 
-    normalized: List[List[object]] = []
-    for start_ms, end_ms, audio in segments:
-        segment_len = len(audio)
-        if segment_len <= max_length_ms:
-            normalized.append([start_ms, end_ms, audio])
-            continue
-
-        offset = 0
-        while offset < segment_len:
-            slice_audio = audio[offset : offset + max_length_ms]
-            slice_start = start_ms + offset
-            slice_end = slice_start + len(slice_audio)
-            if len(slice_audio) == 0:
-                break
-            normalized.append([slice_start, slice_end, slice_audio])
-            offset += len(slice_audio)
+    normalized: List[Span] = []
+    for start_ms, end_ms in segments:
+        offset = start_ms
+        while offset < end_ms:
+            slice_end = min(end_ms, offset + max_length_ms)
+            normalized.append([offset, slice_end])
+            offset = slice_end
 
     return normalized
 
 
-def _combine_segments(segments: List[List[object]], max_length_ms: int) -> List[List[object]]:
+def _combine_segments(segments: List[Span], max_length_ms: int) -> List[Span]:
     """
     Combine adjacent segments until they reach ``max_length_ms`` in duration.
     """
@@ -208,20 +671,18 @@ def _combine_segments(segments: List[List[object]], max_length_ms: int) -> List[
         return []
 
     normalized_segments = _split_overlong_segments(segments, max_length_ms)
-    combined: List[List[object]] = []
-    current_start, current_end, current_audio = normalized_segments[0]
+    combined: List[Span] = []
+    current_start, current_end = normalized_segments[0]
 
-    for start_ms, end_ms, segment_audio in normalized_segments[1:]:
-        if len(current_audio) + len(segment_audio) <= max_length_ms:
-            current_audio += segment_audio
+    for start_ms, end_ms in normalized_segments[1:]:
+        if (current_end - current_start) + (end_ms - start_ms) <= max_length_ms:
             current_end = end_ms
         else:
-            combined.append([current_start, current_end, current_audio])
+            combined.append([current_start, current_end])
             current_start = start_ms
             current_end = end_ms
-            current_audio = segment_audio
 
-    combined.append([current_start, current_end, current_audio])
+    combined.append([current_start, current_end])
 
     if len(combined) >= 2:
         _rebalance_tail_segments(combined)
@@ -229,30 +690,38 @@ def _combine_segments(segments: List[List[object]], max_length_ms: int) -> List[
     return combined
 
 
-def _rebalance_tail_segments(segments: List[List[object]], min_ratio: float = 0.75) -> None:
+def _rebalance_tail_segments(segments: List[Span], min_ratio: float = 0.75) -> None:
     """Ensure the final two chunks are roughly even to avoid tiny trailing segments."""
 
     if len(segments) < 2:
         return
 
-    tail_len = len(segments[-1][2])
-    max_length = len(segments[-2][2])
+    prev_start, prev_end = segments[-2]
+    last_start, last_end = segments[-1]
+    tail_len = last_end - last_start
+    max_length = prev_end - prev_start
     if tail_len == 0 or max_length == 0:
         return
 
     if tail_len / max_length >= min_ratio:
         return
 
-    prev_start, _, prev_audio = segments[-2]
-    _, last_end, last_audio = segments[-1]
-
-    merged_audio = prev_audio + last_audio
-    midpoint = len(merged_audio) // 2
-    first_audio = merged_audio[:midpoint]
-    second_audio = merged_audio[midpoint:]
-
-    first_end = prev_start + len(first_audio)
-    second_end = first_end + len(second_audio)
-
-    segments[-2] = [prev_start, first_end, first_audio]
-    segments[-1] = [first_end, second_end, second_audio]
+    merged_len = max_length + tail_len
+    first_end = prev_start + merged_len // 2
+
+    segments[-2] = [prev_start, first_end]
+    segments[-1] = [first_end, prev_start + merged_len]
+
+
+__all__ = [
+    "CHUNK_FORMATS",
+    "ChunkFormat",
+    "DEFAULT_OPUS_BITRATE",
+    "add_overlap",
+    "chunk_audio_file",
+    "detect_silences_ffmpeg",
+    "encode_audio_bytes",
+    "encode_audio_file",
+    "plan_chunk_spans",
+    "read_wav_params",
+]
@@ -1,17 +1,34 @@
 from __future__ import annotations
 
-import subprocess
+import json
+import os
 import tempfile
 import urllib.request
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
-from typing import Callable, Dict, Iterable, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
 
 from pydub import AudioSegment
 
+from session_pipeline.analysis import AudioAnalysis, load_or_analyze
+from session_pipeline.clean_cache import CleanAudioCache
+from session_pipeline.ffmpeg_runner import FFmpegError, FFmpegProgress, FFmpegTimeout, run_ffmpeg
+from session_pipeline.io_utils import write_json
+from session_pipeline.normalize import normalise_audio_streaming, streaming_normalize_available
+from session_pipeline.parallel_filter import (
+    DEFAULT_PREROLL_SECONDS,
+    OUTPUT_CODECS,
+    filter_in_segments,
+    seam_difference_report,
+)
+
 RNNOISE_URL = "https://raw.githubusercontent.com/richardpl/arnndn-models/master/std.rnnn"
 RNNOISE_DEFAULT_NAME = "std.rnnn"
 RNNOISE_CACHE_DIR = Path.home() / ".cache" / "taelgar" / "rnnoise"
+RNNOISE_VENDORED_DIR = Path(__file__).resolve().parent / "models"
+RNNOISE_MODEL_ENV = "TAELGAR_RNNOISE_MODEL"
+RNNOISE_PATH_ENV = "TAELGAR_RNNOISE_PATH"
+OFFLINE_ENV = "TAELGAR_OFFLINE"
 
 
 class AudioProcessingError(RuntimeError):
@@ -52,6 +69,22 @@ AUDIO_PROFILES: Dict[str, AudioProfileConfig] = {
 }
 
 SUPPORTED_OUTPUT_FORMATS = {"wav", "flac"}
+CLEAN_SETTINGS_SUFFIX = ".settings.json"
+
+
+@dataclass(frozen=True)
+class OutputSpec:
+    """One rendition written by :func:`preprocess_audio_file` (always 16-bit PCM)."""
+
+    path: Path
+    sample_rate: int = 16_000
+    channels: int = 1
+    output_format: str = "wav"
+
+
+AUTO_PROFILE = "auto"
+NOISY_SNR_DB = 25.0
+NOISY_FLOOR_DBFS = -50.0
 
 
 def preprocess_audio_file(
@@ -70,9 +103,30 @@ def preprocess_audio_file(
     disable_dynaudnorm: bool = False,
     disable_compression: bool = False,
     rnnoise_model_path: Optional[Path] = None,
+    segment_jobs: int = 1,
+    segment_preroll_seconds: float = DEFAULT_PREROLL_SECONDS,
+    seam_report_path: Optional[Path] = None,
+    ffmpeg_timeout: Optional[float] = None,
+    progress_fn: Optional[Callable[[FFmpegProgress], None]] = None,
+    extra_outputs: Sequence[OutputSpec] = (),
 ) -> Path:
     """
     Preprocess ``source_path`` into ``output_path`` according to ``profile``.
+
+    ``extra_outputs`` are further renditions (other rates, layouts or formats)
+    of the same processed audio. The ffmpeg profiles produce all of them from
+    a single process (one decode and one filter pass, split into one encode
+    per output). The normalize profile writes the primary output first, then
+    renders the extras in one more ffmpeg pass using the gain it measured.
+
+    With ``segment_jobs`` > 1 an ffmpeg filter chain is run on silence-aligned
+    segments in that many parallel processes (see
+    :func:`session_pipeline.parallel_filter.filter_in_segments`), each given
+    ``segment_preroll_seconds`` of context. ``seam_report_path`` additionally
+    runs the single-pass chain and writes a JSON comparison around each seam.
+    ``profile="auto"`` chooses via :func:`recommend_profile` from the cached
+    analysis sidecar. ``ffmpeg_timeout`` bounds each ffmpeg run (seconds) and
+    ``progress_fn`` receives single-pass ffmpeg progress.
     """
 
     source_path = Path(source_path).expanduser().resolve()
@@ -81,34 +135,66 @@ def preprocess_audio_file(
     if not source_path.exists():
         raise AudioProcessingError(f"Audio source not found: {source_path}")
 
-    if output_path.exists() and not overwrite:
-        raise AudioProcessingError(f"Output exists: {output_path}")
+    outputs = [OutputSpec(output_path, sample_rate=sample_rate, channels=channels, output_format=output_format)]
+    outputs.extend(replace(spec, path=Path(spec.path).expanduser().resolve()) for spec in extra_outputs)
+    for spec in outputs:
+        if spec.path.exists() and not overwrite:
+            raise AudioProcessingError(f"Output exists: {spec.path}")
 
-    profile_config = AUDIO_PROFILES.get(profile)
+    profile_config = AUDIO_PROFILES.get(resolve_profile(source_path, profile))
     if profile_config is None:
         raise AudioProcessingError(f"Unknown audio profile '{profile}'.")
 
-    if output_format not in SUPPORTED_OUTPUT_FORMATS:
-        raise AudioProcessingError(f"Output format '{output_format}' is not supported.")
+    for spec in outputs:
+        if spec.output_format not in SUPPORTED_OUTPUT_FORMATS:
+            raise AudioProcessingError(f"Output format '{spec.output_format}' is not supported.")
+        if spec.channels not in (1, 2):
+            raise AudioProcessingError("Channels must be 1 (mono) or 2 (stereo).")
 
     if sample_width != 2:
         raise AudioProcessingError("Only 16-bit PCM output is currently supported.")
 
-    if channels not in (1, 2):
-        raise AudioProcessingError("Channels must be 1 (mono) or 2 (stereo).")
+    if len({spec.path for spec in outputs}) != len(outputs):
+        raise AudioProcessingError("Each output needs its own path.")
+
+    if extra_outputs and segment_jobs > 1:
+        raise AudioProcessingError("Extra outputs cannot be combined with segmented filtering.")
 
     if profile_config.mode == "normalize":
-        _normalise_audio_in_memory(
-            source_path,
-            output_path,
-            sample_rate=sample_rate,
-            channels=channels,
-            sample_width=sample_width,
-            output_format=output_format,
-            target_dbfs=profile_config.target_dbfs,
-            headroom_db=profile_config.headroom_db,
-            overwrite=overwrite,
-        )
+        if streaming_normalize_available():
+            try:
+                stats = normalise_audio_streaming(
+                    source_path,
+                    output_path,
+                    sample_rate=sample_rate,
+                    channels=channels,
+                    output_format=output_format,
+                    target_dbfs=profile_config.target_dbfs,
+                    headroom_db=profile_config.headroom_db,
+                )
+            except RuntimeError as exc:
+                raise AudioProcessingError(f"Normalisation failed for {source_path}: {exc}") from exc
+            if len(outputs) > 1:
+                _run_ffmpeg_outputs(
+                    source_path,
+                    outputs[1:],
+                    filters=f"volume={stats.gain_db:.4f}dB",
+                    overwrite=overwrite,
+                    timeout=ffmpeg_timeout,
+                )
+            return output_path
+        for spec in outputs:
+            _normalise_audio_in_memory(
+                source_path,
+                spec.path,
+                sample_rate=spec.sample_rate,
+                channels=spec.channels,
+                sample_width=sample_width,
+                output_format=spec.output_format,
+                target_dbfs=profile_config.target_dbfs,
+                headroom_db=profile_config.headroom_db,
+                overwrite=overwrite,
+            )
         return output_path
 
     filter_chain = _build_filter_chain(
@@ -121,36 +207,181 @@ def preprocess_audio_file(
         rnnoise_model_path=rnnoise_model_path,
     )
 
-    _run_ffmpeg(
+    if segment_jobs > 1 and filter_chain:
+        _filter_in_segments(
+            source_path,
+            output_path,
+            sample_rate=sample_rate,
+            channels=channels,
+            output_format=output_format,
+            filters=filter_chain,
+            jobs=segment_jobs,
+            preroll_seconds=segment_preroll_seconds,
+            seam_report_path=seam_report_path,
+            timeout=ffmpeg_timeout,
+        )
+        return output_path
+
+    _run_ffmpeg_outputs(
         source_path,
-        output_path,
-        sample_rate=sample_rate,
-        channels=channels,
-        output_format=output_format,
+        outputs,
         filters=filter_chain,
         overwrite=overwrite,
+        timeout=ffmpeg_timeout,
+        progress_fn=progress_fn,
     )
     return output_path
 
 
+def _filter_in_segments(
+    source_path: Path,
+    output_path: Path,
+    *,
+    sample_rate: int,
+    channels: int,
+    output_format: str,
+    filters: str,
+    jobs: int,
+    preroll_seconds: float,
+    seam_report_path: Optional[Path],
+    timeout: Optional[float] = None,
+) -> None:
+    try:
+        seams = filter_in_segments(
+            source_path,
+            output_path,
+            filters=filters,
+            sample_rate=sample_rate,
+            channels=channels,
+            output_format=output_format,
+            jobs=jobs,
+            preroll_seconds=preroll_seconds,
+            timeout=timeout,
+        )
+    except RuntimeError as exc:
+        raise AudioProcessingError(f"Segmented filtering failed for {source_path}: {exc}") from exc
+
+    if seam_report_path is None:
+        return
+    with tempfile.TemporaryDirectory(prefix=".single-pass-", dir=str(output_path.parent)) as tmpdir:
+        reference_path = Path(tmpdir) / f"reference.{output_format}"
+        _run_ffmpeg(
+            source_path,
+            reference_path,
+            sample_rate=sample_rate,
+            channels=channels,
+            output_format=output_format,
+            filters=filters,
+            overwrite=True,
+            timeout=timeout,
+        )
+        try:
+            report = seam_difference_report(reference_path, output_path, seams)
+        except RuntimeError as exc:
+            raise AudioProcessingError(str(exc)) from exc
+    report.update({"source": str(source_path), "filters": filters, "jobs": jobs, "preroll_seconds": preroll_seconds})
+    write_json(Path(seam_report_path), report)
+
+
+def recommend_profile(analysis: AudioAnalysis) -> str:
+    """
+    Pick ``voice-memo`` (RNNoise + stronger compression) for noisy recordings, else ``zoom-audio``.
+
+    A recording counts as noisy when its SNR estimate is below ``NOISY_SNR_DB``
+    or its noise floor sits above ``NOISY_FLOOR_DBFS``.
+    """
+
+    if analysis.snr_db is not None and analysis.snr_db < NOISY_SNR_DB:
+        return "voice-memo"
+    if analysis.noise_floor_dbfs is not None and analysis.noise_floor_dbfs > NOISY_FLOOR_DBFS:
+        return "voice-memo"
+    return "zoom-audio"
+
+
+def resolve_profile(source_path: Path, profile: str) -> str:
+    """Return ``profile``, or the recommendation from the cached analysis when it is ``auto``."""
+
+    if profile != AUTO_PROFILE:
+        return profile
+    try:
+        return recommend_profile(load_or_analyze(source_path))
+    except RuntimeError as exc:
+        raise AudioProcessingError(f"Audio analysis failed for {source_path}: {exc}") from exc
+
+
+def rnnoise_search_path() -> List[Path]:
+    """Directories searched for rnnoise models: ``$TAELGAR_RNNOISE_PATH``, the vendored copy, the cache."""
+
+    entries = [Path(entry).expanduser() for entry in os.environ.get(RNNOISE_PATH_ENV, "").split(os.pathsep) if entry]
+    return entries + [RNNOISE_VENDORED_DIR, RNNOISE_CACHE_DIR]
+
+
+def find_rnnoise_model(model_name: str = RNNOISE_DEFAULT_NAME) -> Optional[Path]:
+    """Return a local copy of ``model_name`` (``$TAELGAR_RNNOISE_MODEL`` wins), or None."""
+
+    override = os.environ.get(RNNOISE_MODEL_ENV)
+    if override:
+        path = Path(override).expanduser()
+        if not path.is_file():
+            raise AudioProcessingError(f"{RNNOISE_MODEL_ENV} points to a missing file: {path}")
+        return path
+    for directory in rnnoise_search_path():
+        candidate = directory / model_name
+        if candidate.is_file():
+            return candidate
+    return None
+
+
 def ensure_rnnoise_model(model_name: str = RNNOISE_DEFAULT_NAME) -> Path:
-    target = RNNOISE_CACHE_DIR / model_name
-    if target.exists():
-        return target
+    """
+    Resolve ``model_name`` from :func:`rnnoise_search_path`, downloading it into the cache as a last resort.
+
+    Setting ``$TAELGAR_OFFLINE`` turns the download into an error listing the
+    searched locations, for workers without network access.
+    """
+
+    found = find_rnnoise_model(model_name)
+    if found is not None:
+        return found
+
+    searched = ", ".join(str(directory) for directory in rnnoise_search_path())
+    if os.environ.get(OFFLINE_ENV):
+        raise AudioProcessingError(
+            f"rnnoise model '{model_name}' not found in {searched} and {OFFLINE_ENV} forbids downloading it."
+        )
 
+    target = RNNOISE_CACHE_DIR / model_name
     target.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=str(target.parent), suffix=".partial", delete=False) as tmp:
+        tmp_path = Path(tmp.name)
     try:
-        with tempfile.NamedTemporaryFile(delete=False) as tmp:
-            urllib.request.urlretrieve(RNNOISE_URL, tmp.name)
-            tmp.flush()
-            tmp_path = Path(tmp.name)
+        urllib.request.urlretrieve(RNNOISE_URL, str(tmp_path))
         tmp_path.replace(target)
     except Exception as exc:  # pragma: no cover - network failures
-        raise AudioProcessingError(f"Failed to download rnnoise model: {exc}") from exc
+        tmp_path.unlink(missing_ok=True)
+        raise AudioProcessingError(
+            f"Failed to download rnnoise model (searched {searched}): {exc}"
+        ) from exc
 
     return target
 
 
+def warm_asset_cache(log_fn: Optional[Callable[[str], None]] = None) -> Dict[str, Path]:
+    """Resolve every model the audio profiles reference, downloading any that are missing."""
+
+    assets: Dict[str, Path] = {}
+    for name, profile_config in sorted(AUDIO_PROFILES.items()):
+        denoise = profile_config.denoise
+        if not denoise or denoise.get("type") != "arnndn":
+            continue
+        model_name = denoise.get("model", RNNOISE_DEFAULT_NAME)
+        if model_name not in assets:
+            assets[model_name] = ensure_rnnoise_model(model_name)
+        if log_fn:
+            log_fn(f"{name}: {model_name} -> {assets[model_name]}")
+    return assets
+
+
 def _normalise_audio_in_memory(
     source_path: Path,
     output_path: Path,
@@ -235,40 +466,69 @@ def _run_ffmpeg(
     output_format: str,
     filters: Optional[str],
     overwrite: bool,
+    timeout: Optional[float] = None,
+    progress_fn: Optional[Callable[[FFmpegProgress], None]] = None,
 ) -> None:
-    cmd = [
-        "ffmpeg",
-        "-hide_banner",
-        "-nostdin",
-        "-loglevel",
-        "error",
-        "-i",
-        str(source_path),
-        "-ac",
-        str(channels),
-        "-ar",
-        str(sample_rate),
-    ]
-    if filters:
-        cmd.extend(["-af", filters])
+    _run_ffmpeg_outputs(
+        source_path,
+        [OutputSpec(output_path, sample_rate=sample_rate, channels=channels, output_format=output_format)],
+        filters=filters,
+        overwrite=overwrite,
+        timeout=timeout,
+        progress_fn=progress_fn,
+    )
 
-    if output_format == "wav":
-        cmd.extend(["-c:a", "pcm_s16le"])
-    elif output_format == "flac":
-        cmd.extend(["-c:a", "flac"])
-    else:  # pragma: no cover - guarded earlier
-        raise AudioProcessingError(f"Unsupported format '{output_format}'")
 
-    cmd.append(str(output_path))
+def _run_ffmpeg_outputs(
+    source_path: Path,
+    outputs: Sequence[OutputSpec],
+    *,
+    filters: Optional[str],
+    overwrite: bool,
+    timeout: Optional[float] = None,
+    progress_fn: Optional[Callable[[FFmpegProgress], None]] = None,
+) -> None:
+    """
+    Decode ``source_path`` once, apply ``filters`` once and encode every spec in ``outputs``.
+
+    Several outputs share one filtered stream through ``asplit``; each branch
+    is then resampled, downmixed and encoded for its own spec.
+    """
 
-    if overwrite:
-        cmd.insert(1, "-y")
+    cmd = ["-y" if overwrite else "-n", "-loglevel", "error", "-i", str(source_path)]
+    if len(outputs) == 1:
+        if filters:
+            cmd.extend(["-af", filters])
+        cmd.extend(_output_args(outputs[0]))
     else:
-        cmd.insert(1, "-n")
+        labels = [f"[out{index}]" for index in range(len(outputs))]
+        head = f"{filters}," if filters else ""
+        cmd.extend(["-filter_complex", f"[0:a]{head}asplit={len(outputs)}{''.join(labels)}"])
+        for label, spec in zip(labels, outputs):
+            cmd.extend(["-map", label, *_output_args(spec)])
 
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise AudioProcessingError(result.stderr.strip() or "ffmpeg failed")
+    try:
+        run_ffmpeg(cmd, timeout=timeout, on_progress=progress_fn)
+    except FFmpegTimeout as exc:
+        for spec in outputs:
+            spec.path.unlink(missing_ok=True)  # drop partial outputs
+        raise AudioProcessingError(str(exc)) from exc
+    except FFmpegError as exc:
+        raise AudioProcessingError("\n".join(exc.stderr_tail).strip() or str(exc)) from exc
+
+
+def _output_args(spec: OutputSpec) -> List[str]:
+    return [
+        "-ac",
+        str(spec.channels),
+        "-ar",
+        str(spec.sample_rate),
+        "-sample_fmt",
+        "s16",
+        "-c:a",
+        OUTPUT_CODECS[spec.output_format],
+        str(spec.path),
+    ]
 
 
 def iter_audio_files(paths: Iterable[Path], *, extensions: Iterable[str]) -> Iterable[Path]:
@@ -305,15 +565,65 @@ def prepare_clean_audio(
     channels: int = 1,
     output_format: str = "wav",
     log_fn: Optional[Callable[[str], None]] = None,
+    cache: Optional[CleanAudioCache] = None,
+    reuse_existing: bool = False,
 ) -> tuple[Path, Optional[Path]]:
     """
     Preprocess ``source_path`` using ``profile`` and return the clean path plus optional cleanup marker.
 
+    ``profile`` may be ``auto``; it is resolved from the source's analysis first, and caches and
+    sidecars are keyed on the resolved profile name.
+
     When ``discard`` is True, the cleaned audio is written to a temporary file that callers should delete.
     Otherwise the cleaned audio is written beside the source with ``-clean`` appended to the basename.
+
+    With ``discard`` and a ``cache``, the clean audio comes from (or is added to) the shared cache
+    instead of a temporary file; the cleanup marker is then None and the returned file is read-only.
+
+    ``reuse_existing`` returns an existing ``-clean`` file instead of refusing to overwrite it, but
+    only when its ``.settings.json`` sidecar shows it was made from the same source with the same
+    profile and format; otherwise the audio is preprocessed again.
     """
 
     source_path = Path(source_path).expanduser().resolve()
+    profile = resolve_profile(source_path, profile)
+    if discard and cache is not None:
+        profile_config = AUDIO_PROFILES.get(profile)
+        if profile_config is None:
+            raise AudioProcessingError(f"Unknown audio profile '{profile}'.")
+        parameters = {
+            "profile": profile,
+            "config": asdict(profile_config),
+            "sample_rate": sample_rate,
+            "channels": channels,
+            "sample_width": 2,
+            "output_format": output_format,
+        }
+
+        def _produce(partial_path: Path) -> None:
+            if log_fn:
+                log_fn(f"Preprocessing {source_path} with profile {profile} -> {partial_path}")
+            preprocess_audio_file(
+                source_path,
+                partial_path,
+                profile=profile,
+                sample_rate=sample_rate,
+                channels=channels,
+                sample_width=2,
+                output_format=output_format,
+                overwrite=True,
+            )
+
+        clean_path, hit = cache.get_or_create(
+            source_path,
+            parameters,
+            output_format=output_format,
+            produce=_produce,
+        )
+        if hit and log_fn:
+            log_fn(f"Using cached clean audio for {source_path} ({profile}) -> {clean_path}")
+        return clean_path, None
+
     if discard:
         temp_file = tempfile.NamedTemporaryFile(prefix=f"{source_path.stem}-clean-", suffix=f".{output_format}", delete=False)
         temp_file.close()
@@ -324,10 +634,27 @@ def prepare_clean_audio(
         clean_path = default_clean_path(source_path, extension=output_format)
         cleanup_path = None
         overwrite = False
-        if clean_path.exists():
+        settings_path = clean_settings_path(clean_path)
+        settings = clean_audio_settings(
+            source_path,
+            profile,
+            sample_rate=sample_rate,
+            channels=channels,
+            output_format=output_format,
+        )
+        if clean_path.exists() and reuse_existing:
+            if _read_settings(settings_path) == settings:
+                if log_fn:
+                    log_fn(f"Reusing preprocessed audio {clean_path}")
+                return clean_path, None
+            if log_fn:
+                log_fn(f"Preprocessed audio {clean_path} was made from a different source or settings; redoing it")
+            overwrite = True
+        elif clean_path.exists():
             raise AudioProcessingError(
                 f"Preprocessed audio already exists: {clean_path} (rerun with --discard-audio to overwrite)."
             )
+        settings_path.unlink(missing_ok=True)
 
     if log_fn:
         log_fn(f"Preprocessing {source_path} with profile {profile} -> {clean_path}")
@@ -342,10 +669,53 @@ def prepare_clean_audio(
         output_format=output_format,
         overwrite=overwrite,
     )
+    if cleanup_path is None:
+        write_json(clean_settings_path(clean_path), settings)
 
     return clean_path, cleanup_path
 
 
+def clean_settings_path(clean_path: Path) -> Path:
+    """Sidecar recording how a kept ``-clean`` file was made (see :func:`clean_audio_settings`)."""
+
+    clean_path = Path(clean_path)
+    return clean_path.with_name(f"{clean_path.name}{CLEAN_SETTINGS_SUFFIX}")
+
+
+def clean_audio_settings(
+    source_path: Path,
+    profile: str,
+    *,
+    sample_rate: int,
+    channels: int,
+    output_format: str,
+) -> Dict[str, Any]:
+    """Source identity (path, size, mtime) plus the resolved profile and output format of a clean file."""
+
+    profile_config = AUDIO_PROFILES.get(profile)
+    if profile_config is None:
+        raise AudioProcessingError(f"Unknown audio profile '{profile}'.")
+    stat = Path(source_path).stat()
+    return {
+        "source": str(source_path),
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "profile": profile,
+        "config": asdict(profile_config),
+        "sample_rate": sample_rate,
+        "channels": channels,
+        "sample_width": 2,
+        "output_format": output_format,
+    }
+
+
+def _read_settings(path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
 __all__ = [
     "AUDIO_PROFILES",
     "AudioProcessingError",
@@ -353,6 +723,8 @@ __all__ = [
     "ensure_rnnoise_model",
     "iter_audio_files",
     "SUPPORTED_OUTPUT_FORMATS",
+    "clean_audio_settings",
+    "clean_settings_path",
     "default_clean_path",
     "prepare_clean_audio",
 ]
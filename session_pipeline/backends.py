@@ -0,0 +1,380 @@
+"""Transcription backends: the OpenAI client and a local stand-in for offline load tests."""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from session_pipeline.chunking import BACKEND_PROFILES, BackendProfile
+from session_pipeline.probe import ProbeError, audio_duration_seconds
+
+OPENAI_DEFAULT_BASE_URL = "https://api.openai.com/v1"
+MOCK_WORDS_PER_SECOND = 2.5
+MOCK_SEGMENT_SECONDS = 5.0
+MOCK_VOCABULARY = (
+    "the party rides north toward the ruined keep while rain falls on the old road "
+    "and the ranger scouts ahead for tracks near the river crossing"
+).split()
+
+
+class TranscriptionBackend(ABC):
+    """
+    A speech-to-text service that turns one chunk into a JSON-ready response.
+
+    ``chunk`` is a chunk manifest entry (``path``, ``index``, ``start_ms``,
+    ``end_ms``). Implementations raise the service's own exceptions; those
+    carrying ``status_code``/``headers`` are classified for retry by
+    :class:`session_pipeline.transcription.TranscriptionEngine`. Each
+    implementation sets ``profile`` to the :class:`BackendProfile` of the
+    service it talks to.
+    """
+
+    profile: BackendProfile
+
+    @abstractmethod
+    def transcribe(self, chunk: Dict[str, Any]) -> Any:
+        """Send ``chunk`` to the service and return its response."""
+
+    @abstractmethod
+    def cache_parameters(self) -> Dict[str, Any]:
+        """Everything besides the audio that determines the response (the response-cache key)."""
+
+
+class OpenAIBackend(TranscriptionBackend):
+    """OpenAI ``audio.transcriptions`` (Whisper/GPT STT) through an ``openai.OpenAI`` client."""
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        model: str = "whisper-1",
+        response_format: str = "verbose_json",
+        timestamp_granularities: Optional[Sequence[str]] = ("word",),
+        profile: Optional[BackendProfile] = None,
+    ) -> None:
+        self.client = client
+        self.model = model
+        self.response_format = response_format
+        self.timestamp_granularities = list(timestamp_granularities or [])
+        self.profile = profile or BACKEND_PROFILES["whisper"]
+
+    def transcribe(self, chunk: Dict[str, Any]) -> Any:
+        with open(chunk["path"], "rb") as audio_file:
+            payload: Dict[str, Any] = {
+                "model": self.model,
+                "file": audio_file,
+                "response_format": self.response_format,
+            }
+            if self.timestamp_granularities:
+                payload["timestamp_granularities"] = self.timestamp_granularities
+            response = self.client.audio.transcriptions.create(**payload)
+        return normalise_response(response, self.response_format)
+
+    def cache_parameters(self) -> Dict[str, Any]:
+        return openai_cache_parameters(
+            model=self.model,
+            response_format=self.response_format,
+            timestamp_granularities=self.timestamp_granularities,
+            base_url=str(getattr(self.client, "base_url", "") or "") or None,
+        )
+
+
+def openai_cache_parameters(
+    *,
+    model: str,
+    response_format: str,
+    timestamp_granularities: Optional[Sequence[str]],
+    base_url: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Response-cache parameters for an OpenAI transcription request.
+
+    ``base_url`` defaults the way the SDK does (``OPENAI_BASE_URL``, then the
+    public API), so a runner can compute keys before it builds a client and
+    responses from a local stand-in never answer for the real service.
+    """
+
+    endpoint = base_url or os.environ.get("OPENAI_BASE_URL") or OPENAI_DEFAULT_BASE_URL
+    return {
+        "service": "openai",
+        "endpoint": endpoint.rstrip("/"),
+        "model": model,
+        "response_format": response_format,
+        "timestamp_granularities": list(timestamp_granularities or []),
+    }
+
+
+class MockHTTPError(Exception):
+    """An injected failure shaped like an SDK status error (``status_code`` plus ``headers``)."""
+
+    def __init__(self, status_code: int, message: str, *, headers: Optional[Mapping[str, str]] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = dict(headers or {})
+
+
+@dataclass(frozen=True)
+class MockSettings:
+    """
+    Behaviour of :class:`MockBackend`.
+
+    Latency follows the backend profile (``request_overhead_seconds`` plus
+    ``seconds_per_audio_second`` per second of audio), multiplied by
+    ``latency_scale`` and a uniform ``±latency_jitter`` factor. ``throttle_rate``
+    and ``error_rate`` inject 429s (with ``Retry-After``) and 500s at random;
+    ``concurrency_limit`` answers 429 whenever more requests than that are in
+    flight, like a real per-key limit. ``replay_dir`` serves recorded
+    responses (``<chunk stem>.whisper.json``, ``<chunk name>.elevenlabs.json``
+    or ``<chunk stem>.json``) instead of synthetic ones when present.
+    """
+
+    flavor: str = "whisper"
+    latency_scale: float = 1.0
+    latency_jitter: float = 0.2
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    concurrency_limit: Optional[int] = None
+    retry_after_seconds: float = 1.0
+    replay_dir: Optional[Path] = None
+    seed: Optional[int] = None
+
+
+@dataclass
+class MockStats:
+    requests: int = 0
+    throttled: int = 0
+    errors: int = 0
+    replayed: int = 0
+    peak_in_flight: int = 0
+
+
+class MockBackend(TranscriptionBackend):
+    """In-process stand-in that answers like Whisper ``verbose_json`` or ElevenLabs STT."""
+
+    def __init__(self, settings: Optional[MockSettings] = None, *, profile: Optional[BackendProfile] = None) -> None:
+        self.settings = settings or MockSettings()
+        if self.settings.flavor not in MOCK_RESPONSES:
+            raise ValueError(f"Unknown mock flavor '{self.settings.flavor}'.")
+        self.profile = profile or BACKEND_PROFILES[self.settings.flavor]
+        self.stats = MockStats()
+        self._rng = random.Random(self.settings.seed)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+
+    def transcribe(self, chunk: Dict[str, Any]) -> Dict[str, Any]:
+        if "start_ms" in chunk and "end_ms" in chunk:
+            duration = max(0.0, (int(chunk["end_ms"]) - int(chunk["start_ms"])) / 1000.0)
+        else:
+            try:
+                duration = audio_duration_seconds(Path(chunk["path"]))
+            except ProbeError as exc:
+                raise MockHTTPError(400, f"Unreadable audio: {exc}") from exc
+        return self.respond(Path(chunk["path"]).name, duration)
+
+    def cache_parameters(self) -> Dict[str, Any]:
+        return {"service": "mock", "flavor": self.settings.flavor, "replay_dir": self.settings.replay_dir}
+
+    def respond(self, filename: str, duration_seconds: float) -> Dict[str, Any]:
+        """Simulate one request for ``filename`` holding ``duration_seconds`` of audio."""
+
+        settings = self.settings
+        with self._lock:
+            self.stats.requests += 1
+            self._in_flight += 1
+            self.stats.peak_in_flight = max(self.stats.peak_in_flight, self._in_flight)
+            over_limit = settings.concurrency_limit is not None and self._in_flight > settings.concurrency_limit
+            roll = self._rng.random()
+            jitter = self._rng.uniform(1.0 - settings.latency_jitter, 1.0 + settings.latency_jitter)
+        try:
+            if over_limit or roll < settings.throttle_rate:
+                with self._lock:
+                    self.stats.throttled += 1
+                raise MockHTTPError(
+                    429,
+                    "Rate limit reached (mock)",
+                    headers={"retry-after": f"{settings.retry_after_seconds:g}"},
+                )
+            latency = settings.latency_scale * (
+                self.profile.request_overhead_seconds + self.profile.seconds_per_audio_second * duration_seconds
+            )
+            time.sleep(max(0.0, latency * jitter))
+            if roll < settings.throttle_rate + settings.error_rate:
+                with self._lock:
+                    self.stats.errors += 1
+                raise MockHTTPError(500, "Internal server error (mock)")
+            replayed = self._replay(filename)
+            if replayed is not None:
+                with self._lock:
+                    self.stats.replayed += 1
+                return replayed
+            return MOCK_RESPONSES[settings.flavor](filename, duration_seconds)
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    def _replay(self, filename: str) -> Optional[Dict[str, Any]]:
+        if self.settings.replay_dir is None:
+            return None
+        name = Path(filename)
+        for candidate in (f"{name.stem}.whisper.json", f"{name.name}.elevenlabs.json", f"{name.stem}.json"):
+            path = Path(self.settings.replay_dir) / candidate
+            if path.exists():
+                return json.loads(path.read_text(encoding="utf-8"))
+        return None
+
+
+def synthetic_words(filename: str, duration_seconds: float) -> List[Dict[str, Any]]:
+    """Deterministic words spread evenly over the audio, seeded by ``filename``."""
+
+    rng = random.Random(filename)
+    count = int(duration_seconds * MOCK_WORDS_PER_SECOND)
+    step = 1.0 / MOCK_WORDS_PER_SECOND
+    words = []
+    for index in range(count):
+        start = index * step
+        words.append(
+            {
+                "word": rng.choice(MOCK_VOCABULARY),
+                "start": round(start, 3),
+                "end": round(start + step * 0.8, 3),
+            }
+        )
+    return words
+
+
+def synthetic_verbose_json(filename: str, duration_seconds: float) -> Dict[str, Any]:
+    words = synthetic_words(filename, duration_seconds)
+    segments = []
+    for index, group in enumerate(_group_by_segment(words)):
+        segments.append(
+            {
+                "id": index,
+                "start": group[0]["start"],
+                "end": group[-1]["end"],
+                "text": " ".join(word["word"] for word in group),
+                "avg_logprob": -0.2,
+                "no_speech_prob": 0.01,
+            }
+        )
+    return {
+        "task": "transcribe",
+        "language": "english",
+        "duration": round(duration_seconds, 3),
+        "text": " ".join(word["word"] for word in words),
+        "segments": segments,
+        "words": words,
+    }
+
+
+def synthetic_elevenlabs(filename: str, duration_seconds: float) -> Dict[str, Any]:
+    words: List[Dict[str, Any]] = []
+    for index, group in enumerate(_group_by_segment(synthetic_words(filename, duration_seconds))):
+        for word in group:
+            if words:
+                words.append({"text": " ", "start": words[-1]["end"], "end": word["start"], "type": "spacing"})
+            words.append(
+                {
+                    "text": word["word"],
+                    "start": word["start"],
+                    "end": word["end"],
+                    "type": "word",
+                    "speaker_id": f"speaker_{index % 2}",
+                    "logprob": 0.0,
+                }
+            )
+    return {
+        "language_code": "eng",
+        "language_probability": 0.99,
+        "text": "".join(word["text"] for word in words),
+        "words": words,
+    }
+
+
+MOCK_RESPONSES: Dict[str, Callable[[str, float], Dict[str, Any]]] = {
+    "whisper": synthetic_verbose_json,
+    "elevenlabs": synthetic_elevenlabs,
+}
+
+
+def _group_by_segment(words: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    groups: List[List[Dict[str, Any]]] = []
+    for word in words:
+        bucket = int(word["start"] // MOCK_SEGMENT_SECONDS)
+        while len(groups) <= bucket:
+            groups.append([])
+        groups[bucket].append(word)
+    return [group for group in groups if group]
+
+
+def normalise_response(response: Any, response_format: str) -> Any:
+    """
+    Coerce the API response into either text or dict form based on ``response_format``.
+    """
+
+    if response_format in ("vtt", "srt", "text"):
+        return _ensure_text(response)
+    return _ensure_dict(response)
+
+
+def _ensure_text(response: Any) -> str:
+    """Return ``response`` as UTF-8 text, serialising when necessary."""
+
+    if isinstance(response, (bytes, bytearray)):
+        return response.decode("utf-8")
+    if isinstance(response, str):
+        return response
+    text_attr = getattr(response, "text", None)
+    if isinstance(text_attr, str):
+        return text_attr
+    if hasattr(response, "to_dict"):
+        try:
+            return response.to_dict().get("text", "")  # type: ignore[attr-defined]
+        except Exception:
+            return json.dumps(response.to_dict())  # type: ignore[attr-defined]
+    if isinstance(response, dict):
+        text_value = response.get("text")
+        if isinstance(text_value, str):
+            return text_value
+        return json.dumps(response)
+    return str(response)
+
+
+def _ensure_dict(response: Any) -> Dict[str, Any]:
+    """Return ``response`` as a JSON-serialisable dictionary."""
+
+    if isinstance(response, dict):
+        return response
+    if hasattr(response, "to_dict"):
+        return response.to_dict()  # type: ignore[attr-defined]
+    if hasattr(response, "model_dump"):
+        return response.model_dump()  # type: ignore[attr-defined]
+    if isinstance(response, (bytes, bytearray)):
+        response = response.decode("utf-8")
+    if isinstance(response, str):
+        try:
+            return json.loads(response)
+        except json.JSONDecodeError:
+            return {"raw": response}
+    return json.loads(json.dumps(response, default=str))
+
+
+__all__ = [
+    "MOCK_RESPONSES",
+    "MockBackend",
+    "MockHTTPError",
+    "MockSettings",
+    "MockStats",
+    "OpenAIBackend",
+    "TranscriptionBackend",
+    "normalise_response",
+    "openai_cache_parameters",
+    "synthetic_elevenlabs",
+    "synthetic_verbose_json",
+]
@@ -0,0 +1,336 @@
+"""Zero-copy views of chunk-sized windows over a single clean PCM WAV."""
+
+from __future__ import annotations
+
+import io
+import struct
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from session_pipeline.audio import add_overlap, detect_silences_ffmpeg, plan_chunk_spans
+from session_pipeline.silence import detect_silences_in_wav, np, read_wav_layout
+
+VIEW_BLOCK_BYTES = 1 << 20
+
+
+@dataclass(frozen=True)
+class ChunkView:
+    """
+    A ``[start_frame, end_frame)`` window over the PCM data of ``wav_path``.
+
+    Nothing is read until it is asked for: ``samples()`` returns an ``np.memmap``
+    slice, ``open()`` a seekable file-like object over the window's bytes (with
+    a synthesised WAV header by default), and ``write_wav()`` materialises the
+    window as its own file only when a consumer really needs one.
+    """
+
+    wav_path: Path
+    start_frame: int
+    end_frame: int
+    frame_rate: int
+    channels: int
+    sample_width: int
+    data_offset: int
+    index: int = 0
+    overlap_before_ms: int = 0
+    overlap_after_ms: int = 0
+
+    @classmethod
+    def whole(cls, wav_path: Path) -> "ChunkView":
+        """Return a view covering every frame of ``wav_path``."""
+
+        wav_path = Path(wav_path).expanduser().resolve()
+        channels, sample_width, frame_rate, data_offset, data_size = read_wav_layout(wav_path)
+        return cls(
+            wav_path=wav_path,
+            start_frame=0,
+            end_frame=data_size // (channels * sample_width),
+            frame_rate=frame_rate,
+            channels=channels,
+            sample_width=sample_width,
+            data_offset=data_offset,
+        )
+
+    @classmethod
+    def from_seconds(cls, wav_path: Path, start: float, end: float, *, index: int = 0) -> "ChunkView":
+        """Return the view of ``[start, end)`` seconds, clamped to the file (frames truncate like ``wave``)."""
+
+        base = cls.whole(wav_path)
+        return base.sub_view(int(start * base.frame_rate), int(end * base.frame_rate), index=index)
+
+    @classmethod
+    def from_ms(cls, wav_path: Path, start_ms: int, end_ms: int, *, index: int = 0) -> "ChunkView":
+        """Return the view of ``[start_ms, end_ms)``, mapped to frames the same way pydub slices."""
+
+        base = cls.whole(wav_path)
+        return base.sub_view(
+            int(start_ms * (base.frame_rate / 1000.0)),
+            int(end_ms * (base.frame_rate / 1000.0)),
+            index=index,
+        )
+
+    def sub_view(self, start_frame: int, end_frame: int, **overrides: Any) -> "ChunkView":
+        """Return a view of ``[start_frame, end_frame)`` relative to the file, clamped to this view."""
+
+        start_frame = min(max(self.start_frame, start_frame), self.end_frame)
+        end_frame = min(max(start_frame, end_frame), self.end_frame)
+        return replace(self, start_frame=start_frame, end_frame=end_frame, **overrides)
+
+    @property
+    def frame_count(self) -> int:
+        return self.end_frame - self.start_frame
+
+    @property
+    def frame_width(self) -> int:
+        return self.channels * self.sample_width
+
+    @property
+    def byte_offset(self) -> int:
+        """Absolute file offset of the first byte of the window."""
+
+        return self.data_offset + self.start_frame * self.frame_width
+
+    @property
+    def byte_length(self) -> int:
+        return self.frame_count * self.frame_width
+
+    @property
+    def start_seconds(self) -> float:
+        return self.start_frame / float(self.frame_rate)
+
+    @property
+    def end_seconds(self) -> float:
+        return self.end_frame / float(self.frame_rate)
+
+    @property
+    def duration_seconds(self) -> float:
+        return self.frame_count / float(self.frame_rate)
+
+    def samples(self) -> Any:
+        """
+        Return the window as a read-only ``np.memmap`` slice.
+
+        Mono files give a 1-D array; multichannel files are shaped ``(frames, channels)``.
+        """
+
+        if np is None:
+            raise RuntimeError("NumPy is required for ChunkView.samples(). Install with: pip install numpy")
+        dtypes = {1: np.uint8, 2: np.dtype("<i2"), 4: np.dtype("<i4")}
+        if self.sample_width not in dtypes:
+            raise ValueError(f"Unsupported sample width for memory mapping: {self.sample_width}")
+        if self.frame_count == 0:
+            return np.zeros((0,) if self.channels == 1 else (0, self.channels), dtype=dtypes[self.sample_width])
+        shape = (self.frame_count,) if self.channels == 1 else (self.frame_count, self.channels)
+        return np.memmap(self.wav_path, dtype=dtypes[self.sample_width], mode="r", offset=self.byte_offset, shape=shape)
+
+    def wav_header(self) -> bytes:
+        """Return a canonical 44-byte PCM WAV header describing this window."""
+
+        byte_rate = self.frame_rate * self.frame_width
+        return struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF",
+            36 + self.byte_length,
+            b"WAVE",
+            b"fmt ",
+            16,
+            1,
+            self.channels,
+            self.frame_rate,
+            byte_rate,
+            self.frame_width,
+            self.sample_width * 8,
+            b"data",
+            self.byte_length,
+        )
+
+    def open(self, *, with_header: bool = True) -> io.BufferedReader:
+        """
+        Return a seekable binary reader over the window.
+
+        With ``with_header`` the stream is a complete WAV file (suitable for
+        uploads or ``wave.open``); otherwise it yields the raw PCM bytes only.
+        """
+
+        header = self.wav_header() if with_header else b""
+        raw = _SpanReader(
+            self.wav_path,
+            self.byte_offset,
+            self.byte_length,
+            header=header,
+            name=f"{self.wav_path.stem}_view_{self.index:03d}.wav",
+        )
+        return io.BufferedReader(raw, buffer_size=VIEW_BLOCK_BYTES)
+
+    def iter_bytes(self, block_size: int = VIEW_BLOCK_BYTES) -> Iterator[bytes]:
+        """Yield the window's raw PCM in blocks of at most ``block_size`` bytes."""
+
+        with self.open(with_header=False) as handle:
+            while True:
+                block = handle.read(block_size)
+                if not block:
+                    break
+                yield block
+
+    def read_bytes(self) -> bytes:
+        """Return the window's raw PCM bytes."""
+
+        with self.open(with_header=False) as handle:
+            return handle.read()
+
+    def write_wav(self, destination: Path) -> Path:
+        """Materialise the window as a standalone WAV file at ``destination``."""
+
+        destination = Path(destination)
+        with destination.open("wb") as out:
+            out.write(self.wav_header())
+            for block in self.iter_bytes():
+                out.write(block)
+        return destination
+
+
+class _SpanReader(io.RawIOBase):
+    """Raw reader exposing ``header`` followed by ``length`` bytes of ``path`` from ``offset``."""
+
+    def __init__(self, path: Path, offset: int, length: int, *, header: bytes = b"", name: str = "") -> None:
+        super().__init__()
+        self.name = name  # upload clients read the file name from here
+        self._handle = Path(path).open("rb")
+        self._offset = offset
+        self._length = length
+        self._header = header
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        size = len(self._header) + self._length
+        if whence == io.SEEK_SET:
+            target = offset
+        elif whence == io.SEEK_CUR:
+            target = self._position + offset
+        elif whence == io.SEEK_END:
+            target = size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if target < 0:
+            raise ValueError("Negative seek position")
+        self._position = target
+        return target
+
+    def readinto(self, buffer: Any) -> int:
+        view = memoryview(buffer).cast("B")
+        written = 0
+        header_size = len(self._header)
+        if self._position < header_size and len(view):
+            piece = self._header[self._position : self._position + len(view)]
+            view[: len(piece)] = piece
+            written = len(piece)
+            self._position += written
+        remaining = min(len(view) - written, header_size + self._length - self._position)
+        if remaining > 0:
+            self._handle.seek(self._offset + self._position - header_size)
+            count = self._handle.readinto(view[written : written + remaining]) or 0
+            written += count
+            self._position += count
+        return written
+
+    def close(self) -> None:
+        if not self.closed:
+            self._handle.close()
+        super().close()
+
+
+def chunk_views_from_entries(wav_path: Path, entries: Iterable[Dict[str, Any]]) -> List[ChunkView]:
+    """Return views over ``wav_path`` for chunk manifest ``entries`` (their files need not exist)."""
+
+    base = ChunkView.whole(wav_path)
+    views: List[ChunkView] = []
+    for entry in sorted(entries, key=lambda item: int(item["index"])):
+        views.append(
+            base.sub_view(
+                int(int(entry["start_ms"]) * (base.frame_rate / 1000.0)),
+                int(int(entry["end_ms"]) * (base.frame_rate / 1000.0)),
+                index=int(entry["index"]),
+                overlap_before_ms=int(entry.get("overlap_before_ms") or 0),
+                overlap_after_ms=int(entry.get("overlap_after_ms") or 0),
+            )
+        )
+    return views
+
+
+def plan_chunk_views(
+    wav_path: Path,
+    *,
+    max_chunk_seconds: Optional[float] = 900,
+    min_silence_len: int = 500,
+    silence_thresh: int = -40,
+    silence_detector: str = "ffmpeg",
+    overlap_seconds: float = 0.0,
+) -> List[ChunkView]:
+    """
+    Plan chunks of a PCM WAV exactly like ``chunk_audio_file`` but write no files.
+
+    The views use the same silence-midpoint boundaries and overlap padding as
+    the physical chunker, so consumers that only need byte ranges or samples of
+    the clean session can skip exporting chunk files altogether. Views never
+    extend past the data: where pydub would pad the final chunk with a few
+    frames of silence, the last view simply ends at the last frame.
+    """
+
+    base = ChunkView.whole(wav_path)
+    length_ms = round(1000 * (base.frame_count / float(base.frame_rate)))
+
+    if silence_detector == "numpy":
+        silence_ranges = detect_silences_in_wav(
+            base.wav_path,
+            silence_thresh=silence_thresh,
+            min_silence_len=min_silence_len,
+        )
+    elif silence_detector == "ffmpeg":
+        silence_ranges = detect_silences_ffmpeg(
+            base.wav_path,
+            silence_thresh=silence_thresh,
+            min_silence_len=min_silence_len,
+        )
+    else:
+        raise ValueError(f"Unknown silence detector '{silence_detector}'.")
+
+    if max_chunk_seconds is None or max_chunk_seconds <= 0:
+        max_chunk_ms = length_ms
+    else:
+        max_chunk_ms = int(max_chunk_seconds * 1000)
+
+    spans = add_overlap(
+        plan_chunk_spans(length_ms, silence_ranges, max_chunk_ms),
+        length_ms,
+        int(round(overlap_seconds * 1000)),
+    )
+    return chunk_views_from_entries(
+        base.wav_path,
+        [
+            {
+                "index": index,
+                "start_ms": start_ms,
+                "end_ms": end_ms,
+                "overlap_before_ms": before,
+                "overlap_after_ms": after,
+            }
+            for index, (start_ms, end_ms, before, after) in enumerate(spans)
+        ],
+    )
+
+
+__all__ = [
+    "ChunkView",
+    "chunk_views_from_entries",
+    "plan_chunk_views",
+]
@@ -2,51 +2,185 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import math
+import shutil
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from session_pipeline.audio import chunk_audio_file
+from session_pipeline.audio import CHUNK_FORMATS, DEFAULT_OPUS_BITRATE, chunk_audio_file
+from session_pipeline.io_utils import sha256_file, write_json
 
 
 ChunkEntry = Dict[str, Any]
 
+CHUNK_MANIFEST_NAME = "chunk_manifest.json"
+CHUNKS_DIR_NAME = "chunks"
+CACHE_DIR_KEY_LENGTH = 16
+PCM_16K_MONO_BYTES_PER_SECOND = 16_000 * 2
+WAV_HEADER_MARGIN_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class BackendProfile:
+    """Limits and observed throughput of a transcription backend."""
+
+    name: str
+    max_upload_bytes: Optional[int] = None
+    max_chunk_seconds: Optional[float] = None
+    seconds_per_audio_second: float = 0.1  # processing time per second of audio
+    request_overhead_seconds: float = 2.0  # fixed upload/queue latency per request
+    initial_concurrency: int = 2  # requests in flight before any feedback from the backend
+    max_concurrency: int = 8  # ceiling for adaptive concurrency
+    requests_per_minute: Optional[float] = None  # token-bucket rate; None leaves only the concurrency limit
+
+
+BACKEND_PROFILES: Dict[str, BackendProfile] = {
+    "whisper": BackendProfile(
+        name="whisper",
+        max_upload_bytes=25 * 1024 * 1024,
+        seconds_per_audio_second=0.06,
+        request_overhead_seconds=3.0,
+        initial_concurrency=20,
+        max_concurrency=48,
+        requests_per_minute=500,
+    ),
+    "elevenlabs": BackendProfile(
+        name="elevenlabs",
+        max_upload_bytes=1024 * 1024 * 1024,
+        max_chunk_seconds=60 * 60,
+        seconds_per_audio_second=0.05,
+        request_overhead_seconds=5.0,
+        initial_concurrency=4,
+        max_concurrency=16,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class ChunkPlan:
+    chunk_seconds: float
+    chunk_count: int
+    waves: int
+    estimated_seconds: float
+
+
+def default_chunks_dir(source_path: Path) -> Path:
+    """
+    The per-session chunk store shared by every runner: ``chunks/`` beside the source recording.
+
+    ``transcribe_with_whisper.py`` and ``transcribe_with_elevenlabs.py`` both
+    default to it, so one recording's chunk sets live in one place whichever
+    backend cut them.
+    """
+
+    return Path(source_path).expanduser().resolve().parent / CHUNKS_DIR_NAME
+
 
 def prepare_audio_chunks(
     audio_path: Path,
     chunks_dir: Path,
     *,
-    manifest_path: Path,
+    manifest_path: Optional[Path] = None,
     reuse_existing: bool = True,
     max_chunk_seconds: Optional[float] = 900.0,
     chunk_basename: Optional[str] = None,
     min_silence_len: int = 500,
     silence_thresh: int = -40,
+    streaming: bool = False,
+    max_workers: int = 1,
+    silence_detector: str = "ffmpeg",
+    overlap_seconds: float = 0.0,
+    chunk_format: str = "wav",
+    chunk_bitrate: Optional[str] = None,
+    label: Optional[str] = None,
+    prune: bool = False,
 ) -> List[ChunkEntry]:
     """
     Ensure ``audio_path`` is split into chunks and tracked via ``manifest_path``.
 
-    If ``reuse_existing`` is True and the manifest lists valid chunk files,
+    Chunks are content-addressed: they live under ``chunks_dir/<cache key>/``,
+    where the key is derived from the SHA-256 of ``audio_path`` plus every
+    parameter that changes chunk boundaries. Runners that point at the same
+    ``chunks_dir`` (e.g. Whisper and ElevenLabs for one session, see
+    :func:`default_chunks_dir`) therefore share chunks, and a changed source
+    or parameter can never reuse stale files. A cache hit needs byte-identical
+    clean audio (same recording and preprocessing profile) and the same
+    ``max_chunk_seconds``, ``min_silence_len``, ``silence_thresh``,
+    ``silence_detector``, ``overlap_seconds``, ``chunk_format`` and
+    ``chunk_bitrate``; ``chunk_basename``, ``streaming`` and ``max_workers``
+    do not affect the key.
+
+    ``label`` names the consumer of the set (e.g. ``whisper:<session id>``);
+    every label that has used a set is recorded in its manifest. ``prune``
+    deletes the other chunk sets in ``chunks_dir`` used by ``label`` alone,
+    i.e. this consumer's superseded sets; sets another consumer has used are
+    kept (see :func:`prune_chunk_sets`).
+
+    If ``reuse_existing`` is True and either ``manifest_path`` or the shared
+    manifest in the cache directory lists valid chunk files for the current key,
     those entries are reused; otherwise the audio is re-chunked with the
-    provided parameters.
+    provided parameters. ``streaming`` selects the constant-memory chunker,
+    ``max_workers`` the number of concurrent chunk exports,
+    ``silence_detector`` the silence analysis backend, ``overlap_seconds``
+    the padding added to both sides of each chunk, and ``chunk_format`` /
+    ``chunk_bitrate`` the chunk codec (see ``chunk_audio_file``).
     """
 
+    audio_path = Path(audio_path).expanduser().resolve()
     chunks_dir = chunks_dir.expanduser().resolve()
-    chunks_dir.mkdir(parents=True, exist_ok=True)
-    manifest_path = manifest_path.expanduser().resolve()
+    manifest_path = manifest_path.expanduser().resolve() if manifest_path else None
+
+    parameters = _chunk_parameters(
+        max_chunk_seconds=max_chunk_seconds,
+        min_silence_len=min_silence_len,
+        silence_thresh=silence_thresh,
+        silence_detector=silence_detector,
+        overlap_seconds=overlap_seconds,
+        chunk_format=chunk_format,
+        chunk_bitrate=chunk_bitrate,
+    )
+    source_sha256 = sha256_file(audio_path)
+    cache_key = chunk_cache_key(source_sha256, parameters)
+    cache_dir = chunks_dir / cache_key[:CACHE_DIR_KEY_LENGTH]
+    shared_manifest_path = cache_dir / CHUNK_MANIFEST_NAME
+    manifest_header = {
+        "cache_key": cache_key,
+        "source_sha256": source_sha256,
+        "labels": [label] if label else [],
+        "parameters": parameters,
+    }
 
     if reuse_existing:
-        existing = _load_chunk_manifest(manifest_path)
-        if existing:
-            return existing
+        for candidate in (manifest_path, shared_manifest_path):
+            if candidate is None:
+                continue
+            existing = _load_chunk_manifest(candidate, cache_key=cache_key)
+            if existing:
+                if manifest_path is not None and candidate != manifest_path:
+                    _write_chunk_manifest(manifest_path, existing, header=manifest_header)
+                if label:
+                    _record_chunk_set_label(shared_manifest_path, label)
+                if prune and label:
+                    prune_chunk_sets(chunks_dir, keep_key=cache_key, label=label)
+                return existing
 
+    cache_dir.mkdir(parents=True, exist_ok=True)
     fresh_chunks = chunk_audio_file(
         audio_path,
-        chunks_dir,
+        cache_dir,
         max_chunk_seconds=max_chunk_seconds,
         chunk_basename=chunk_basename,
         min_silence_len=min_silence_len,
         silence_thresh=silence_thresh,
+        streaming=streaming,
+        max_workers=max_workers,
+        silence_detector=silence_detector,
+        overlap_seconds=overlap_seconds,
+        chunk_format=chunk_format,
+        chunk_bitrate=chunk_bitrate,
     )
 
     normalized_entries: List[ChunkEntry] = []
@@ -59,19 +193,199 @@ def prepare_audio_chunks(
                 "end_ms": int(entry["end_ms"]),
                 "path": str(chunk_path),
                 "format": entry.get("format"),
+                "codec": entry.get("codec"),
                 "bitrate": entry.get("bitrate"),
                 "frame_rate": entry.get("frame_rate"),
                 "channels": entry.get("channels"),
                 "sample_width": entry.get("sample_width"),
+                "overlap_before_ms": int(entry.get("overlap_before_ms") or 0),
+                "overlap_after_ms": int(entry.get("overlap_after_ms") or 0),
             }
         )
 
-    _write_chunk_manifest(manifest_path, normalized_entries)
+    _write_chunk_manifest(shared_manifest_path, normalized_entries, header=manifest_header)
+    if manifest_path is not None:
+        _write_chunk_manifest(manifest_path, normalized_entries, header=manifest_header)
+    if prune and label:
+        prune_chunk_sets(chunks_dir, keep_key=cache_key, label=label)
     return _convert_manifest_entries(normalized_entries)
 
 
-def _load_chunk_manifest(manifest_path: Path) -> List[ChunkEntry]:
-    """Load chunk metadata from ``manifest_path`` if it exists and is valid."""
+def prune_chunk_sets(chunks_dir: Path, *, keep_key: str, label: str) -> List[Path]:
+    """
+    Delete chunk sets under ``chunks_dir`` superseded by the set for ``keep_key``.
+
+    Only sets whose manifest lists ``label`` as their sole consumer are
+    removed: those are earlier cuts by the same runner and session (other
+    parameters or re-preprocessed audio). A set that another runner has cut
+    or reused, or that predates labels, is left alone, so runners sharing a
+    chunk directory never delete each other's chunks.
+    """
+
+    removed: List[Path] = []
+    for manifest in sorted(Path(chunks_dir).glob(f"*/{CHUNK_MANIFEST_NAME}")):
+        header = _read_manifest_header(manifest)
+        if header is None or header.get("cache_key") in (None, keep_key):
+            continue
+        if header.get("labels") == [label]:
+            shutil.rmtree(manifest.parent, ignore_errors=True)
+            removed.append(manifest.parent)
+    return removed
+
+
+def _read_manifest_header(manifest_path: Path) -> Optional[Dict[str, Any]]:
+    try:
+        header = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return header if isinstance(header, dict) else None
+
+
+def _record_chunk_set_label(manifest_path: Path, label: str) -> None:
+    """Add ``label`` to the consumers listed in the shared manifest at ``manifest_path``."""
+
+    header = _read_manifest_header(manifest_path)
+    if header is None:
+        return
+    labels = header.get("labels")
+    labels = list(labels) if isinstance(labels, list) else []
+    if label in labels:
+        return
+    header["labels"] = labels + [label]
+    write_json(manifest_path, header)
+
+
+def chunk_bytes_per_second(chunk_format: str = "wav", chunk_bitrate: Optional[str] = None) -> int:
+    """
+    Upper bound on the bytes one second of audio takes as a ``chunk_format`` chunk file.
+
+    Lossy formats encode at a constant bitrate (``chunk_bitrate``, ffmpeg
+    notation such as ``32k``). FLAC's size depends on the content and can
+    approach raw PCM on noisy audio, so lossless formats are bounded by
+    16 kHz mono 16-bit PCM.
+    """
+
+    spec = CHUNK_FORMATS.get(chunk_format)
+    if spec is None:
+        raise ValueError(f"Unknown chunk format '{chunk_format}'.")
+    if spec.lossless:
+        return PCM_16K_MONO_BYTES_PER_SECOND
+    return math.ceil(_parse_bitrate(chunk_bitrate or DEFAULT_OPUS_BITRATE) / 8)
+
+
+def _parse_bitrate(bitrate: str) -> float:
+    text = bitrate.strip().lower()
+    multiplier = {"k": 1_000, "m": 1_000_000}.get(text[-1:], 1)
+    try:
+        return float(text[:-1] if multiplier != 1 else text) * multiplier
+    except ValueError:
+        raise ValueError(f"Invalid bitrate '{bitrate}'.") from None
+
+
+def plan_chunk_size(
+    total_seconds: float,
+    *,
+    workers: int,
+    profile: BackendProfile,
+    bytes_per_audio_second: int = PCM_16K_MONO_BYTES_PER_SECOND,
+    min_chunk_seconds: float = 60.0,
+    packing_headroom: float = 1.1,
+) -> ChunkPlan:
+    """
+    Pick the ``max_chunk_seconds`` that minimises estimated session wall-clock time.
+
+    Each request is modelled as ``request_overhead_seconds`` plus
+    ``seconds_per_audio_second`` times its length, and ``workers`` requests run at
+    once, so a session split into ``n`` chunks takes ``ceil(n / workers)`` waves of
+    roughly equal chunks. Chunk counts that leave a lone straggler wave (one long
+    tail chunk running while the other workers idle) therefore lose to counts
+    that fill every wave. Chunks never exceed the backend's upload or duration
+    limits; the upload limit is converted to seconds with
+    ``bytes_per_audio_second``, which defaults to 16 kHz mono PCM (see
+    :func:`chunk_bytes_per_second` for other chunk formats). The returned
+    ``chunk_seconds`` includes ``packing_headroom`` because
+    silence-aligned chunks pack below their limit; headroom can only merge
+    chunks, never add a wave.
+    """
+
+    workers = max(1, int(workers))
+    total_seconds = max(0.0, float(total_seconds))
+    limit = _max_chunk_seconds_for(profile, bytes_per_audio_second)
+    if total_seconds == 0.0:
+        return ChunkPlan(chunk_seconds=limit or min_chunk_seconds, chunk_count=0, waves=0, estimated_seconds=0.0)
+
+    min_count = math.ceil(total_seconds / limit) if limit else 1
+    max_count = max(min_count, math.ceil(total_seconds / max(1.0, min_chunk_seconds)))
+
+    best: Optional[ChunkPlan] = None
+    for count in range(min_count, max_count + 1):
+        chunk_seconds = total_seconds / count
+        waves = math.ceil(count / workers)
+        estimated = waves * (profile.request_overhead_seconds + profile.seconds_per_audio_second * chunk_seconds)
+        if best is None or estimated < best.estimated_seconds - 1e-9:
+            target = chunk_seconds * packing_headroom
+            if limit:
+                target = min(target, limit)
+            best = ChunkPlan(
+                chunk_seconds=round(target, 3),
+                chunk_count=count,
+                waves=waves,
+                estimated_seconds=round(estimated, 3),
+            )
+    assert best is not None
+    return best
+
+
+def _max_chunk_seconds_for(profile: BackendProfile, bytes_per_audio_second: int) -> Optional[float]:
+    limits: List[float] = []
+    if profile.max_chunk_seconds:
+        limits.append(float(profile.max_chunk_seconds))
+    if profile.max_upload_bytes and bytes_per_audio_second > 0:
+        limits.append((profile.max_upload_bytes - WAV_HEADER_MARGIN_BYTES) / float(bytes_per_audio_second))
+    return min(limits) if limits else None
+
+
+def chunk_cache_key(source_sha256: str, parameters: Dict[str, Any]) -> str:
+    """Return the content address for chunks of ``source_sha256`` cut with ``parameters``."""
+
+    payload = json.dumps(
+        {"source_sha256": source_sha256, "parameters": parameters},
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _chunk_parameters(
+    *,
+    max_chunk_seconds: Optional[float],
+    min_silence_len: int,
+    silence_thresh: int,
+    silence_detector: str,
+    overlap_seconds: float,
+    chunk_format: str = "wav",
+    chunk_bitrate: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Collect the chunking parameters that change chunk boundaries or content."""
+
+    return {
+        "max_chunk_seconds": float(max_chunk_seconds) if max_chunk_seconds else None,
+        "min_silence_len": int(min_silence_len),
+        "silence_thresh": int(silence_thresh),
+        "silence_detector": silence_detector,
+        "overlap_seconds": float(overlap_seconds),
+        "chunk_format": chunk_format,
+        "chunk_bitrate": chunk_bitrate,
+    }
+
+
+def _load_chunk_manifest(manifest_path: Path, *, cache_key: Optional[str] = None) -> List[ChunkEntry]:
+    """
+    Load chunk metadata from ``manifest_path`` if it exists and is valid.
+
+    When ``cache_key`` is given, manifests recorded under a different key (or
+    legacy manifests without one) are treated as missing.
+    """
     if not manifest_path.exists():
         return []
     try:
@@ -79,6 +393,13 @@ def _load_chunk_manifest(manifest_path: Path) -> List[ChunkEntry]:
     except json.JSONDecodeError:
         return []
 
+    if isinstance(raw, dict):
+        if cache_key is not None and raw.get("cache_key") != cache_key:
+            return []
+        raw = raw.get("chunks")
+    elif cache_key is not None:
+        return []
+
     if not isinstance(raw, list):
         return []
 
@@ -101,10 +422,13 @@ def _load_chunk_manifest(manifest_path: Path) -> List[ChunkEntry]:
             "end_ms": end_ms,
             "path": chunk_path.resolve(),
             "format": item.get("format"),
+            "codec": item.get("codec"),
             "bitrate": item.get("bitrate"),
             "frame_rate": item.get("frame_rate"),
             "channels": item.get("channels"),
             "sample_width": item.get("sample_width"),
+            "overlap_before_ms": int(item.get("overlap_before_ms") or 0),
+            "overlap_after_ms": int(item.get("overlap_after_ms") or 0),
         }
         entries.append(entry)
 
@@ -112,8 +436,13 @@ def _load_chunk_manifest(manifest_path: Path) -> List[ChunkEntry]:
     return entries
 
 
-def _write_chunk_manifest(manifest_path: Path, entries: List[ChunkEntry]) -> None:
-    """Persist ``entries`` to ``manifest_path`` as JSON."""
+def _write_chunk_manifest(
+    manifest_path: Path,
+    entries: List[ChunkEntry],
+    *,
+    header: Dict[str, Any],
+) -> None:
+    """Persist ``entries`` plus the cache ``header`` to ``manifest_path`` as JSON."""
     manifest_path.parent.mkdir(parents=True, exist_ok=True)
     serializable = []
     for entry in entries:
@@ -124,13 +453,18 @@ def _write_chunk_manifest(manifest_path: Path, entries: List[ChunkEntry]) -> Non
                 "end_ms": entry["end_ms"],
                 "path": str(entry["path"]),
                 "format": entry.get("format"),
+                "codec": entry.get("codec"),
                 "bitrate": entry.get("bitrate"),
                 "frame_rate": entry.get("frame_rate"),
                 "channels": entry.get("channels"),
                 "sample_width": entry.get("sample_width"),
+                "overlap_before_ms": int(entry.get("overlap_before_ms") or 0),
+                "overlap_after_ms": int(entry.get("overlap_after_ms") or 0),
             }
         )
-    manifest_path.write_text(json.dumps(serializable, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    payload = dict(header)
+    payload["chunks"] = serializable
+    manifest_path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
 
 
 def _convert_manifest_entries(entries: List[ChunkEntry]) -> List[ChunkEntry]:
@@ -144,14 +478,28 @@ def _convert_manifest_entries(entries: List[ChunkEntry]) -> List[ChunkEntry]:
                 "end_ms": int(entry["end_ms"]),
                 "path": Path(entry["path"]).expanduser().resolve(),
                 "format": entry.get("format"),
+                "codec": entry.get("codec"),
                 "bitrate": entry.get("bitrate"),
                 "frame_rate": entry.get("frame_rate"),
                 "channels": entry.get("channels"),
                 "sample_width": entry.get("sample_width"),
+                "overlap_before_ms": int(entry.get("overlap_before_ms") or 0),
+                "overlap_after_ms": int(entry.get("overlap_after_ms") or 0),
             }
         )
     converted.sort(key=lambda item: item["index"])
     return converted
 
 
-__all__ = ["prepare_audio_chunks"]
+__all__ = [
+    "BACKEND_PROFILES",
+    "BackendProfile",
+    "CHUNK_MANIFEST_NAME",
+    "ChunkPlan",
+    "chunk_bytes_per_second",
+    "chunk_cache_key",
+    "default_chunks_dir",
+    "plan_chunk_size",
+    "prune_chunk_sets",
+    "prepare_audio_chunks",
+]
@@ -0,0 +1,142 @@
+"""Shared on-disk cache of preprocessed ("clean") session audio."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from session_pipeline.io_utils import evict_lru_files, file_lock, sha256_file
+
+CLEAN_CACHE_DIR = Path.home() / ".cache" / "taelgar" / "clean"
+CLEAN_CACHE_DIR_ENV = "TAELGAR_CLEAN_CACHE_DIR"
+CLEAN_CACHE_MAX_BYTES_ENV = "TAELGAR_CLEAN_CACHE_MAX_BYTES"
+DEFAULT_CLEAN_CACHE_MAX_BYTES = 20 * 1024**3
+CACHE_LOCK_NAME = ".cache.lock"
+ENTRY_KEY_LENGTH = 32
+LOCK_SUFFIX = ".lock"
+EVICTION_GRACE_SECONDS = 60 * 60
+
+
+class CleanAudioCache:
+    """
+    Size-bounded LRU cache of clean audio files, safe across processes.
+
+    Entries are named by a key derived from the source file's SHA-256 plus the
+    preprocessing parameters, so a changed source or profile can never hit a
+    stale entry. A per-key ``flock`` makes concurrent processes asking for the
+    same entry wait for one producer instead of all running ffmpeg; entries are
+    published with an atomic rename, and hits refresh the file's mtime, which
+    eviction uses as its recency order.
+
+    Eviction only deletes an entry while holding its per-key lock (so never
+    between a hit's existence check and its touch), deletes the lock file with
+    it, and spares entries used in the last ``grace_seconds`` because callers
+    keep reading a returned file after :meth:`get_or_create` returns.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        *,
+        max_bytes: Optional[int] = None,
+        grace_seconds: float = EVICTION_GRACE_SECONDS,
+    ) -> None:
+        if cache_dir is None:
+            cache_dir = Path(os.environ.get(CLEAN_CACHE_DIR_ENV) or CLEAN_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(os.environ.get(CLEAN_CACHE_MAX_BYTES_ENV) or DEFAULT_CLEAN_CACHE_MAX_BYTES)
+        self.cache_dir = Path(cache_dir).expanduser().resolve()
+        self.max_bytes = max_bytes
+        self.grace_seconds = grace_seconds
+
+    def key_for(self, source_path: Path, parameters: Dict[str, Any]) -> str:
+        """Return the cache key for ``source_path`` processed with ``parameters``."""
+
+        payload = json.dumps(
+            {"source_sha256": sha256_file(source_path), "parameters": parameters},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str, output_format: str) -> Path:
+        return self.cache_dir / f"{key[:ENTRY_KEY_LENGTH]}.{output_format}"
+
+    def get_or_create(
+        self,
+        source_path: Path,
+        parameters: Dict[str, Any],
+        *,
+        output_format: str,
+        produce: Callable[[Path], None],
+    ) -> tuple[Path, bool]:
+        """
+        Return ``(path, hit)`` for the clean version of ``source_path``.
+
+        On a miss ``produce(partial_path)`` must write the clean audio to
+        ``partial_path``; it is then renamed into place and the cache trimmed to
+        ``max_bytes``. Callers must treat the returned file as read-only.
+        """
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        key = self.key_for(source_path, parameters)
+        target = self.path_for(key, output_format)
+
+        with file_lock(self._lock_path(key[:ENTRY_KEY_LENGTH])):
+            if target.exists():
+                os.utime(target)
+                return target, True
+            partial = self.cache_dir / f".{key[:ENTRY_KEY_LENGTH]}.{os.getpid()}.partial.{output_format}"
+            try:
+                produce(partial)
+                os.replace(partial, target)
+            finally:
+                partial.unlink(missing_ok=True)
+
+        self.evict(keep=target)
+        return target, False
+
+    def evict(self, *, keep: Optional[Path] = None) -> List[Path]:
+        """Delete least-recently-used entries until the cache fits in ``max_bytes``."""
+
+        with file_lock(self.cache_dir / CACHE_LOCK_NAME):
+            removed = evict_lru_files(
+                self.cache_dir,
+                self.max_bytes,
+                keep=keep,
+                min_idle_seconds=self.grace_seconds,
+                lock_path_for=lambda path: self._lock_path(path.name.split(".", 1)[0]),
+            )
+            self._remove_orphan_locks()
+        return removed
+
+    def _lock_path(self, entry_name: str) -> Path:
+        return self.cache_dir / f".{entry_name}{LOCK_SUFFIX}"
+
+    def _remove_orphan_locks(self) -> None:
+        """Delete per-key lock files whose entry is gone and which nobody holds."""
+
+        for lock_path in self.cache_dir.glob(f".*{LOCK_SUFFIX}"):
+            entry_name = lock_path.name[1 : -len(LOCK_SUFFIX)]
+            if lock_path.name == CACHE_LOCK_NAME or any(self.cache_dir.glob(f"{entry_name}.*")):
+                continue
+            with file_lock(lock_path, blocking=False) as acquired:
+                if acquired:
+                    lock_path.unlink(missing_ok=True)
+
+
+def default_clean_cache() -> CleanAudioCache:
+    """Return the cache at ``$TAELGAR_CLEAN_CACHE_DIR`` (default ``~/.cache/taelgar/clean``)."""
+
+    return CleanAudioCache()
+
+
+__all__ = [
+    "CLEAN_CACHE_DIR",
+    "CleanAudioCache",
+    "default_clean_cache",
+]
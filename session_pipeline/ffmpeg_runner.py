@@ -0,0 +1,370 @@
+"""Run ffmpeg with structured progress, streamed stderr, timeouts and a machine-wide process limit."""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence
+
+try:
+    import fcntl  # type: ignore
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore
+
+FFMPEG_SLOTS_DIR = Path.home() / ".cache" / "taelgar" / "ffmpeg-slots"
+FFMPEG_SLOTS_DIR_ENV = "TAELGAR_FFMPEG_SLOTS_DIR"
+FFMPEG_MAX_PROCS_ENV = "TAELGAR_FFMPEG_MAX_PROCS"
+SLOT_POLL_SECONDS = 0.05
+STDERR_TAIL_LINES = 40
+
+ProgressCallback = Callable[["FFmpegProgress"], None]
+LineCallback = Callable[[str], None]
+
+
+@dataclass(frozen=True)
+class FFmpegProgress:
+    out_seconds: float
+    speed: Optional[float]
+    total_size: Optional[int]
+    done: bool
+
+
+class FFmpegError(RuntimeError):
+    """Raised when ffmpeg exits non-zero; ``stderr_tail`` holds its last log lines."""
+
+    def __init__(self, message: str, *, returncode: Optional[int] = None, stderr_tail: Sequence[str] = ()) -> None:
+        super().__init__(message)
+        self.returncode = returncode
+        self.stderr_tail = list(stderr_tail)
+
+
+class FFmpegTimeout(FFmpegError):
+    """Raised when ffmpeg is killed for exceeding its timeout."""
+
+
+class ProcessSlots:
+    """
+    Machine-wide counting semaphore for ffmpeg processes.
+
+    Each slot is a lock file under ``slots_dir``; holding an exclusive ``flock``
+    on one is holding the slot, so the limit spans threads, process pools and
+    unrelated CLI invocations alike, and a crashed holder frees its slot when
+    the kernel closes the file. ``max_procs`` defaults to
+    ``$TAELGAR_FFMPEG_MAX_PROCS`` or the CPU count; 0 disables the limit.
+    """
+
+    def __init__(self, slots_dir: Optional[Path] = None, *, max_procs: Optional[int] = None) -> None:
+        if slots_dir is None:
+            slots_dir = Path(os.environ.get(FFMPEG_SLOTS_DIR_ENV) or FFMPEG_SLOTS_DIR)
+        if max_procs is None:
+            max_procs = int(os.environ.get(FFMPEG_MAX_PROCS_ENV) or os.cpu_count() or 1)
+        self.slots_dir = Path(slots_dir).expanduser()
+        self.max_procs = max_procs
+
+    @contextmanager
+    def acquire(self) -> Iterator[Optional[int]]:
+        """Block until a slot is free and hold it for the ``with`` body; yields the slot index."""
+
+        if fcntl is None or self.max_procs <= 0:
+            yield None
+            return
+        self.slots_dir.mkdir(parents=True, exist_ok=True)
+        while True:
+            for index in range(self.max_procs):
+                handle = open(self.slots_dir / f"slot-{index}.lock", "a+")
+                try:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    handle.close()
+                    continue
+                try:
+                    yield index
+                finally:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+                    handle.close()
+                return
+            time.sleep(SLOT_POLL_SECONDS)
+
+
+def default_process_slots() -> ProcessSlots:
+    return ProcessSlots()
+
+
+class FFmpegProcess:
+    """
+    One ffmpeg invocation, used as a context manager.
+
+    ``args`` are everything after ``ffmpeg -hide_banner -nostats``. A slot from
+    ``slots`` is held for the process lifetime. stderr is read line by line on
+    a background thread, handed to ``on_stderr_line`` and otherwise only kept
+    as a short tail for error messages. With ``on_progress`` ffmpeg writes
+    ``-progress`` key/value blocks to a dedicated pipe (leaving stdout free for
+    audio) and each block is reported as an :class:`FFmpegProgress`. ``stdin``
+    and ``stdout`` take ``subprocess`` constants and default to ``DEVNULL``;
+    with ``PIPE`` the caller streams through :attr:`stdin`/:attr:`stdout`
+    before calling :meth:`wait`. ``timeout`` (seconds) kills the process.
+    """
+
+    def __init__(
+        self,
+        args: Sequence[str],
+        *,
+        stdin: Optional[int] = None,
+        stdout: Optional[int] = None,
+        timeout: Optional[float] = None,
+        on_progress: Optional[ProgressCallback] = None,
+        on_stderr_line: Optional[LineCallback] = None,
+        slots: Optional[ProcessSlots] = None,
+    ) -> None:
+        self.args = list(args)
+        self.timeout = timeout
+        self._stdin = subprocess.DEVNULL if stdin is None else stdin
+        self._stdout = subprocess.DEVNULL if stdout is None else stdout
+        self._on_progress = on_progress
+        self._on_stderr_line = on_stderr_line
+        self._slots = slots
+        self._tail: Deque[str] = deque(maxlen=STDERR_TAIL_LINES)
+        self._threads: List[threading.Thread] = []
+        self._timer: Optional[threading.Timer] = None
+        self._timed_out = False
+        self._slot: Any = None
+        self.process: Optional[subprocess.Popen] = None
+
+    @property
+    def stdin(self) -> Optional[IO[bytes]]:
+        return self.process.stdin if self.process else None
+
+    @property
+    def stdout(self) -> Optional[IO[bytes]]:
+        return self.process.stdout if self.process else None
+
+    @property
+    def stderr_tail(self) -> List[str]:
+        return list(self._tail)
+
+    def __enter__(self) -> "FFmpegProcess":
+        self._slot = (self._slots or default_process_slots()).acquire()
+        self._slot.__enter__()
+        try:
+            self._start()
+        except BaseException:
+            self._slot.__exit__(None, None, None)
+            raise
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        try:
+            if self.process is not None:
+                if self.process.poll() is None:
+                    self.process.kill()
+                self.process.wait()
+                self._finish()
+                for stream in (self.process.stdin, self.process.stdout):
+                    if stream is not None:
+                        stream.close()
+        finally:
+            self._slot.__exit__(exc_type, exc, tb)
+
+    def wait(self) -> int:
+        """Wait for ffmpeg to exit; raise :class:`FFmpegTimeout` or :class:`FFmpegError` on failure."""
+
+        assert self.process is not None
+        if self.process.stdin is not None and not self.process.stdin.closed:
+            self.process.stdin.close()
+        returncode = self.process.wait()
+        self._finish()
+        if self._timed_out:
+            raise FFmpegTimeout(
+                f"ffmpeg exceeded its {self.timeout:g}s timeout",
+                returncode=returncode,
+                stderr_tail=self._tail,
+            )
+        if returncode != 0:
+            lines = [line for line in self._tail if line.strip()]
+            raise FFmpegError(
+                lines[-1].strip() if lines else "ffmpeg failed",
+                returncode=returncode,
+                stderr_tail=self._tail,
+            )
+        return returncode
+
+    def _start(self) -> None:
+        cmd = ["ffmpeg", "-hide_banner", "-nostats"]
+        progress_fd: Optional[int] = None
+        pass_fds: tuple = ()
+        if self._on_progress is not None and os.name == "posix":
+            progress_fd, write_fd = os.pipe()
+            cmd.extend(["-progress", f"pipe:{write_fd}"])
+            pass_fds = (write_fd,)
+        cmd.extend(self.args)
+        try:
+            self.process = subprocess.Popen(
+                cmd,
+                stdin=self._stdin,
+                stdout=self._stdout,
+                stderr=subprocess.PIPE,
+                pass_fds=pass_fds,
+            )
+        except BaseException:
+            if progress_fd is not None:
+                os.close(progress_fd)
+            raise
+        finally:
+            for fd in pass_fds:
+                os.close(fd)
+
+        self._spawn(self._read_stderr)
+        if progress_fd is not None:
+            self._spawn(self._read_progress, progress_fd)
+        if self.timeout is not None:
+            self._timer = threading.Timer(self.timeout, self._kill_for_timeout)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _spawn(self, target: Callable[..., None], *args: Any) -> None:
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def _finish(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self.process is not None and self.process.stderr is not None:
+            self.process.stderr.close()
+
+    def _kill_for_timeout(self) -> None:
+        if self.process is not None and self.process.poll() is None:
+            self._timed_out = True
+            self.process.kill()
+
+    def _read_stderr(self) -> None:
+        assert self.process is not None and self.process.stderr is not None
+        for raw in self.process.stderr:
+            line = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+            self._tail.append(line)
+            if self._on_stderr_line is not None:
+                self._on_stderr_line(line)
+
+    def _read_progress(self, fd: int) -> None:
+        assert self._on_progress is not None
+        block: Dict[str, str] = {}
+        with os.fdopen(fd, "r", encoding="utf-8", errors="replace") as stream:
+            for line in stream:
+                key, _, value = line.strip().partition("=")
+                if key != "progress":
+                    block[key] = value
+                    continue
+                self._on_progress(_progress_from_block(block, done=value == "end"))
+                block = {}
+
+
+def run_ffmpeg(
+    args: Sequence[str],
+    *,
+    timeout: Optional[float] = None,
+    on_progress: Optional[ProgressCallback] = None,
+    on_stderr_line: Optional[LineCallback] = None,
+    slots: Optional[ProcessSlots] = None,
+) -> None:
+    """Run ``ffmpeg -hide_banner -nostats <args>`` to completion (see :class:`FFmpegProcess`)."""
+
+    with FFmpegProcess(
+        args,
+        timeout=timeout,
+        on_progress=on_progress,
+        on_stderr_line=on_stderr_line,
+        slots=slots,
+    ) as process:
+        process.wait()
+
+
+class SilenceEventParser:
+    """Collect ``silencedetect`` ranges from ffmpeg log lines as they arrive."""
+
+    def __init__(self) -> None:
+        self._starts: List[float] = []
+        self._ends: List[float] = []
+
+    def feed(self, line: str) -> None:
+        if "silence_start: " in line:
+            try:
+                self._starts.append(float(line.split("silence_start: ")[1]))
+            except (IndexError, ValueError):
+                pass
+        elif "silence_end: " in line:
+            try:
+                self._ends.append(float(line.split("silence_end: ")[1].split(" |")[0]))
+            except (IndexError, ValueError):
+                pass
+
+    @property
+    def ranges(self) -> List[Dict[str, float]]:
+        return [{"start": start, "end": end} for start, end in zip(self._starts, self._ends)]
+
+
+def detect_silences(
+    source_path: Path,
+    *,
+    silence_thresh: int,
+    min_silence_len: int,
+    timeout: Optional[float] = None,
+    on_progress: Optional[ProgressCallback] = None,
+) -> List[Dict[str, float]]:
+    """Run ``silencedetect`` over ``source_path``, parsing events incrementally."""
+
+    parser = SilenceEventParser()
+    run_ffmpeg(
+        [
+            "-i",
+            str(source_path),
+            "-af",
+            f"silencedetect=noise={silence_thresh}dB:d={min_silence_len / 1000.0}",
+            "-f",
+            "null",
+            "-",
+        ],
+        timeout=timeout,
+        on_progress=on_progress,
+        on_stderr_line=parser.feed,
+    )
+    return parser.ranges
+
+
+def _progress_from_block(block: Dict[str, str], *, done: bool) -> FFmpegProgress:
+    out_us = block.get("out_time_us") or block.get("out_time_ms")
+    try:
+        out_seconds = max(0.0, int(out_us) / 1_000_000) if out_us else 0.0
+    except ValueError:
+        out_seconds = 0.0
+    speed_text = block.get("speed", "").strip().rstrip("x")
+    try:
+        speed: Optional[float] = float(speed_text)
+    except ValueError:
+        speed = None
+    try:
+        total_size: Optional[int] = int(block["total_size"])
+    except (KeyError, ValueError):
+        total_size = None
+    return FFmpegProgress(out_seconds=out_seconds, speed=speed, total_size=total_size, done=done)
+
+
+__all__ = [
+    "FFmpegError",
+    "FFmpegProcess",
+    "FFmpegProgress",
+    "FFmpegTimeout",
+    "ProcessSlots",
+    "SilenceEventParser",
+    "default_process_slots",
+    "detect_silences",
+    "run_ffmpeg",
+]
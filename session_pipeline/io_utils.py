@@ -2,9 +2,20 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator, List, Optional
+
+try:
+    import fcntl  # type: ignore
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore
+
+HASH_BLOCK_SIZE = 1 << 20
 
 
 def write_json(path: Path, payload: Any) -> None:
@@ -18,4 +29,103 @@ def write_json(path: Path, payload: Any) -> None:
         fh.write("\n")
 
 
-__all__ = ["write_json"]
+def sha256_file(path: Path) -> str:
+    """
+    Return the hex SHA-256 digest of ``path``, reading it in fixed-size blocks.
+    """
+
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as fh:
+        for block in iter(lambda: fh.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@contextmanager
+def file_lock(path: Path, *, shared: bool = False, blocking: bool = True) -> Iterator[bool]:
+    """
+    Hold an advisory ``flock`` on ``path`` (created if missing) for the block.
+
+    The lock is visible to every process on the machine. With ``blocking=False``
+    a busy lock is not waited for: the block runs unlocked and the context value
+    is False. A lock file unlinked while we waited for it (cache eviction removes
+    them) is re-created and locked again, so every holder locks the same inode.
+    On platforms without ``fcntl`` the block runs unlocked.
+    """
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    while True:
+        with path.open("a+b") as fh:
+            if fcntl is None:
+                yield True
+                return
+            mode = fcntl.LOCK_SH if shared else fcntl.LOCK_EX
+            try:
+                fcntl.flock(fh.fileno(), mode if blocking else mode | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                if os.stat(path).st_ino != os.fstat(fh.fileno()).st_ino:
+                    continue
+            except FileNotFoundError:
+                continue
+            try:
+                yield True
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+            return
+
+
+def evict_lru_files(
+    directory: Path,
+    max_bytes: int,
+    *,
+    keep: Optional[Path] = None,
+    min_idle_seconds: float = 0.0,
+    lock_path_for: Optional[Callable[[Path], Path]] = None,
+) -> List[Path]:
+    """
+    Delete the least recently modified files in ``directory`` until it fits in ``max_bytes``.
+
+    Dot-files (locks, partial writes) are neither counted nor deleted, and
+    ``keep`` is never deleted, nor is any file modified in the last
+    ``min_idle_seconds``. With ``lock_path_for`` a file is only deleted while
+    its per-entry lock can be taken without waiting, and that lock file is
+    deleted with it. Callers serialise eviction with their own lock.
+    """
+
+    entries = []
+    for path in Path(directory).iterdir():
+        if path.name.startswith(".") or not path.is_file():
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    removed: List[Path] = []
+    total = sum(size for _, size, _ in entries)
+    idle_before = time.time() - min_idle_seconds
+    for mtime, size, path in sorted(entries, key=lambda item: item[0]):
+        if total <= max_bytes:
+            break
+        if (keep is not None and path == keep) or (min_idle_seconds and mtime > idle_before):
+            continue
+        if lock_path_for is None:
+            path.unlink(missing_ok=True)
+        else:
+            lock_path = lock_path_for(path)
+            with file_lock(lock_path, blocking=False) as acquired:
+                if not acquired:
+                    continue
+                path.unlink(missing_ok=True)
+                lock_path.unlink(missing_ok=True)
+        total -= size
+        removed.append(path)
+    return removed
+
+
+__all__ = ["evict_lru_files", "file_lock", "sha256_file", "write_json"]
@@ -0,0 +1,216 @@
+"""Two-pass streaming loudness normalisation for the ``normalize`` audio profiles."""
+
+from __future__ import annotations
+
+import math
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+from session_pipeline.ffmpeg_runner import FFmpegProcess
+
+try:
+    import numpy as np  # type: ignore
+    import soundfile as sf  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+    sf = None  # type: ignore
+
+NORMALIZE_BLOCK_FRAMES = 1 << 19  # ~33 s at 16 kHz per read
+SOUNDFILE_FORMATS = {"wav": "WAV", "flac": "FLAC"}
+
+
+@dataclass(frozen=True)
+class LoudnessStats:
+    rms_dbfs: float
+    peak_dbfs: float
+    gain_db: float
+
+
+def streaming_normalize_available() -> bool:
+    return np is not None and sf is not None
+
+
+def normalise_audio_streaming(
+    source_path: Path,
+    output_path: Path,
+    *,
+    sample_rate: int,
+    channels: int,
+    output_format: str,
+    target_dbfs: float,
+    headroom_db: float,
+    block_frames: int = NORMALIZE_BLOCK_FRAMES,
+) -> LoudnessStats:
+    """
+    Normalise ``source_path`` to ``target_dbfs`` RMS with ``headroom_db`` peak headroom.
+
+    Pass one measures RMS and peak block by block; pass two applies the gain
+    and writes 16-bit ``output_format`` at ``sample_rate``/``channels``. Sources
+    already in that rate and layout are read directly with soundfile; anything
+    else is decoded once by ffmpeg into a temporary PCM spool beside the output
+    (measured while it is written). Memory stays at a few blocks regardless of
+    the recording length. The gain rule matches the pydub implementation:
+    ``target - dBFS``, reduced further if the peak would exceed ``-headroom_db``.
+    """
+
+    if not streaming_normalize_available():
+        raise RuntimeError("NumPy and soundfile are required for streaming normalisation.")
+
+    source_path = Path(source_path)
+    output_path = Path(output_path)
+    spool_path: Optional[Path] = None
+    try:
+        if _matches_layout(source_path, sample_rate, channels):
+            pcm_path = source_path
+            sum_squares, peak, samples = _measure(pcm_path, block_frames)
+        else:
+            spool_path = output_path.with_name(f".{output_path.stem}.decode.wav")
+            sum_squares, peak, samples = _decode_and_measure(
+                source_path,
+                spool_path,
+                sample_rate=sample_rate,
+                channels=channels,
+                block_frames=block_frames,
+            )
+            pcm_path = spool_path
+
+        stats = _loudness_stats(sum_squares, peak, samples, target_dbfs=target_dbfs, headroom_db=headroom_db)
+        factor = 10 ** (stats.gain_db / 20.0)
+        with sf.SoundFile(
+            str(output_path),
+            mode="w",
+            samplerate=sample_rate,
+            channels=channels,
+            subtype="PCM_16",
+            format=SOUNDFILE_FORMATS[output_format],
+        ) as writer:
+            for block in _iter_blocks(pcm_path, block_frames):
+                scaled = np.rint(block.astype(np.float64) * factor)
+                writer.write(np.clip(scaled, -32768, 32767).astype(np.int16))
+    finally:
+        if spool_path is not None:
+            spool_path.unlink(missing_ok=True)
+    return stats
+
+
+def _matches_layout(path: Path, sample_rate: int, channels: int) -> bool:
+    try:
+        info = sf.info(str(path))
+    except Exception:
+        return False
+    return info.samplerate == sample_rate and info.channels == channels and info.subtype == "PCM_16"
+
+
+def _iter_blocks(path: Path, block_frames: int) -> Iterator[Any]:
+    """Yield ``(frames, channels)`` int16 blocks of ``path``."""
+
+    with sf.SoundFile(str(path)) as reader:
+        while True:
+            block = reader.read(block_frames, dtype="int16", always_2d=True)
+            if not len(block):
+                break
+            yield block
+
+
+def _accumulate(block: Any) -> tuple[float, int]:
+    values = block.astype(np.float64)
+    return float(np.einsum("ij,ij->", values, values)), int(np.max(np.abs(block.astype(np.int32))))
+
+
+def _measure(path: Path, block_frames: int) -> tuple[float, int, int]:
+    sum_squares = 0.0
+    peak = 0
+    samples = 0
+    for block in _iter_blocks(path, block_frames):
+        block_squares, block_peak = _accumulate(block)
+        sum_squares += block_squares
+        peak = max(peak, block_peak)
+        samples += block.size
+    return sum_squares, peak, samples
+
+
+def _decode_and_measure(
+    source_path: Path,
+    spool_path: Path,
+    *,
+    sample_rate: int,
+    channels: int,
+    block_frames: int,
+) -> tuple[float, int, int]:
+    """Decode ``source_path`` to a 16-bit spool WAV through ffmpeg, measuring it on the way."""
+
+    cmd = [
+        "-loglevel",
+        "error",
+        "-i",
+        str(source_path),
+        "-ac",
+        str(channels),
+        "-ar",
+        str(sample_rate),
+        "-f",
+        "s16le",
+        "-acodec",
+        "pcm_s16le",
+        "pipe:1",
+    ]
+    sum_squares = 0.0
+    peak = 0
+    samples = 0
+    block_bytes = block_frames * channels * 2
+    with FFmpegProcess(cmd, stdout=subprocess.PIPE) as process:
+        assert process.stdout is not None
+        with sf.SoundFile(
+            str(spool_path),
+            mode="w",
+            samplerate=sample_rate,
+            channels=channels,
+            subtype="PCM_16",
+            format="WAV",
+        ) as spool:
+            pending = b""
+            while True:
+                data = process.stdout.read(block_bytes)
+                if not data:
+                    break
+                data = pending + data
+                usable = len(data) - (len(data) % (channels * 2))
+                pending = data[usable:]
+                block = np.frombuffer(data[:usable], dtype="<i2").reshape(-1, channels)
+                if not len(block):
+                    continue
+                block_squares, block_peak = _accumulate(block)
+                sum_squares += block_squares
+                peak = max(peak, block_peak)
+                samples += block.size
+                spool.write(block)
+        process.wait()
+    return sum_squares, peak, samples
+
+
+def _loudness_stats(
+    sum_squares: float,
+    peak: int,
+    samples: int,
+    *,
+    target_dbfs: float,
+    headroom_db: float,
+) -> LoudnessStats:
+    full_scale = 32768.0
+    if samples == 0 or sum_squares <= 0.0:
+        return LoudnessStats(rms_dbfs=-math.inf, peak_dbfs=-math.inf, gain_db=0.0)
+    rms_dbfs = 20 * math.log10(math.sqrt(sum_squares / samples) / full_scale)
+    peak_dbfs = 20 * math.log10(peak / full_scale)
+    gain_db = target_dbfs - rms_dbfs
+    if peak_dbfs + gain_db > -headroom_db:
+        gain_db = -headroom_db - peak_dbfs
+    return LoudnessStats(rms_dbfs=rms_dbfs, peak_dbfs=peak_dbfs, gain_db=gain_db)
+
+
+__all__ = [
+    "LoudnessStats",
+    "normalise_audio_streaming",
+    "streaming_normalize_available",
+]
@@ -0,0 +1,316 @@
+"""Run long ffmpeg filter chains on silence-aligned segments in parallel."""
+
+from __future__ import annotations
+
+import math
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+    import soundfile as sf  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+    sf = None  # type: ignore
+
+from session_pipeline.audio import plan_chunk_spans, read_wav_params
+from session_pipeline.ffmpeg_runner import run_ffmpeg
+from session_pipeline.silence import detect_silences_in_wav
+
+DEFAULT_PREROLL_SECONDS = 10.0
+DEFAULT_SEAM_WINDOW_MS = 250
+REPORT_BLOCK_FRAMES = 1 << 18  # frames per block when accumulating whole-file difference figures
+MIN_SEGMENT_SECONDS = 60.0
+OUTPUT_CODECS = {"wav": "pcm_s16le", "flac": "flac"}
+
+
+def filter_in_segments(
+    source_path: Path,
+    output_path: Path,
+    *,
+    filters: str,
+    sample_rate: int,
+    channels: int,
+    output_format: str,
+    jobs: int,
+    preroll_seconds: float = DEFAULT_PREROLL_SECONDS,
+    silence_thresh: int = -40,
+    min_silence_len: int = 500,
+    min_segment_seconds: float = MIN_SEGMENT_SECONDS,
+    timeout: Optional[float] = None,
+) -> List[int]:
+    """
+    Apply ``filters`` to ``source_path`` as ``jobs`` concurrent ffmpeg processes.
+
+    The source is decoded once to a 16-bit PCM spool at the output rate and
+    layout, cut at silence midpoints into roughly ``jobs`` equal segments, and
+    each segment is filtered with ``preroll_seconds`` of neighbouring audio on
+    both sides so stateful filters (dynaudnorm's window, the compressor's
+    envelope, afftdn's noise estimate) have settled before the kept samples.
+    The context is trimmed sample-exactly and the segments are concatenated
+    without re-encoding loss. Returns the seam positions in output frames.
+
+    Unlike the single-pass chain, filters run at the output sample rate. The
+    segment processes share the machine-wide ffmpeg limit, and ``timeout``
+    applies to each ffmpeg invocation.
+    """
+
+    source_path = Path(source_path)
+    output_path = Path(output_path)
+    with tempfile.TemporaryDirectory(prefix=".segments-", dir=str(output_path.parent)) as tmpdir:
+        workdir = Path(tmpdir)
+        spool_path = workdir / "decoded.wav"
+        run_ffmpeg(
+            [
+                "-loglevel",
+                "error",
+                "-y",
+                "-i",
+                str(source_path),
+                "-ac",
+                str(channels),
+                "-ar",
+                str(sample_rate),
+                "-c:a",
+                "pcm_s16le",
+                "-map_metadata",
+                "-1",
+                str(spool_path),
+            ],
+            timeout=timeout,
+        )
+
+        params = read_wav_params(spool_path)
+        if params is None:
+            raise RuntimeError(f"Unable to read decoded audio for {source_path}")
+        total_frames = params[3]
+        spans = plan_segment_frames(
+            spool_path,
+            total_frames=total_frames,
+            frame_rate=sample_rate,
+            jobs=jobs,
+            silence_thresh=silence_thresh,
+            min_silence_len=min_silence_len,
+            min_segment_seconds=min_segment_seconds,
+        )
+
+        preroll_frames = int(round(preroll_seconds * sample_rate))
+        segment_paths = [workdir / f"segment_{index:04d}.wav" for index in range(len(spans))]
+        with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(spans)))) as executor:
+            list(
+                executor.map(
+                    lambda job: _filter_segment(
+                        spool_path,
+                        job[1],
+                        *job[0],
+                        total_frames,
+                        preroll_frames,
+                        filters,
+                        sample_rate,
+                        timeout,
+                    ),
+                    zip(spans, segment_paths),
+                )
+            )
+
+        concat_list = workdir / "segments.txt"
+        concat_list.write_text(
+            "".join(f"file '{path.as_posix()}'\n" for path in segment_paths),
+            encoding="utf-8",
+        )
+        run_ffmpeg(
+            [
+                "-loglevel",
+                "error",
+                "-y",
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                str(concat_list),
+                "-c:a",
+                OUTPUT_CODECS[output_format],
+                str(output_path),
+            ],
+            timeout=timeout,
+        )
+    return [start for start, _ in spans[1:]]
+
+
+def plan_segment_frames(
+    wav_path: Path,
+    *,
+    total_frames: int,
+    frame_rate: int,
+    jobs: int,
+    silence_thresh: int = -40,
+    min_silence_len: int = 500,
+    min_segment_seconds: float = MIN_SEGMENT_SECONDS,
+) -> List[Tuple[int, int]]:
+    """Split ``wav_path`` into about ``jobs`` silence-aligned ``(start_frame, end_frame)`` spans."""
+
+    length_ms = round(1000 * total_frames / frame_rate)
+    target_ms = max(int(min_segment_seconds * 1000), math.ceil(length_ms / max(1, jobs)))
+    if jobs <= 1 or length_ms <= target_ms:
+        return [(0, total_frames)]
+
+    silences = detect_silences_in_wav(wav_path, silence_thresh=silence_thresh, min_silence_len=min_silence_len)
+    spans_ms = plan_chunk_spans(length_ms, silences, target_ms)
+    frames = [min(total_frames, int(start_ms * frame_rate / 1000)) for start_ms, _ in spans_ms] + [total_frames]
+    return [(start, end) for start, end in zip(frames, frames[1:]) if end > start]
+
+
+def _filter_segment(
+    spool_path: Path,
+    segment_path: Path,
+    start_frame: int,
+    end_frame: int,
+    total_frames: int,
+    preroll_frames: int,
+    filters: str,
+    sample_rate: int,
+    timeout: Optional[float] = None,
+) -> None:
+    """Filter one span with context on both sides, keeping exactly ``start_frame:end_frame``."""
+
+    context_start = max(0, start_frame - preroll_frames)
+    context_end = min(total_frames, end_frame + preroll_frames)
+    # Seek a second early and trim by sample index so the cut never depends on
+    # demuxer seek precision.
+    seek_frame = max(0, context_start - sample_rate)
+    lead = start_frame - context_start
+    graph = (
+        f"atrim=start_sample={context_start - seek_frame}:end_sample={context_end - seek_frame},"
+        "asetpts=PTS-STARTPTS,"
+        f"{filters},"
+        f"atrim=start_sample={lead}:end_sample={lead + end_frame - start_frame},asetpts=PTS-STARTPTS"
+    )
+    run_ffmpeg(
+        [
+            "-loglevel",
+            "error",
+            "-y",
+            "-ss",
+            f"{seek_frame / sample_rate:.6f}",
+            "-i",
+            str(spool_path),
+            "-af",
+            graph,
+            "-c:a",
+            "pcm_s16le",
+            str(segment_path),
+        ],
+        timeout=timeout,
+    )
+    params = read_wav_params(segment_path)
+    if params is None or params[3] != end_frame - start_frame:
+        got = params[3] if params else "no"
+        raise RuntimeError(f"Segment {segment_path.name} has {got} frames, expected {end_frame - start_frame}")
+
+
+def seam_difference_report(
+    reference_path: Path,
+    candidate_path: Path,
+    seam_frames: Sequence[int],
+    *,
+    window_ms: int = DEFAULT_SEAM_WINDOW_MS,
+) -> Dict[str, Any]:
+    """
+    Compare a segmented run against a single-pass ``reference`` around each seam.
+
+    For every seam the difference signal in a ``±window_ms`` window is reported
+    as its RMS level relative to the reference (dB; more negative is closer) and
+    its peak absolute sample difference. The same figures for the whole file
+    put the seams in context, since filtering at the output rate also changes
+    samples away from the seams. Memory stays bounded: the whole-file figures
+    are accumulated ``REPORT_BLOCK_FRAMES`` at a time and only the seam
+    windows are read on their own.
+    """
+
+    if np is None or sf is None:
+        raise RuntimeError("NumPy and soundfile are required for the seam difference report.")
+    reference_info = sf.info(str(reference_path))
+    candidate_info = sf.info(str(candidate_path))
+    frame_rate = reference_info.samplerate
+    length = min(reference_info.frames, candidate_info.frames)
+    window = int(frame_rate * window_ms / 1000)
+
+    overall = _DifferenceStats()
+    blocks = zip(
+        sf.blocks(str(reference_path), blocksize=REPORT_BLOCK_FRAMES, frames=length, dtype="int16", always_2d=True),
+        sf.blocks(str(candidate_path), blocksize=REPORT_BLOCK_FRAMES, frames=length, dtype="int16", always_2d=True),
+    )
+    for reference_block, candidate_block in blocks:
+        overall.add(reference_block, candidate_block)
+
+    seams: List[Dict[str, Any]] = []
+    with sf.SoundFile(str(reference_path)) as reference, sf.SoundFile(str(candidate_path)) as candidate:
+        for seam in seam_frames:
+            lo, hi = max(0, seam - window), min(length, seam + window)
+            stats = _DifferenceStats()
+            if hi > lo:
+                reference.seek(lo)
+                candidate.seek(lo)
+                stats.add(
+                    reference.read(hi - lo, dtype="int16", always_2d=True),
+                    candidate.read(hi - lo, dtype="int16", always_2d=True),
+                )
+            seams.append({"seconds": round(seam / frame_rate, 3), **stats.summary()})
+
+    return {
+        "frame_rate": frame_rate,
+        "reference_frames": int(reference_info.frames),
+        "candidate_frames": int(candidate_info.frames),
+        "window_ms": window_ms,
+        "overall": overall.summary(),
+        "seams": seams,
+        "worst_seam_difference_db": max(
+            (seam["difference_db"] for seam in seams if seam["difference_db"] is not None),
+            default=None,
+        ),
+    }
+
+
+class _DifferenceStats:
+    """Running sums for the RMS and peak of ``candidate - reference`` over int16 blocks."""
+
+    def __init__(self) -> None:
+        self.samples = 0
+        self.reference_energy = 0.0
+        self.difference_energy = 0.0
+        self.max_abs_difference = 0.0
+
+    def add(self, reference: Any, candidate: Any) -> None:
+        reference = reference.astype(np.float64)
+        delta = candidate.astype(np.float64) - reference
+        if delta.size == 0:
+            return
+        self.samples += delta.size
+        self.reference_energy += float(np.sum(reference * reference))
+        self.difference_energy += float(np.sum(delta * delta))
+        self.max_abs_difference = max(self.max_abs_difference, float(np.max(np.abs(delta))))
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        if self.samples == 0:
+            return {"difference_db": None, "max_abs_difference": None}
+        ref_rms = math.sqrt(self.reference_energy / self.samples)
+        diff_rms = math.sqrt(self.difference_energy / self.samples)
+        if diff_rms == 0.0:
+            difference_db = -math.inf
+        else:
+            difference_db = 20 * math.log10(diff_rms / max(ref_rms, 1.0))
+        return {
+            "difference_db": round(difference_db, 2) if math.isfinite(difference_db) else None,
+            "max_abs_difference": self.max_abs_difference,
+        }
+
+
+__all__ = [
+    "DEFAULT_PREROLL_SECONDS",
+    "filter_in_segments",
+    "plan_segment_frames",
+    "seam_difference_report",
+]
@@ -0,0 +1,148 @@
+"""Manifest of completed preprocessing so re-runs only touch new or changed recordings."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from session_pipeline.io_utils import file_lock, sha256_file
+
+STATE_FILE_NAME = ".preprocess_state.json"
+STATE_VERSION = 1
+
+
+def settings_key(settings: Dict[str, Any]) -> str:
+    """Hash the output-affecting preprocessing settings."""
+
+    payload = json.dumps(settings, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class PreprocessState:
+    """
+    The ``.preprocess_state.json`` manifest of one output directory.
+
+    Each entry is keyed by the source path relative to the manifest. It records
+    the source size, ``mtime_ns`` and SHA-256, the settings key, the resolved
+    profile and the output paths. :meth:`is_current` is normally a couple of
+    ``stat`` calls. Only a file whose size is unchanged but whose mtime moved
+    is hashed again, so touching or re-copying a recording does not trigger
+    reprocessing.
+    """
+
+    def __init__(self, path: Path, entries: Optional[Dict[str, Dict[str, Any]]] = None) -> None:
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = entries or {}
+        self._dirty: Set[str] = set()
+
+    @classmethod
+    def load(cls, path: Path) -> "PreprocessState":
+        return cls(path, _read_entries(Path(path)))
+
+    def has_entry(self, source_path: Path) -> bool:
+        return self._key(source_path) in self.entries
+
+    def recorded_outputs(self) -> Set[Path]:
+        """Absolute paths of every output recorded in the manifest."""
+
+        base = self.path.parent.resolve()
+        return {(base / output).resolve() for entry in self.entries.values() for output in entry.get("outputs", [])}
+
+    def is_current(
+        self,
+        source_path: Path,
+        stat: os.stat_result,
+        settings: str,
+        outputs: Iterable[Path],
+    ) -> bool:
+        """Return True when ``source_path`` was already processed with ``settings`` into ``outputs``."""
+
+        key = self._key(source_path)
+        entry = self.entries.get(key)
+        outputs = list(outputs)
+        if entry is None or entry.get("settings") != settings:
+            return False
+        if sorted(entry.get("outputs", [])) != sorted(self._relative(path) for path in outputs):
+            return False
+        if not all(path.exists() for path in outputs):
+            return False
+        if entry.get("size") != stat.st_size:
+            return False
+        if entry.get("mtime_ns") == stat.st_mtime_ns:
+            return True
+        if sha256_file(source_path) != entry.get("sha256"):
+            return False
+        entry["mtime_ns"] = stat.st_mtime_ns
+        self._dirty.add(key)
+        return True
+
+    def record(
+        self,
+        source_path: Path,
+        stat: os.stat_result,
+        *,
+        sha256: str,
+        settings: str,
+        profile: Optional[str],
+        outputs: Iterable[Path],
+    ) -> None:
+        key = self._key(source_path)
+        self.entries[key] = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": sha256,
+            "settings": settings,
+            "profile": profile,
+            "outputs": sorted(self._relative(path) for path in outputs),
+        }
+        self._dirty.add(key)
+
+    def save(self) -> None:
+        """
+        Merge changed entries into the manifest on disk and replace it atomically.
+
+        Re-reading under a lock keeps entries written meanwhile by another run
+        over the same directory.
+        """
+
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.path.with_name(f"{self.path.name}.lock")):
+            merged = _read_entries(self.path)
+            for key in self._dirty:
+                merged[key] = self.entries[key]
+            partial = self.path.with_name(f"{self.path.name}.{os.getpid()}.partial")
+            with partial.open("w", encoding="utf-8") as fh:
+                json.dump({"version": STATE_VERSION, "entries": merged}, fh, indent=2, sort_keys=True)
+                fh.write("\n")
+            os.replace(partial, self.path)
+        self.entries = merged
+        self._dirty.clear()
+
+    def _key(self, source_path: Path) -> str:
+        return self._relative(source_path)
+
+    def _relative(self, path: Path) -> str:
+        return os.path.relpath(Path(path).resolve(), self.path.parent.resolve())
+
+
+def _read_entries(path: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(payload, dict) or payload.get("version") != STATE_VERSION:
+        return {}
+    entries = payload.get("entries")
+    return dict(entries) if isinstance(entries, dict) else {}
+
+
+__all__: List[str] = [
+    "PreprocessState",
+    "STATE_FILE_NAME",
+    "settings_key",
+]
@@ -0,0 +1,106 @@
+"""Audio durations from container headers, cached per file version."""
+
+from __future__ import annotations
+
+import subprocess
+import wave
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Optional, Tuple
+
+try:
+    import soundfile as sf  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    sf = None  # type: ignore
+
+PROBE_CACHE_SIZE = 4096
+# Formats whose frame count libsndfile reads from headers or a cheap seek;
+# everything else (mp3, m4a, video containers) goes straight to ffprobe.
+SOUNDFILE_SUFFIXES = {".wav", ".flac", ".ogg", ".oga", ".aif", ".aiff", ".w64", ".caf"}
+
+
+class ProbeError(RuntimeError):
+    """Raised when a file's duration cannot be determined."""
+
+
+def audio_duration_seconds(path: Path) -> float:
+    """
+    Return the duration of ``path`` in seconds without decoding it.
+
+    PCM WAV is read with :mod:`wave`, other libsndfile formats with soundfile,
+    and everything else with ``ffprobe``. Results are LRU-cached on
+    ``(path, mtime_ns, size)``, so repeated lookups are a ``stat`` and a
+    rewritten file is probed again. Raises :class:`ProbeError` when no reader
+    succeeds.
+    """
+
+    resolved = Path(path).expanduser().resolve()
+    try:
+        stat = resolved.stat()
+    except OSError as exc:
+        raise ProbeError(f"Cannot stat {resolved}: {exc}") from exc
+    return _probe_duration(str(resolved), stat.st_mtime_ns, stat.st_size)
+
+
+def clear_probe_cache() -> None:
+    _probe_duration.cache_clear()
+
+
+@lru_cache(maxsize=PROBE_CACHE_SIZE)
+def _probe_duration(path: str, mtime_ns: int, size: int) -> float:
+    readers: Tuple[Callable[[str], Optional[float]], ...] = (_wave_duration, _soundfile_duration, _ffprobe_duration)
+    for reader in readers:
+        duration = reader(path)
+        if duration is not None:
+            return duration
+    raise ProbeError(f"Unable to determine the duration of {path}")
+
+
+def _wave_duration(path: str) -> Optional[float]:
+    if Path(path).suffix.lower() != ".wav":
+        return None
+    try:
+        with wave.open(path, "rb") as reader:
+            return reader.getnframes() / float(reader.getframerate())
+    except (wave.Error, EOFError, OSError, ZeroDivisionError):
+        return None
+
+
+def _soundfile_duration(path: str) -> Optional[float]:
+    if sf is None or Path(path).suffix.lower() not in SOUNDFILE_SUFFIXES:
+        return None
+    try:
+        info = sf.info(path)
+    except RuntimeError:
+        return None
+    if info.samplerate <= 0:
+        return None
+    return info.frames / float(info.samplerate)
+
+
+def _ffprobe_duration(path: str) -> Optional[float]:
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        "-show_entries",
+        "format=duration",
+        "-of",
+        "default=noprint_wrappers=1:nokey=1",
+        path,
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    except OSError:
+        return None
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+__all__ = [
+    "ProbeError",
+    "audio_duration_seconds",
+    "clear_probe_cache",
+]
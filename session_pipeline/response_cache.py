@@ -0,0 +1,179 @@
+"""Shared on-disk cache of speech-to-text responses, keyed by chunk audio and request parameters."""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from session_pipeline.backends import TranscriptionBackend
+from session_pipeline.io_utils import evict_lru_files, file_lock, sha256_file
+
+RESPONSE_CACHE_DIR = Path.home() / ".cache" / "taelgar" / "responses"
+RESPONSE_CACHE_DIR_ENV = "TAELGAR_RESPONSE_CACHE_DIR"
+RESPONSE_CACHE_MAX_BYTES_ENV = "TAELGAR_RESPONSE_CACHE_MAX_BYTES"
+DEFAULT_RESPONSE_CACHE_MAX_BYTES = 1024**3
+CACHE_LOCK_NAME = ".cache.lock"
+ENTRY_KEY_LENGTH = 32
+ENTRY_SUFFIX = ".json.gz"
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of transcription responses, safe across processes.
+
+    Entries are named by a key derived from the SHA-256 of the uploaded audio
+    plus the request parameters (service, endpoint, model, response format,
+    granularities, ...), so identical audio sent with identical settings is
+    only ever paid for once, whichever runner or session directory sends it.
+    Responses are stored as gzip-compressed JSON and published with an atomic
+    rename; hits refresh the file's mtime, which eviction uses as its recency
+    order.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, *, max_bytes: Optional[int] = None) -> None:
+        if cache_dir is None:
+            cache_dir = Path(os.environ.get(RESPONSE_CACHE_DIR_ENV) or RESPONSE_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(os.environ.get(RESPONSE_CACHE_MAX_BYTES_ENV) or DEFAULT_RESPONSE_CACHE_MAX_BYTES)
+        self.cache_dir = Path(cache_dir).expanduser().resolve()
+        self.max_bytes = max_bytes
+
+    def key_for(self, audio_path: Path, parameters: Dict[str, Any]) -> str:
+        """Return the cache key for uploading ``audio_path`` with ``parameters``."""
+
+        payload = json.dumps(
+            {"audio_sha256": sha256_file(audio_path), "parameters": parameters},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path_for(self, key: str) -> Path:
+        return self.cache_dir / f"{key[:ENTRY_KEY_LENGTH]}{ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached response for ``key``, or None (unreadable entries are dropped)."""
+
+        path = self.path_for(key)
+        try:
+            entry = json.loads(gzip.decompress(path.read_bytes()).decode("utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, zlib.error, UnicodeDecodeError, json.JSONDecodeError):
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return entry.get("response")
+
+    def put(self, key: str, response: Any, *, parameters: Optional[Dict[str, Any]] = None) -> Path:
+        """Store ``response`` under ``key`` and trim the cache to ``max_bytes``."""
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        target = self.path_for(key)
+        partial = self.cache_dir / f".{key[:ENTRY_KEY_LENGTH]}.{os.getpid()}.partial"
+        entry = {"key": key, "parameters": parameters, "response": response}
+        data = json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+        try:
+            partial.write_bytes(gzip.compress(data, mtime=0))
+            os.replace(partial, target)
+        finally:
+            partial.unlink(missing_ok=True)
+        self.evict(keep=target)
+        return target
+
+    def get_or_fetch(
+        self,
+        audio_path: Path,
+        parameters: Dict[str, Any],
+        fetch: Callable[[], Any],
+        *,
+        refresh: bool = False,
+        key: Optional[str] = None,
+    ) -> Tuple[Any, bool]:
+        """
+        Return ``(response, hit)`` for ``audio_path`` sent with ``parameters``.
+
+        On a miss (or with ``refresh``) ``fetch()`` makes the request and its
+        response is stored. A per-key ``flock`` makes concurrent requests for
+        the same audio wait for one of them instead of all paying for it.
+        Exceptions from ``fetch`` propagate and nothing is stored. Pass
+        ``key`` when it is already known from :meth:`key_for` to avoid hashing
+        the audio again.
+        """
+
+        if key is None:
+            key = self.key_for(audio_path, parameters)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with file_lock(self._lock_path(key)):
+            if not refresh:
+                cached = self.get(key)
+                if cached is not None:
+                    return cached, True
+            response = fetch()
+            self.put(key, response, parameters=parameters)
+        return response, False
+
+    def evict(self, *, keep: Optional[Path] = None) -> List[Path]:
+        """Delete least-recently-used entries until the cache fits in ``max_bytes``."""
+
+        with file_lock(self.cache_dir / CACHE_LOCK_NAME):
+            return evict_lru_files(
+                self.cache_dir,
+                self.max_bytes,
+                keep=keep,
+                lock_path_for=lambda path: self._lock_path(path.name[:ENTRY_KEY_LENGTH]),
+            )
+
+    def _lock_path(self, key: str) -> Path:
+        return self.cache_dir / f".{key[:ENTRY_KEY_LENGTH]}.lock"
+
+
+class CachedBackend(TranscriptionBackend):
+    """Serve ``backend`` responses from a :class:`ResponseCache`, calling it only on misses."""
+
+    def __init__(self, backend: TranscriptionBackend, cache: ResponseCache, *, refresh: bool = False) -> None:
+        self.backend = backend
+        self.cache = cache
+        self.refresh = refresh
+        self.profile = backend.profile
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    def cache_parameters(self) -> Dict[str, Any]:
+        return self.backend.cache_parameters()
+
+    def transcribe(self, chunk: Dict[str, Any]) -> Any:
+        response, hit = self.cache.get_or_fetch(
+            Path(chunk["path"]),
+            self.backend.cache_parameters(),
+            lambda: self.backend.transcribe(chunk),
+            refresh=self.refresh,
+        )
+        if hit:
+            with self._lock:
+                self.hits += 1
+        return response
+
+
+def default_response_cache() -> ResponseCache:
+    """Return the cache at ``$TAELGAR_RESPONSE_CACHE_DIR`` (default ``~/.cache/taelgar/responses``)."""
+
+    return ResponseCache()
+
+
+__all__ = [
+    "RESPONSE_CACHE_DIR",
+    "CachedBackend",
+    "ResponseCache",
+    "default_response_cache",
+]
@@ -0,0 +1,183 @@
+"""Vectorised RMS-energy silence detection over PCM sample arrays."""
+
+from __future__ import annotations
+
+import struct
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+
+SILENCE_DETECTORS = ("ffmpeg", "numpy")
+RMS_WINDOW_MS = 10
+BLOCK_WINDOWS = 6_000  # windows analysed per block (60 s at 10 ms)
+
+
+def detect_silences_numpy(
+    samples: Any,
+    frame_rate: int,
+    *,
+    silence_thresh: int,
+    min_silence_len: int,
+    sample_width: int = 2,
+    window_ms: int = RMS_WINDOW_MS,
+) -> List[Dict[str, float]]:
+    """
+    Return ``{"start", "end"}`` silence ranges (seconds) for ``samples``.
+
+    ``samples`` is an integer PCM array shaped ``(frames,)`` or ``(frames, channels)``;
+    it may be an ``np.memmap``, which is read one block at a time. A window is
+    silent when its RMS level is below ``silence_thresh`` dBFS on every channel,
+    and runs of silent windows lasting at least ``min_silence_len`` ms are reported,
+    matching the shape of ffmpeg ``silencedetect`` output.
+    """
+
+    _require_numpy()
+    if samples.ndim == 1:
+        samples = samples.reshape(-1, 1)
+
+    total_frames = int(samples.shape[0])
+    window = max(1, int(frame_rate * window_ms / 1000))
+    if total_frames == 0:
+        return []
+
+    full_scale = float(2 ** (8 * sample_width - 1))
+    threshold = (10 ** (silence_thresh / 20.0)) ** 2
+    block_frames = window * BLOCK_WINDOWS
+
+    flags: List[Any] = []
+    for block_start in range(0, total_frames, block_frames):
+        block = np.asarray(samples[block_start : block_start + block_frames], dtype=np.float32)
+        block /= full_scale
+        usable = (block.shape[0] // window) * window
+        windows = block[:usable].reshape(-1, window, block.shape[1])
+        energy = np.einsum("wfc,wfc->wc", windows, windows) / window
+        block_flags = [np.all(energy < threshold, axis=1)]
+        if usable < block.shape[0]:
+            tail = block[usable:]
+            tail_energy = np.mean(tail * tail, axis=0)
+            block_flags.append(np.array([np.all(tail_energy < threshold)]))
+        flags.extend(block_flags)
+
+    silent = np.concatenate(flags).astype(np.int8)
+    edges = np.diff(np.concatenate(([0], silent, [0])))
+    run_starts = np.flatnonzero(edges == 1)
+    run_ends = np.flatnonzero(edges == -1)
+
+    ranges: List[Dict[str, float]] = []
+    for start_window, end_window in zip(run_starts, run_ends):
+        start_frame = int(start_window) * window
+        end_frame = min(int(end_window) * window, total_frames)
+        if (end_frame - start_frame) * 1000.0 / frame_rate < min_silence_len:
+            continue
+        ranges.append(
+            {
+                "start": round(start_frame / frame_rate, 6),
+                "end": round(end_frame / frame_rate, 6),
+            }
+        )
+    return ranges
+
+
+def pcm_to_array(data: bytes, *, channels: int, sample_width: int) -> Any:
+    """View interleaved signed PCM ``data`` as a ``(frames, channels)`` array without copying."""
+
+    _require_numpy()
+    dtypes = {1: np.int8, 2: np.dtype("<i2"), 4: np.dtype("<i4")}
+    if sample_width not in dtypes:
+        raise ValueError(f"Unsupported sample width for silence detection: {sample_width}")
+    return np.frombuffer(data, dtype=dtypes[sample_width]).reshape(-1, channels)
+
+
+def detect_silences_in_wav(
+    wav_path: Path,
+    *,
+    silence_thresh: int,
+    min_silence_len: int,
+) -> List[Dict[str, float]]:
+    """Run :func:`detect_silences_numpy` over a memory-mapped 16-bit PCM WAV."""
+
+    samples, frame_rate = memmap_wav(wav_path)
+    return detect_silences_numpy(
+        samples,
+        frame_rate,
+        silence_thresh=silence_thresh,
+        min_silence_len=min_silence_len,
+    )
+
+
+def memmap_wav(wav_path: Path) -> Tuple[Any, int]:
+    """
+    Memory-map the PCM frames of a 16-bit WAV; return ``(samples, frame_rate)``.
+
+    ``samples`` is shaped ``(frames, channels)``.
+    """
+
+    _require_numpy()
+    channels, sample_width, frame_rate, data_offset, data_size = read_wav_layout(wav_path)
+    if sample_width != 2:
+        raise ValueError(f"Only 16-bit PCM WAV files can be memory-mapped: {wav_path}")
+    frames = data_size // (channels * sample_width)
+    if frames == 0:
+        return np.zeros((0, channels), dtype="<i2"), frame_rate
+    samples = np.memmap(
+        wav_path,
+        dtype="<i2",
+        mode="r",
+        offset=data_offset,
+        shape=(frames, channels),
+    )
+    return samples, frame_rate
+
+
+def read_wav_layout(wav_path: Path) -> Tuple[int, int, int, int, int]:
+    """
+    Parse the RIFF header of ``wav_path``.
+
+    Returns ``(channels, sample_width, frame_rate, data_offset, data_size)``.
+    """
+
+    with Path(wav_path).open("rb") as handle:
+        header = handle.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            raise ValueError(f"Not a RIFF/WAVE file: {wav_path}")
+        fmt = None
+        while True:
+            chunk_header = handle.read(8)
+            if len(chunk_header) < 8:
+                break
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            if chunk_id == b"fmt ":
+                fmt = handle.read(chunk_size)
+                if chunk_size % 2:
+                    handle.seek(1, 1)
+                continue
+            if chunk_id == b"data":
+                if fmt is None:
+                    break
+                channels, frame_rate = struct.unpack("<HI", fmt[2:8])
+                bits_per_sample = struct.unpack("<H", fmt[14:16])[0]
+                data_offset = handle.tell()
+                handle.seek(0, 2)
+                data_size = min(chunk_size, handle.tell() - data_offset)
+                return channels, bits_per_sample // 8, frame_rate, data_offset, data_size
+            handle.seek(chunk_size + (chunk_size % 2), 1)
+    raise ValueError(f"WAV file has no fmt/data chunk: {wav_path}")
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise RuntimeError("NumPy is required for the numpy silence detector. Install with: pip install numpy")
+
+
+__all__ = [
+    "SILENCE_DETECTORS",
+    "detect_silences_in_wav",
+    "detect_silences_numpy",
+    "memmap_wav",
+    "pcm_to_array",
+    "read_wav_layout",
+]
@@ -1,6 +1,328 @@
-import json
+"""Submit audio chunks to speech-to-text backends concurrently, within their rate limits."""
+
+from __future__ import annotations
+
+import asyncio
 import logging
-from typing import Any, Dict, Iterable, List, Optional
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence
+
+from session_pipeline.backends import OpenAIBackend, TranscriptionBackend
+from session_pipeline.chunking import BackendProfile
+from session_pipeline.response_cache import CachedBackend, ResponseCache
+
+DEFAULT_MAX_RETRIES = 6
+DEFAULT_BACKOFF_BASE_SECONDS = 1.0
+DEFAULT_BACKOFF_MAX_SECONDS = 60.0
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+# Transport failures from the OpenAI SDK and httpx (which the ElevenLabs SDK
+# raises unwrapped), matched by name so neither package has to be importable.
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "TransportError"}
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ChunkOutcome:
+    """Result of one item run through :class:`TranscriptionEngine`."""
+
+    item: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+    attempts: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class TokenBucket:
+    """
+    Async token bucket: ``rate`` requests per second with bursts of up to ``capacity``.
+
+    :meth:`pause` empties the bucket until a deadline, which is how a
+    ``Retry-After`` from one request holds back every other request too.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0, *, clock: Callable[[], float] = time.monotonic) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(capacity))
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = self._clock()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        now = self._clock()
+        self._paused_until = max(self._paused_until, now + seconds)
+        self._tokens = 0.0
+        self._updated = max(self._updated, self._paused_until)
+
+
+class AdaptiveConcurrency:
+    """
+    Concurrency limit that grows until the backend throttles, then backs off.
+
+    The limit starts at ``initial`` and, like TCP slow start, grows by one per
+    successful request (doubling each round trip) until the first throttle. A
+    throttle halves it, and from then on it grows by one per ``limit``
+    successes (additive increase, multiplicative decrease). Requests already in
+    flight when the limit was cut do not cut it again, so a burst of 429s from
+    one round counts once.
+    """
+
+    def __init__(self, initial: int, maximum: int, *, minimum: int = 1) -> None:
+        self.maximum = max(1, int(maximum))
+        self.minimum = max(1, min(int(minimum), self.maximum))
+        self.limit = max(self.minimum, min(int(initial), self.maximum))
+        self._in_flight = 0
+        self._generation = 0
+        self._slow_start = True
+        self._credit = 0.0
+        self._condition = asyncio.Condition()
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self) -> int:
+        """Wait for a free slot; returns the generation to pass to :meth:`on_throttle`."""
+
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+            return self._generation
+
+    async def release(self) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        if self.limit >= self.maximum:
+            return
+        if self._slow_start:
+            self.limit += 1
+            return
+        self._credit += 1.0 / self.limit
+        if self._credit >= 1.0:
+            self._credit = 0.0
+            self.limit += 1
+
+    def on_throttle(self, generation: int) -> None:
+        if generation != self._generation:
+            return
+        self._generation += 1
+        self._slow_start = False
+        self._credit = 0.0
+        self.limit = max(self.minimum, self.limit // 2)
+
+
+class TranscriptionEngine:
+    """
+    Run blocking transcription calls concurrently under a backend's limits.
+
+    ``call(item)`` is a synchronous SDK call; it runs on a thread pool sized
+    to the concurrency ceiling while an asyncio loop enforces an
+    :class:`AdaptiveConcurrency` limit and, when ``profile.requests_per_minute``
+    is set, a :class:`TokenBucket`. Retryable failures (HTTP 429, 5xx,
+    connection errors) are retried with full-jitter exponential backoff; a
+    ``Retry-After`` header sets the minimum wait and pauses the whole bucket.
+    ``on_result`` is called on the loop thread with each :class:`ChunkOutcome`
+    as soon as that item finishes, successfully or not.
+    """
+
+    def __init__(
+        self,
+        profile: BackendProfile,
+        *,
+        max_concurrency: Optional[int] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE_SECONDS,
+        backoff_max: float = DEFAULT_BACKOFF_MAX_SECONDS,
+        rng: Optional[random.Random] = None,
+    ) -> None:
+        self.profile = profile
+        self.max_concurrency = max(1, int(max_concurrency or profile.max_concurrency))
+        self.initial_concurrency = max(1, min(profile.initial_concurrency, self.max_concurrency))
+        self.max_retries = max(0, int(max_retries))
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._rng = rng or random.Random()
+
+    def run(
+        self,
+        items: Sequence[Any],
+        call: Callable[[Any], Any],
+        *,
+        on_result: Optional[Callable[[ChunkOutcome], None]] = None,
+    ) -> List[ChunkOutcome]:
+        """Process ``items`` and return their outcomes in input order."""
+
+        return asyncio.run(self.run_async(items, call, on_result=on_result))
+
+    async def run_async(
+        self,
+        items: Sequence[Any],
+        call: Callable[[Any], Any],
+        *,
+        on_result: Optional[Callable[[ChunkOutcome], None]] = None,
+    ) -> List[ChunkOutcome]:
+        items = list(items)
+        if not items:
+            return []
+        limiter = AdaptiveConcurrency(self.initial_concurrency, self.max_concurrency)
+        bucket = (
+            TokenBucket(self.profile.requests_per_minute / 60.0, capacity=self.initial_concurrency)
+            if self.profile.requests_per_minute
+            else None
+        )
+        loop = asyncio.get_running_loop()
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items))) as executor:
+
+            async def run_one(item: Any) -> ChunkOutcome:
+                started = time.perf_counter()
+                attempt = 0
+                result: Any = None
+                error: Optional[BaseException] = None
+                while True:
+                    attempt += 1
+                    generation = await limiter.acquire()
+                    try:
+                        if bucket is not None:
+                            await bucket.acquire()
+                        result = await loop.run_in_executor(executor, call, item)
+                        error = None
+                    except Exception as exc:  # noqa: BLE001 - classified below
+                        error = exc
+                    finally:
+                        await limiter.release()
+
+                    if error is None:
+                        limiter.on_success()
+                        break
+                    retry_after = retry_after_seconds(error)
+                    if is_throttled(error):
+                        limiter.on_throttle(generation)
+                        if bucket is not None and retry_after:
+                            bucket.pause(retry_after)
+                    if attempt > self.max_retries or not is_retryable(error):
+                        break
+                    delay = self.backoff_delay(attempt, retry_after)
+                    logger.warning(
+                        "Attempt %d failed (%s); retrying in %.1fs (concurrency limit %d)",
+                        attempt,
+                        _describe_error(error),
+                        delay,
+                        limiter.limit,
+                    )
+                    await asyncio.sleep(delay)
+
+                outcome = ChunkOutcome(
+                    item,
+                    result=result if error is None else None,
+                    error=error,
+                    attempts=attempt,
+                    elapsed_seconds=time.perf_counter() - started,
+                )
+                if on_result is not None:
+                    on_result(outcome)
+                return outcome
+
+            return list(await asyncio.gather(*(run_one(item) for item in items)))
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than ``retry_after``."""
+
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        delay = self._rng.uniform(0.0, ceiling)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+def status_code_of(error: BaseException) -> Optional[int]:
+    """Return the HTTP status carried by an SDK exception, if any."""
+
+    for source in (error, getattr(error, "response", None)):
+        code = getattr(source, "status_code", None)
+        if isinstance(code, int):
+            return code
+    return None
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Parse ``retry-after-ms`` / ``retry-after`` (seconds or HTTP date) from an SDK exception."""
+
+    headers = _headers_of(error)
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(0.0, float(value) / 1000.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_throttled(error: BaseException) -> bool:
+    return status_code_of(error) == 429
+
+
+def is_retryable(error: BaseException) -> bool:
+    code = status_code_of(error)
+    if code is not None:
+        return code in RETRYABLE_STATUS_CODES
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    return any(cls.__name__ in RETRYABLE_ERROR_NAMES for cls in type(error).__mro__)
+
+
+def _headers_of(error: BaseException) -> Dict[str, str]:
+    for source in (getattr(error, "response", None), error):
+        headers = getattr(source, "headers", None)
+        if isinstance(headers, Mapping) or hasattr(headers, "items"):
+            return {str(key).lower(): str(value) for key, value in headers.items()}
+    return {}
+
+
+def _describe_error(error: BaseException) -> str:
+    code = status_code_of(error)
+    prefix = f"HTTP {code}: " if code is not None else ""
+    return f"{prefix}{type(error).__name__}: {error}"
 
 
 def transcribe_audio_chunks(
@@ -10,86 +332,59 @@ def transcribe_audio_chunks(
     model: str = "whisper-1",
     response_format: str = "vtt",
     timestamp_granularities: Optional[List[str]] = None,
+    profile: Optional[BackendProfile] = None,
+    max_concurrency: Optional[int] = None,
+    backend: Optional[TranscriptionBackend] = None,
+    cache: Optional[ResponseCache] = None,
 ) -> List[Dict[str, Any]]:
     """
-    Submit each audio chunk to the transcription endpoint and yield the raw responses.
+    Submit each audio chunk to the transcription endpoint and return the raw responses.
+
+    ``backend`` defaults to an :class:`OpenAIBackend` around ``client`` (which
+    may be None when a backend is given). With ``cache``, chunks whose audio
+    and request parameters were transcribed before are answered from the
+    :class:`ResponseCache` without calling the backend. Chunks run
+    concurrently through a :class:`TranscriptionEngine` using ``profile``
+    (the backend's by default).
+    Results come back in chunk order; the first chunk that still fails after
+    retries raises its error.
     """
 
-    logger = logging.getLogger(__name__)
-    results: List[Dict[str, Any]] = []
+    if backend is None:
+        backend = OpenAIBackend(
+            client,
+            model=model,
+            response_format=response_format,
+            timestamp_granularities=timestamp_granularities,
+        )
+    if cache is not None:
+        backend = CachedBackend(backend, cache)
 
-    for chunk in chunks:
+    def transcribe(chunk: Dict[str, Any]) -> Any:
         logger.info(
             "Transcribing chunk %s (%s-%s ms)",
             chunk["index"],
             chunk["start_ms"],
             chunk["end_ms"],
         )
+        return backend.transcribe(chunk)
 
-        with open(chunk["path"], "rb") as audio_file:
-            payload: Dict[str, Any] = {
-                "model": model,
-                "file": audio_file,
-                "response_format": response_format,
-            }
-            if timestamp_granularities:
-                payload["timestamp_granularities"] = timestamp_granularities
-
-            response = client.audio.transcriptions.create(**payload)
-
-        transcript = _normalise_response(response, response_format)
-        results.append({"chunk": chunk, "transcript": transcript})
+    engine = TranscriptionEngine(profile or backend.profile, max_concurrency=max_concurrency)
+    outcomes = engine.run(list(chunks), transcribe)
+    for outcome in outcomes:
+        if outcome.error is not None:
+            raise outcome.error
+    return [{"chunk": outcome.item, "transcript": outcome.result} for outcome in outcomes]
 
-    return results
 
-
-def _normalise_response(response: Any, response_format: str) -> Any:
-    """
-    Coerce the API response into either text or dict form based on ``response_format``.
-    """
-
-    if response_format == "vtt":
-        return _ensure_text(response)
-    return _ensure_dict(response)
-
-
-def _ensure_text(response: Any) -> str:
-    """Return ``response`` as UTF-8 text, serialising when necessary."""
-
-    if isinstance(response, (bytes, bytearray)):
-        return response.decode("utf-8")
-    if isinstance(response, str):
-        return response
-    text_attr = getattr(response, "text", None)
-    if isinstance(text_attr, str):
-        return text_attr
-    if hasattr(response, "to_dict"):
-        try:
-            return response.to_dict().get("text", "")  # type: ignore[attr-defined]
-        except Exception:
-            return json.dumps(response.to_dict())  # type: ignore[attr-defined]
-    if isinstance(response, dict):
-        text_value = response.get("text")
-        if isinstance(text_value, str):
-            return text_value
-        return json.dumps(response)
-    return str(response)
-
-
-def _ensure_dict(response: Any) -> Dict[str, Any]:
-    """Return ``response`` as a JSON-serialisable dictionary."""
-
-    if isinstance(response, dict):
-        return response
-    if hasattr(response, "to_dict"):
-        return response.to_dict()  # type: ignore[attr-defined]
-    if hasattr(response, "model_dump"):
-        return response.model_dump()  # type: ignore[attr-defined]
-    if isinstance(response, (bytes, bytearray)):
-        response = response.decode("utf-8")
-    if isinstance(response, str):
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError:
-            return {"raw": response}
-    return json.loads(json.dumps(response, default=str))
+__all__ = [
+    "AdaptiveConcurrency",
+    "ChunkOutcome",
+    "TokenBucket",
+    "TranscriptionEngine",
+    "is_retryable",
+    "is_throttled",
+    "retry_after_seconds",
+    "status_code_of",
+    "transcribe_audio_chunks",
+]
@@ -0,0 +1,154 @@
+"""Append-only journal of per-chunk transcription state, so interrupted runs resume."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from session_pipeline.io_utils import file_lock, sha256_file
+
+JOURNAL_FILE_NAME = "transcription_journal.jsonl"
+
+PENDING = "pending"
+IN_FLIGHT = "in-flight"
+DONE = "done"
+FAILED = "failed"
+CHUNK_STATES = (PENDING, IN_FLIGHT, DONE, FAILED)
+
+
+class TranscriptionJournal:
+    """
+    JSONL record of every chunk state transition for one transcription method.
+
+    Each line is ``{"key", "state", "time", ...}``. Replaying the file gives
+    each chunk's latest state. A ``done`` record carries the settings it was
+    produced with, the transcript path and the transcript's SHA-256. Every
+    line is flushed and fsynced before the call returns, so a crash loses at
+    most the line being written; a torn final line is ignored on load. Opening
+    the journal compacts it to one line per chunk and holds an exclusive lock
+    until :meth:`close`, so two runs cannot interleave their records.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._handle: Optional[Any] = None
+        self._lock_context: Optional[Any] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, path: Path) -> "TranscriptionJournal":
+        journal = cls(path)
+        journal.path.parent.mkdir(parents=True, exist_ok=True)
+        journal._lock_context = file_lock(journal.path.with_name(f"{journal.path.name}.lock"))
+        journal._lock_context.__enter__()
+        try:
+            line_count = journal._replay()
+            if line_count > len(journal.entries):
+                journal._compact()
+            journal._handle = journal.path.open("a", encoding="utf-8")
+        except BaseException:
+            journal.close()
+            raise
+        return journal
+
+    def __enter__(self) -> "TranscriptionJournal":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+        if self._lock_context is not None:
+            self._lock_context.__exit__(None, None, None)
+            self._lock_context = None
+
+    def state(self, key: str) -> Optional[str]:
+        entry = self.entries.get(key)
+        return entry.get("state") if entry else None
+
+    def completed(self, key: str, *, settings: str, transcript_path: Path) -> bool:
+        """Return True when ``key`` is done with ``settings`` and its transcript is intact on disk."""
+
+        entry = self.entries.get(key)
+        if not entry or entry.get("state") != DONE or entry.get("settings") != settings:
+            return False
+        transcript_path = Path(transcript_path)
+        if entry.get("transcript") != str(transcript_path) or not transcript_path.exists():
+            return False
+        return sha256_file(transcript_path) == entry.get("response_sha256")
+
+    def mark(self, key: str, state: str, **fields: Any) -> None:
+        """Append a transition of ``key`` to ``state``; safe to call from worker threads."""
+
+        if state not in CHUNK_STATES:
+            raise ValueError(f"Unknown chunk state: {state}")
+        record = {"key": key, "state": state, "time": round(time.time(), 3), **fields}
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._handle is None:
+                raise RuntimeError("Transcription journal is not open")
+            self._handle.write(line + "\n")
+            self._handle.flush()
+            os.fsync(self._handle.fileno())
+            self.entries[key] = record
+
+    def mark_done(self, key: str, *, settings: str, transcript_path: Path, attempts: int) -> None:
+        transcript_path = Path(transcript_path)
+        self.mark(
+            key,
+            DONE,
+            settings=settings,
+            transcript=str(transcript_path),
+            response_sha256=sha256_file(transcript_path),
+            attempts=attempts,
+        )
+
+    def counts(self) -> Dict[str, int]:
+        totals = {state: 0 for state in CHUNK_STATES}
+        for entry in self.entries.values():
+            totals[entry["state"]] += 1
+        return totals
+
+    def _replay(self) -> int:
+        """Load the latest record per key; returns the number of lines read."""
+
+        try:
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        except FileNotFoundError:
+            return 0
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and isinstance(record.get("key"), str):
+                self.entries[record["key"]] = record
+        return len(lines)
+
+    def _compact(self) -> None:
+        partial = self.path.with_name(f"{self.path.name}.{os.getpid()}.partial")
+        with partial.open("w", encoding="utf-8") as fh:
+            for record in self.entries.values():
+                fh.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(partial, self.path)
+
+
+__all__: List[str] = [
+    "CHUNK_STATES",
+    "DONE",
+    "FAILED",
+    "IN_FLIGHT",
+    "JOURNAL_FILE_NAME",
+    "PENDING",
+    "TranscriptionJournal",
+]
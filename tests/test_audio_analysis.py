@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from dataclasses import replace
+from pathlib import Path
+
+try:
+    from pydub import AudioSegment  # type: ignore
+    from pydub.generators import Sine, WhiteNoise  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    AudioSegment = None  # type: ignore
+    Sine = None  # type: ignore
+    WhiteNoise = None  # type: ignore
+
+try:
+    from session_pipeline.analysis import (
+        analysis_available,
+        analysis_sidecar_path,
+        analyze_audio,
+        load_or_analyze,
+    )
+    from session_pipeline.audio_processing import recommend_profile
+except ImportError:  # pragma: no cover - optional dependency tree
+    analyze_audio = None  # type: ignore
+
+
+class AudioAnalysisTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        if AudioSegment is None or analyze_audio is None or not analysis_available():
+            raise unittest.SkipTest("Audio analysis dependencies are unavailable; skipping related tests.")
+
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self._tempdir.name)
+
+    def tearDown(self) -> None:
+        self._tempdir.cleanup()
+
+    def test_clean_and_noisy_recordings_get_different_profiles(self) -> None:
+        clean = self._write(
+            "clean.wav",
+            Sine(440).to_audio_segment(duration=1000).apply_gain(-6) + AudioSegment.silent(duration=1000),
+        )
+        noise = WhiteNoise().to_audio_segment(duration=2000).apply_gain(-30)
+        noisy = self._write(
+            "noisy.wav",
+            (Sine(440).to_audio_segment(duration=1000).apply_gain(-12) + AudioSegment.silent(duration=1000)).overlay(
+                noise
+            ),
+        )
+
+        clean_report = analyze_audio(clean)
+        noisy_report = analyze_audio(noisy)
+
+        self.assertAlmostEqual(clean_report.duration_seconds, 2.0, places=2)
+        self.assertAlmostEqual(clean_report.peak_dbfs, -6.0, delta=0.2)
+        self.assertEqual(clean_report.clipping_ratio, 0.0)
+        self.assertAlmostEqual(clean_report.speech_activity_percent, 50.0, delta=5.0)
+        self.assertIsNotNone(clean_report.integrated_lufs)
+        self.assertEqual(recommend_profile(clean_report), "zoom-audio")
+
+        self.assertGreater(noisy_report.noise_floor_dbfs, -50.0)
+        self.assertLess(noisy_report.snr_db, clean_report.snr_db)
+        self.assertEqual(recommend_profile(noisy_report), "voice-memo")
+
+    def test_sidecar_is_reused_until_the_source_changes(self) -> None:
+        source = self._write("tone.wav", Sine(440).to_audio_segment(duration=500).apply_gain(-6))
+        first = load_or_analyze(source)
+        sidecar = analysis_sidecar_path(source)
+        self.assertTrue(sidecar.exists())
+
+        payload = json.loads(sidecar.read_text(encoding="utf-8"))
+        payload["analysis"]["speech_activity_percent"] = 12.5
+        sidecar.write_text(json.dumps(payload), encoding="utf-8")
+        self.assertEqual(load_or_analyze(source), replace(first, speech_activity_percent=12.5))
+
+        self._write("tone.wav", Sine(440).to_audio_segment(duration=800).apply_gain(-6))
+        refreshed = load_or_analyze(source)
+        self.assertAlmostEqual(refreshed.duration_seconds, 0.8, places=2)
+        self.assertNotEqual(refreshed.speech_activity_percent, 12.5)
+
+    def _write(self, name: str, audio: "AudioSegment") -> Path:
+        path = self.temp_path / name
+        export_handle = audio.set_frame_rate(16_000).set_channels(1).export(path, format="wav")
+        export_handle.close()
+        return path
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,6 +7,7 @@ import unittest
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Iterator, List
+from unittest import mock
 
 try:
     from pydub import AudioSegment  # type: ignore
@@ -24,16 +25,33 @@ try:
     from session_pipeline.audio_processing import (
         AUDIO_PROFILES,
         AudioProfileConfig,
+        OutputSpec,
         prepare_clean_audio,
         preprocess_audio_file,
     )
 except ImportError:  # pragma: no cover - optional dependency tree
     AUDIO_PROFILES = {}  # type: ignore
     AudioProfileConfig = None  # type: ignore
+    OutputSpec = None  # type: ignore
     prepare_clean_audio = None  # type: ignore
     preprocess_audio_file = None  # type: ignore
 
 
+try:
+    from session_pipeline.audio_processing import _normalise_audio_in_memory
+    from session_pipeline.normalize import normalise_audio_streaming, streaming_normalize_available
+except ImportError:  # pragma: no cover - optional dependency tree
+    _normalise_audio_in_memory = None  # type: ignore
+    normalise_audio_streaming = None  # type: ignore
+    streaming_normalize_available = None  # type: ignore
+
+try:
+    from session_pipeline.parallel_filter import filter_in_segments, seam_difference_report
+except ImportError:  # pragma: no cover - optional dependency tree
+    filter_in_segments = None  # type: ignore
+    seam_difference_report = None  # type: ignore
+
+
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
 
@@ -90,6 +108,30 @@ class AudioPreprocessingTests(unittest.TestCase):
                 self.assertGreater(len(processed), 0)
         self.assertEqual(len(outputs), 4)
 
+    def test_preprocess_writes_extra_outputs_in_one_pass(self) -> None:
+        for profile in ["zoom-audio", "normalize-only"]:
+            with self.subTest(profile=profile):
+                primary = self.temp_path / f"{profile}.wav"
+                extras = [
+                    OutputSpec(self.temp_path / f"{profile}-24k.wav", sample_rate=24_000, channels=1),
+                    OutputSpec(
+                        self.temp_path / f"{profile}-stereo.flac",
+                        sample_rate=44_100,
+                        channels=2,
+                        output_format="flac",
+                    ),
+                ]
+                preprocess_audio_file(self.sample_path, primary, profile=profile, extra_outputs=extras)
+                expected = [(primary, 16_000, 1)] + [(spec.path, spec.sample_rate, spec.channels) for spec in extras]
+                for path, frame_rate, channels in expected:
+                    processed = _load_segment(path)
+                    self.assertEqual(processed.frame_rate, frame_rate)
+                    self.assertEqual(processed.channels, channels)
+                    self.assertEqual(processed.sample_width, 2)
+                    self.assertAlmostEqual(len(processed), self.original_length_ms, delta=20)
+                primary_dbfs = _load_segment(primary).dBFS
+                self.assertAlmostEqual(_load_segment(extras[0].path).dBFS, primary_dbfs, delta=0.5)
+
     def test_preprocess_cli_runs_successfully(self) -> None:
         cli_out_dir = self.temp_path / "cli"
         cli_out_dir.mkdir(parents=True, exist_ok=True)
@@ -111,6 +153,90 @@ class AudioPreprocessingTests(unittest.TestCase):
         expected = cli_out_dir / f"{self.sample_path.stem}-clean.wav"
         self.assertTrue(expected.exists(), "Preprocess CLI did not produce expected output file.")
 
+    def test_preprocess_cli_parallel_jobs_count_failures(self) -> None:
+        cli_out_dir = self.temp_path / "cli-jobs"
+        second = self.temp_path / "second_input.wav"
+        self._write_test_wave(second)
+        broken = self.temp_path / "broken_input.wav"
+        broken.write_bytes(b"not audio")
+        cmd = [
+            sys.executable,
+            str(REPO_ROOT / "preprocess_audio.py"),
+            str(self.sample_path),
+            str(second),
+            str(broken),
+            "--audio-profile",
+            "passthrough",
+            "--output-dir",
+            str(cli_out_dir),
+            "--jobs",
+            "3",
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, check=False, cwd=str(REPO_ROOT))
+        self.assertEqual(result.returncode, 1, msg=result.stderr)
+        self.assertIn("1 file(s) failed.", result.stderr)
+        self.assertIn("Processed 2 file(s)", result.stdout)
+        self.assertIn("audio-hours/wall-hour", result.stdout)
+        for source in (self.sample_path, second):
+            self.assertTrue((cli_out_dir / f"{source.stem}-clean.wav").exists())
+
+    def test_preprocess_cli_skips_unchanged_files_from_state(self) -> None:
+        source_dir = self.temp_path / "recordings"
+        source_dir.mkdir()
+        source = source_dir / "session.wav"
+        self._write_test_wave(source)
+        cli_out_dir = self.temp_path / "cli-state"
+        cmd = [
+            sys.executable,
+            str(REPO_ROOT / "preprocess_audio.py"),
+            str(source_dir),
+            "--audio-profile",
+            "passthrough",
+            "--output-dir",
+            str(cli_out_dir),
+        ]
+
+        def run() -> subprocess.CompletedProcess:
+            result = subprocess.run(cmd, capture_output=True, text=True, check=False, cwd=str(REPO_ROOT))
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            return result
+
+        self.assertIn("Processed 1 file(s)", run().stdout)
+        self.assertTrue((cli_out_dir / ".preprocess_state.json").exists())
+        self.assertIn("Skipped 1 unchanged file(s)", run().stdout)
+
+        source.write_bytes(self.sample_path.read_bytes()[:-400])  # same name, new content
+        rerun = run().stdout
+        self.assertIn("Processed 1 file(s)", rerun)
+        self.assertNotIn("Skipped", rerun)
+
+    def test_preprocess_cli_rerun_over_directory_ignores_own_outputs(self) -> None:
+        source_dir = self.temp_path / "in-place"
+        source_dir.mkdir()
+        self._write_test_wave(source_dir / "a.wav")
+        cmd = [
+            sys.executable,
+            str(REPO_ROOT / "preprocess_audio.py"),
+            str(source_dir),
+            "--audio-profile",
+            "passthrough",
+            "--extra-output",
+            "flac:8000",
+        ]
+
+        def run() -> subprocess.CompletedProcess:
+            result = subprocess.run(cmd, capture_output=True, text=True, check=False, cwd=str(REPO_ROOT))
+            self.assertEqual(result.returncode, 0, msg=result.stderr)
+            return result
+
+        self.assertIn("Processed 1 file(s)", run().stdout)
+        produced = sorted(path.name for path in source_dir.iterdir())
+        self.assertIn("a-clean.wav", produced)
+        self.assertIn("a-clean-8000hz-1ch.flac", produced)
+
+        self.assertIn("Skipped 1 unchanged file(s)", run().stdout)
+        self.assertEqual(sorted(path.name for path in source_dir.iterdir()), produced)
+
     def test_prepare_clean_audio_and_chunk_round_trip(self) -> None:
         clean_path: Path | None = None
         cleanup_path: Path | None = None
@@ -149,6 +275,89 @@ class AudioPreprocessingTests(unittest.TestCase):
             if cleanup_path and cleanup_path.exists():
                 cleanup_path.unlink()
 
+    def test_prepare_clean_audio_resolves_auto_profile_before_cache_lookup(self) -> None:
+        from session_pipeline.clean_cache import CleanAudioCache
+
+        cache = CleanAudioCache(self.temp_path / "clean-cache")
+        with mock.patch("session_pipeline.audio_processing.recommend_profile", return_value="normalize-only"):
+            auto_path, cleanup_path = prepare_clean_audio(self.sample_path, profile="auto", discard=True, cache=cache)
+        self.assertIsNone(cleanup_path)
+        self.assertTrue(auto_path.exists())
+
+        logs: List[str] = []
+        explicit_path, _ = prepare_clean_audio(
+            self.sample_path, profile="normalize-only", discard=True, cache=cache, log_fn=logs.append
+        )
+        self.assertEqual(explicit_path, auto_path)
+        self.assertTrue(any("Using cached clean audio" in line for line in logs))
+
+    def test_streaming_normalize_matches_pydub_within_tenth_db(self) -> None:
+        if normalise_audio_streaming is None or not streaming_normalize_available():
+            self.skipTest("NumPy/soundfile are unavailable; skipping streaming normalisation test.")
+        reference_path = self.temp_path / "reference.wav"
+        streamed_path = self.temp_path / "streamed.wav"
+        _normalise_audio_in_memory(
+            self.sample_path,
+            reference_path,
+            sample_rate=16_000,
+            channels=1,
+            sample_width=2,
+            output_format="wav",
+            target_dbfs=-10.0,
+            headroom_db=1.0,
+            overwrite=True,
+        )
+        stats = normalise_audio_streaming(
+            self.sample_path,
+            streamed_path,
+            sample_rate=16_000,
+            channels=1,
+            output_format="wav",
+            target_dbfs=-10.0,
+            headroom_db=1.0,
+            block_frames=1024,  # force many blocks
+        )
+        reference = _load_segment(reference_path)
+        streamed = _load_segment(streamed_path)
+        self.assertEqual(len(reference), len(streamed))
+        self.assertLess(abs(reference.dBFS - streamed.dBFS), 0.1)
+        self.assertLess(abs(reference.max_dBFS - streamed.max_dBFS), 0.1)
+        self.assertGreater(stats.gain_db, 0.0)
+
+    def test_segmented_filter_matches_single_pass_length(self) -> None:
+        if filter_in_segments is None or not streaming_normalize_available():
+            self.skipTest("NumPy/soundfile are unavailable; skipping segmented filter test.")
+        filters = "highpass=f=100,dynaudnorm=f=150:g=5,acompressor=threshold=-18dB:ratio=2"
+        decoded_path = self.temp_path / "decoded.wav"
+        segmented_path = self.temp_path / "segmented.wav"
+        preprocess_audio_file(
+            self.sample_path,
+            decoded_path,
+            profile="passthrough",
+            sample_rate=16_000,
+            channels=1,
+            output_format="wav",
+        )
+        seams = filter_in_segments(
+            decoded_path,
+            segmented_path,
+            filters=filters,
+            sample_rate=16_000,
+            channels=1,
+            output_format="wav",
+            jobs=2,
+            preroll_seconds=0.2,
+            silence_thresh=-35,
+            min_segment_seconds=0.3,
+        )
+        self.assertGreaterEqual(len(seams), 1)
+        report = seam_difference_report(decoded_path, segmented_path, seams)
+        self.assertEqual(report["candidate_frames"], report["reference_frames"])
+        self.assertEqual(len(report["seams"]), len(seams))
+        for seam in seams:
+            self.assertGreater(seam, 0)
+            self.assertLess(seam, report["reference_frames"])
+
     def _write_test_wave(self, path: Path) -> None:
         tone = Sine(440).to_audio_segment(duration=400).apply_gain(-5)
         silence = AudioSegment.silent(duration=650)
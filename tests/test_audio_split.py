@@ -5,12 +5,15 @@ from pathlib import Path
 
 try:
     from pydub import AudioSegment  # type: ignore
+    from pydub.generators import Sine  # type: ignore
 except ImportError:
     AudioSegment = None  # type: ignore
+    Sine = None  # type: ignore
 
 try:
-    from session_pipeline.audio import chunk_audio_file  # type: ignore
+    from session_pipeline.audio import chunk_audio_file, plan_chunk_spans  # type: ignore
 except ImportError:
+    plan_chunk_spans = None  # type: ignore
     chunk_audio_file = None  # type: ignore
 
 DATA_ROOT = Path(__file__).resolve().parent / "data"
@@ -96,5 +99,158 @@ class ChunkAudioFileTests(unittest.TestCase):
         return len(segment)
 
 
+class ChunkPlanningTests(unittest.TestCase):
+    def setUp(self) -> None:
+        if plan_chunk_spans is None:
+            self.skipTest("session_pipeline.audio is unavailable, skipping planning test.")
+
+    def test_plan_covers_length_and_respects_limit(self) -> None:
+        length_ms = 3_600_000
+        silences = [{"start": t / 1000.0, "end": (t + 600) / 1000.0} for t in range(1_000, length_ms - 1_000, 7_919)]
+        spans = plan_chunk_spans(length_ms, silences, 300_000)
+
+        self.assertEqual(spans[0][0], 0)
+        self.assertEqual(spans[-1][1], length_ms)
+        for (_, previous_end), (current_start, _) in zip(spans, spans[1:]):
+            self.assertEqual(previous_end, current_start)
+        self.assertTrue(all(end - start <= 300_000 for start, end in spans))
+
+    def test_plan_rebalances_short_tail(self) -> None:
+        spans = plan_chunk_spans(1_100, [], 1_000)
+        self.assertEqual(spans, [(0, 550), (550, 1_100)])
+
+
+class StreamingChunkerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        if AudioSegment is None or Sine is None or chunk_audio_file is None:
+            self.skipTest("pydub is not installed, skipping streaming chunker test.")
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self._tempdir.name)
+        self.sample_path = self.temp_path / "session.wav"
+        tone = Sine(440).to_audio_segment(duration=900).apply_gain(-5)
+        audio = AudioSegment.silent(duration=0)
+        for gap_ms in (700, 650, 900, 600, 800, 750):
+            audio += tone + AudioSegment.silent(duration=gap_ms)
+        audio = audio.set_frame_rate(16_000).set_channels(1).set_sample_width(2)
+        audio.export(self.sample_path, format="wav").close()
+
+    def tearDown(self) -> None:
+        self._tempdir.cleanup()
+
+    def test_streaming_matches_in_memory_chunks(self) -> None:
+        kwargs = dict(max_chunk_seconds=2.5, min_silence_len=500, silence_thresh=-35)
+        in_memory = chunk_audio_file(self.sample_path, self.temp_path / "memory", **kwargs)
+        streamed = chunk_audio_file(
+            self.sample_path, self.temp_path / "streamed", streaming=True, **kwargs
+        )
+
+        self.assertGreater(len(in_memory), 1)
+        self.assertEqual(len(in_memory), len(streamed))
+        for expected, actual in zip(in_memory, streamed):
+            for key in ("index", "start_ms", "end_ms", "frame_rate", "channels", "sample_width"):
+                self.assertEqual(expected[key], actual[key])
+            self.assertEqual(
+                Path(expected["path"]).read_bytes(),
+                Path(actual["path"]).read_bytes(),
+                f"Streamed chunk differs from in-memory chunk {expected['index']}",
+            )
+
+    def test_parallel_export_matches_serial_export(self) -> None:
+        kwargs = dict(max_chunk_seconds=2.5, min_silence_len=500, silence_thresh=-35)
+        for streaming in (False, True):
+            with self.subTest(streaming=streaming):
+                serial = chunk_audio_file(
+                    self.sample_path,
+                    self.temp_path / f"serial-{streaming}",
+                    streaming=streaming,
+                    **kwargs,
+                )
+                parallel = chunk_audio_file(
+                    self.sample_path,
+                    self.temp_path / f"parallel-{streaming}",
+                    streaming=streaming,
+                    max_workers=4,
+                    **kwargs,
+                )
+                self.assertEqual([entry["index"] for entry in parallel], list(range(len(serial))))
+                for expected, actual in zip(serial, parallel):
+                    self.assertEqual(Path(expected["path"]).name, Path(actual["path"]).name)
+                    self.assertEqual(
+                        Path(expected["path"]).read_bytes(), Path(actual["path"]).read_bytes()
+                    )
+
+    def test_numpy_detector_agrees_with_ffmpeg_boundaries(self) -> None:
+        kwargs = dict(max_chunk_seconds=2.5, min_silence_len=500, silence_thresh=-35)
+        reference = chunk_audio_file(self.sample_path, self.temp_path / "ffmpeg", **kwargs)
+        for streaming in (False, True):
+            with self.subTest(streaming=streaming):
+                candidate = chunk_audio_file(
+                    self.sample_path,
+                    self.temp_path / f"numpy-{streaming}",
+                    streaming=streaming,
+                    silence_detector="numpy",
+                    **kwargs,
+                )
+                self.assertEqual(len(candidate), len(reference))
+                self.assertEqual(candidate[-1]["end_ms"], reference[-1]["end_ms"])
+                for expected, actual in zip(reference, candidate):
+                    self.assertLessEqual(abs(expected["start_ms"] - actual["start_ms"]), 50)
+
+    def test_overlap_pads_chunks_and_cores_tile_source(self) -> None:
+        kwargs = dict(max_chunk_seconds=2.5, min_silence_len=500, silence_thresh=-35)
+        plain = chunk_audio_file(self.sample_path, self.temp_path / "plain", **kwargs)
+        padded = chunk_audio_file(
+            self.sample_path, self.temp_path / "padded", overlap_seconds=0.25, streaming=True, **kwargs
+        )
+
+        self.assertEqual(len(plain), len(padded))
+        self.assertEqual(padded[0]["overlap_before_ms"], 0)
+        self.assertEqual(padded[-1]["overlap_after_ms"], 0)
+        for expected, actual in zip(plain, padded):
+            self.assertEqual(actual["start_ms"] + actual["overlap_before_ms"], expected["start_ms"])
+            self.assertEqual(actual["end_ms"] - actual["overlap_after_ms"], expected["end_ms"])
+        for previous, current in zip(padded, padded[1:]):
+            self.assertEqual(previous["overlap_after_ms"], 250)
+            self.assertEqual(current["overlap_before_ms"], 250)
+
+    def test_flac_chunks_decode_to_wav_chunk_audio(self) -> None:
+        kwargs = dict(max_chunk_seconds=2.5, min_silence_len=500, silence_thresh=-35)
+        reference = chunk_audio_file(self.sample_path, self.temp_path / "wav", **kwargs)
+        for streaming in (False, True):
+            with self.subTest(streaming=streaming):
+                flac = chunk_audio_file(
+                    self.sample_path,
+                    self.temp_path / f"flac-{streaming}",
+                    streaming=streaming,
+                    chunk_format="flac",
+                    **kwargs,
+                )
+                self.assertEqual(len(flac), len(reference))
+                for expected, actual in zip(reference, flac):
+                    self.assertEqual(Path(actual["path"]).suffix, ".flac")
+                    self.assertEqual((actual["format"], actual["codec"], actual["bitrate"]), ("flac", "flac", None))
+                    self.assertEqual(
+                        AudioSegment.from_file(expected["path"]).raw_data,
+                        AudioSegment.from_file(actual["path"]).raw_data,
+                    )
+
+    def test_opus_chunks_record_bitrate(self) -> None:
+        chunks = chunk_audio_file(
+            self.sample_path,
+            self.temp_path / "opus",
+            max_chunk_seconds=2.5,
+            min_silence_len=500,
+            silence_thresh=-35,
+            streaming=True,
+            chunk_format="opus",
+        )
+        self.assertGreater(len(chunks), 1)
+        for entry in chunks:
+            self.assertEqual(Path(entry["path"]).suffix, ".ogg")
+            self.assertEqual((entry["codec"], entry["bitrate"]), ("libopus", "32k"))
+            decoded = AudioSegment.from_file(entry["path"])
+            self.assertLessEqual(abs(len(decoded) - (entry["end_ms"] - entry["start_ms"])), 30)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,83 @@
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+try:
+    from pydub import AudioSegment  # type: ignore
+    from pydub.generators import Sine  # type: ignore
+except ImportError:
+    AudioSegment = None  # type: ignore
+    Sine = None  # type: ignore
+
+try:
+    import numpy as np  # type: ignore
+except ImportError:
+    np = None  # type: ignore
+
+try:
+    from session_pipeline.audio import chunk_audio_file  # type: ignore
+    from session_pipeline.chunk_view import ChunkView, plan_chunk_views  # type: ignore
+except ImportError:
+    chunk_audio_file = None  # type: ignore
+    ChunkView = None  # type: ignore
+    plan_chunk_views = None  # type: ignore
+
+
+class ChunkViewTests(unittest.TestCase):
+    def setUp(self) -> None:
+        if AudioSegment is None or Sine is None or np is None or ChunkView is None:
+            self.skipTest("pydub/numpy are not installed, skipping chunk view tests.")
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self._tempdir.name)
+        self.sample_path = self.temp_path / "session.wav"
+        tone = Sine(440).to_audio_segment(duration=900).apply_gain(-5)
+        audio = AudioSegment.silent(duration=0)
+        for gap_ms in (700, 650, 900, 600, 800, 750):
+            audio += tone + AudioSegment.silent(duration=gap_ms)
+        self.audio = audio.set_frame_rate(16_000).set_channels(1).set_sample_width(2)
+        self.audio.export(self.sample_path, format="wav").close()
+
+    def tearDown(self) -> None:
+        self._tempdir.cleanup()
+
+    def test_views_match_physical_chunks(self) -> None:
+        kwargs = dict(max_chunk_seconds=2.5, min_silence_len=500, silence_thresh=-35, overlap_seconds=0.2)
+        chunks = chunk_audio_file(self.sample_path, self.temp_path / "chunks", streaming=True, **kwargs)
+        views = plan_chunk_views(self.sample_path, **kwargs)
+
+        self.assertEqual(len(chunks), len(views))
+        for entry, view in zip(chunks, views):
+            self.assertEqual(view.index, entry["index"])
+            self.assertEqual(view.overlap_before_ms, entry["overlap_before_ms"])
+            with wave.open(str(entry["path"]), "rb") as reader:
+                expected = reader.readframes(reader.getnframes())
+            # The physical chunker pads the final chunk with silence; views stop at the data.
+            self.assertEqual(view.read_bytes(), expected[: view.byte_length])
+
+    def test_open_yields_a_wav_and_samples_are_memory_mapped(self) -> None:
+        view = ChunkView.from_seconds(self.sample_path, 1.25, 2.5)
+        self.assertEqual((view.start_frame, view.end_frame), (20_000, 40_000))
+
+        with wave.open(view.open(), "rb") as reader:
+            self.assertEqual(reader.getnframes(), view.frame_count)
+            self.assertEqual(reader.getframerate(), 16_000)
+            self.assertEqual(reader.readframes(view.frame_count), view.read_bytes())
+
+        samples = view.samples()
+        self.assertIsInstance(samples, np.memmap)
+        expected = np.frombuffer(self.audio[1250:2500].raw_data, dtype="<i2")
+        self.assertTrue(np.array_equal(np.asarray(samples), expected))
+
+    def test_views_are_clamped_to_the_file(self) -> None:
+        whole = ChunkView.whole(self.sample_path)
+        tail = ChunkView.from_seconds(self.sample_path, whole.duration_seconds - 0.5, whole.duration_seconds + 5)
+        self.assertEqual(tail.end_frame, whole.end_frame)
+        self.assertEqual(len(tail.read_bytes()), tail.byte_length)
+
+        destination = tail.write_wav(self.temp_path / "tail.wav")
+        self.assertEqual(len(AudioSegment.from_file(destination)), 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
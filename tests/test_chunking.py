@@ -0,0 +1,176 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from typing import Optional
+
+try:
+    from pydub import AudioSegment  # type: ignore
+    from pydub.generators import Sine  # type: ignore
+except ImportError:
+    AudioSegment = None  # type: ignore
+    Sine = None  # type: ignore
+
+try:
+    from session_pipeline.chunking import (  # type: ignore
+        BACKEND_PROFILES,
+        BackendProfile,
+        chunk_bytes_per_second,
+        plan_chunk_size,
+        prepare_audio_chunks,
+    )
+except ImportError:
+    BACKEND_PROFILES = {}  # type: ignore
+    BackendProfile = None  # type: ignore
+    chunk_bytes_per_second = None  # type: ignore
+    plan_chunk_size = None  # type: ignore
+    prepare_audio_chunks = None  # type: ignore
+
+
+class PrepareAudioChunksCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        if AudioSegment is None or Sine is None or prepare_audio_chunks is None:
+            self.skipTest("pydub is not installed, skipping chunk cache tests.")
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self._tempdir.name)
+        self.audio_path = self.temp_path / "session-clean.wav"
+        self._write_audio(self.audio_path, gap_ms=700)
+        self.chunks_dir = self.temp_path / "chunks"
+
+    def tearDown(self) -> None:
+        self._tempdir.cleanup()
+
+    def test_methods_share_cached_chunks(self) -> None:
+        first = self._prepare(self.temp_path / "whisper" / "chunk_manifest.json")
+        mtimes = {entry["path"]: entry["path"].stat().st_mtime_ns for entry in first}
+
+        second = self._prepare(self.temp_path / "elevenlabs" / "chunk_manifest.json")
+
+        self.assertEqual([entry["path"] for entry in first], [entry["path"] for entry in second])
+        for entry in second:
+            self.assertEqual(entry["path"].stat().st_mtime_ns, mtimes[entry["path"]])
+        manifest = json.loads((self.temp_path / "elevenlabs" / "chunk_manifest.json").read_text())
+        self.assertEqual(manifest["parameters"]["max_chunk_seconds"], 2.5)
+        self.assertEqual(len(manifest["chunks"]), len(first))
+
+    def test_parameter_or_source_change_rechunks(self) -> None:
+        manifest_path = self.temp_path / "whisper" / "chunk_manifest.json"
+        original = self._prepare(manifest_path)
+
+        changed_params = self._prepare(manifest_path, silence_thresh=-30)
+        self.assertNotEqual(original[0]["path"].parent, changed_params[0]["path"].parent)
+
+        self._write_audio(self.audio_path, gap_ms=900)
+        changed_source = self._prepare(manifest_path)
+        self.assertNotEqual(original[0]["path"].parent, changed_source[0]["path"].parent)
+        self.assertNotEqual(original[-1]["end_ms"], changed_source[-1]["end_ms"])
+
+    def test_prune_removes_only_sets_used_by_the_same_label_alone(self) -> None:
+        manifest_path = self.temp_path / "whisper" / "chunk_manifest.json"
+        superseded = self._prepare(manifest_path, label="whisper:session")
+        shared = self._prepare(None, silence_thresh=-30, label="elevenlabs:session")
+        self._prepare(manifest_path, silence_thresh=-30, label="whisper:session")
+        other_audio = self.temp_path / "other-clean.wav"
+        self._write_audio(other_audio, gap_ms=800)
+        other = prepare_audio_chunks(
+            other_audio, self.chunks_dir, max_chunk_seconds=2.5, chunk_basename="other", label="whisper:other"
+        )
+
+        current = self._prepare(manifest_path, silence_thresh=-25, label="whisper:session", prune=True)
+
+        self.assertFalse(superseded[0]["path"].parent.exists())
+        self.assertTrue(shared[0]["path"].exists())
+        self.assertTrue(current[0]["path"].exists())
+        self.assertTrue(other[0]["path"].exists())
+        labels = json.loads((shared[0]["path"].parent / "chunk_manifest.json").read_text())["labels"]
+        self.assertEqual(labels, ["elevenlabs:session", "whisper:session"])
+
+    def test_legacy_manifest_is_not_reused(self) -> None:
+        manifest_path = self.temp_path / "whisper" / "chunk_manifest.json"
+        manifest_path.parent.mkdir(parents=True)
+        stale_chunk = self.temp_path / "stale.wav"
+        stale_chunk.write_bytes(b"")
+        manifest_path.write_text(
+            json.dumps([{"index": 0, "start_ms": 0, "end_ms": 1, "path": str(stale_chunk)}]),
+            encoding="utf-8",
+        )
+
+        entries = self._prepare(manifest_path)
+        self.assertNotEqual(entries[0]["path"], stale_chunk)
+
+    def _prepare(
+        self,
+        manifest_path: Optional[Path],
+        *,
+        silence_thresh: int = -35,
+        label: Optional[str] = None,
+        prune: bool = False,
+    ):
+        return prepare_audio_chunks(
+            self.audio_path,
+            self.chunks_dir,
+            manifest_path=manifest_path,
+            max_chunk_seconds=2.5,
+            chunk_basename="session",
+            min_silence_len=500,
+            silence_thresh=silence_thresh,
+            label=label,
+            prune=prune,
+        )
+
+    @staticmethod
+    def _write_audio(path: Path, *, gap_ms: int) -> None:
+        tone = Sine(440).to_audio_segment(duration=900).apply_gain(-5)
+        audio = AudioSegment.silent(duration=0)
+        for _ in range(5):
+            audio += tone + AudioSegment.silent(duration=gap_ms)
+        audio = audio.set_frame_rate(16_000).set_channels(1).set_sample_width(2)
+        audio.export(path, format="wav").close()
+
+
+class PlanChunkSizeTests(unittest.TestCase):
+    def setUp(self) -> None:
+        if plan_chunk_size is None:
+            self.skipTest("session_pipeline.chunking is unavailable, skipping planner tests.")
+
+    def test_fills_every_worker_in_a_single_wave(self) -> None:
+        profile = BackendProfile(name="test", seconds_per_audio_second=0.1, request_overhead_seconds=2.0)
+        plan = plan_chunk_size(3600, workers=8, profile=profile)
+        self.assertEqual(plan.chunk_count, 8)
+        self.assertEqual(plan.waves, 1)
+        self.assertAlmostEqual(plan.chunk_seconds, 3600 / 8 * 1.1, places=3)
+
+    def test_respects_upload_limit(self) -> None:
+        profile = BACKEND_PROFILES["whisper"]
+        plan = plan_chunk_size(4 * 3600, workers=2, profile=profile)
+        self.assertLessEqual(plan.chunk_seconds * 32_000, profile.max_upload_bytes)
+        self.assertEqual(plan.waves, plan.chunk_count // 2 + plan.chunk_count % 2)
+
+    def test_upload_limit_follows_chunk_format(self) -> None:
+        self.assertEqual(chunk_bytes_per_second("flac"), chunk_bytes_per_second("wav"))
+        self.assertEqual(chunk_bytes_per_second("opus"), 4_000)
+        self.assertEqual(chunk_bytes_per_second("opus", "64k"), 8_000)
+
+        profile = BackendProfile(name="test", max_upload_bytes=25 * 1024 * 1024, seconds_per_audio_second=0.1)
+        pcm = plan_chunk_size(4 * 3600, workers=1, profile=profile)
+        opus = plan_chunk_size(
+            4 * 3600, workers=1, profile=profile, bytes_per_audio_second=chunk_bytes_per_second("opus")
+        )
+        self.assertLessEqual(pcm.chunk_seconds * chunk_bytes_per_second("flac"), profile.max_upload_bytes)
+        self.assertLess(opus.chunk_count, pcm.chunk_count)
+
+    def test_avoids_straggler_wave(self) -> None:
+        profile = BackendProfile(
+            name="test",
+            max_chunk_seconds=900,
+            seconds_per_audio_second=0.1,
+            request_overhead_seconds=2.0,
+        )
+        plan = plan_chunk_size(3600, workers=4, profile=profile)
+        # Four 900 s chunks fill one wave; five would need a second wave for the tail.
+        self.assertEqual((plan.chunk_count, plan.waves), (4, 1))
+        self.assertEqual(plan.chunk_seconds, 900)
+
+
+if __name__ == "__main__":
+    unittest.main()
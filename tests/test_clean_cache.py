@@ -0,0 +1,132 @@
+import os
+import tempfile
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    from session_pipeline.clean_cache import CleanAudioCache  # type: ignore
+    from session_pipeline.io_utils import file_lock  # type: ignore
+except ImportError:
+    CleanAudioCache = None  # type: ignore
+
+
+def _produce_slowly(cache_dir: str, source: str, log_path: str) -> str:
+    def produce(partial: Path) -> None:
+        with open(log_path, "a", encoding="utf-8") as log:
+            log.write(f"{os.getpid()}\n")
+        time.sleep(0.2)
+        partial.write_bytes(b"clean")
+
+    path, _ = CleanAudioCache(Path(cache_dir)).get_or_create(
+        Path(source), {"profile": "test"}, output_format="wav", produce=produce
+    )
+    return str(path)
+
+
+class CleanAudioCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        if CleanAudioCache is None:
+            self.skipTest("session_pipeline.clean_cache is unavailable, skipping cache tests.")
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self._tempdir.name)
+        self.cache_dir = self.temp_path / "cache"
+        self.source = self.temp_path / "session.m4a"
+        self.source.write_bytes(b"raw audio")
+
+    def tearDown(self) -> None:
+        self._tempdir.cleanup()
+
+    def test_hits_reuse_entry_and_parameters_change_key(self) -> None:
+        cache = CleanAudioCache(self.cache_dir)
+        calls = []
+
+        def produce(partial: Path) -> None:
+            calls.append(partial)
+            partial.write_bytes(b"clean")
+
+        first, hit = cache.get_or_create(self.source, {"profile": "a"}, output_format="wav", produce=produce)
+        self.assertFalse(hit)
+        second, hit = cache.get_or_create(self.source, {"profile": "a"}, output_format="wav", produce=produce)
+        self.assertTrue(hit)
+        self.assertEqual(first, second)
+        other, hit = cache.get_or_create(self.source, {"profile": "b"}, output_format="wav", produce=produce)
+        self.assertFalse(hit)
+        self.assertNotEqual(first, other)
+        self.assertEqual(len(calls), 2)
+
+        self.source.write_bytes(b"re-recorded audio")
+        _, hit = cache.get_or_create(self.source, {"profile": "a"}, output_format="wav", produce=produce)
+        self.assertFalse(hit)
+
+    def test_eviction_drops_least_recently_used(self) -> None:
+        cache = CleanAudioCache(self.cache_dir, max_bytes=300)
+        paths = []
+        for index in range(3):
+            path, _ = cache.get_or_create(
+                self.source,
+                {"profile": str(index)},
+                output_format="wav",
+                produce=lambda partial: partial.write_bytes(b"x" * 100),
+            )
+            os.utime(path, (index, index))
+            paths.append(path)
+        cache.max_bytes = 250
+        # Touching the oldest entry on a hit makes the second one the eviction candidate.
+        cache.get_or_create(self.source, {"profile": "0"}, output_format="wav", produce=lambda partial: None)
+        cache.get_or_create(
+            self.source,
+            {"profile": "3"},
+            output_format="wav",
+            produce=lambda partial: partial.write_bytes(b"x" * 100),
+        )
+        self.assertTrue(paths[0].exists())
+        self.assertFalse(paths[1].exists())
+        self.assertFalse(paths[2].exists())
+
+    def test_eviction_spares_busy_and_recent_entries_and_removes_locks(self) -> None:
+        cache = CleanAudioCache(self.cache_dir, max_bytes=10_000, grace_seconds=60)
+        paths = []
+        for index in range(3):
+            path, _ = cache.get_or_create(
+                self.source,
+                {"profile": str(index)},
+                output_format="wav",
+                produce=lambda partial: partial.write_bytes(b"x" * 100),
+            )
+            paths.append(path)
+        os.utime(paths[0], (1, 1))
+        os.utime(paths[1], (2, 2))
+        (self.cache_dir / ".deadbeef.lock").touch()  # left behind by an entry evicted earlier
+
+        cache.max_bytes = 0
+        busy_lock = self.cache_dir / f".{paths[0].name.split('.')[0]}.lock"
+        with file_lock(busy_lock):
+            removed = cache.evict()
+
+        self.assertEqual(removed, [paths[1]])
+        self.assertTrue(paths[0].exists())  # held by a reader or producer
+        self.assertTrue(paths[2].exists())  # used within the grace window
+        lock_names = sorted(path.name for path in self.cache_dir.glob(".*.lock"))
+        expected = sorted([".cache.lock", busy_lock.name, f".{paths[2].name.split('.')[0]}.lock"])
+        self.assertEqual(lock_names, expected)
+
+    def test_concurrent_processes_produce_once(self) -> None:
+        log_path = self.temp_path / "produced.log"
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(
+                    _produce_slowly,
+                    [str(self.cache_dir)] * 4,
+                    [str(self.source)] * 4,
+                    [str(log_path)] * 4,
+                )
+            )
+        self.assertEqual(len(set(results)), 1)
+        self.assertEqual(len(log_path.read_text(encoding="utf-8").splitlines()), 1)
+        self.assertEqual(Path(results[0]).read_bytes(), b"clean")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from typing import List
+
+from session_pipeline.ffmpeg_runner import (
+    FFmpegError,
+    FFmpegProgress,
+    FFmpegTimeout,
+    ProcessSlots,
+    SilenceEventParser,
+    run_ffmpeg,
+)
+
+
+class SilenceEventParserTests(unittest.TestCase):
+    def test_pairs_start_and_end_events(self) -> None:
+        parser = SilenceEventParser()
+        for line in [
+            "[silencedetect @ 0x1] silence_start: 1.5",
+            "size=N/A time=00:00:02.00 bitrate=N/A speed= 100x",
+            "[silencedetect @ 0x1] silence_end: 2.25 | silence_duration: 0.75",
+            "[silencedetect @ 0x1] silence_start: 9",
+        ]:
+            parser.feed(line)
+        self.assertEqual(parser.ranges, [{"start": 1.5, "end": 2.25}])
+
+
+class ProcessSlotsTests(unittest.TestCase):
+    def test_limits_concurrent_holders(self) -> None:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            slots = ProcessSlots(Path(tmpdir), max_procs=2)
+            active = [0]
+            peak = [0]
+            lock = threading.Lock()
+
+            def hold() -> None:
+                with slots.acquire():
+                    with lock:
+                        active[0] += 1
+                        peak[0] = max(peak[0], active[0])
+                    time.sleep(0.1)
+                    with lock:
+                        active[0] -= 1
+
+            threads = [threading.Thread(target=hold) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(peak[0], 2)
+
+
+@unittest.skipIf(shutil.which("ffmpeg") is None, "ffmpeg is not installed")
+class RunFFmpegTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.slots = ProcessSlots(Path(self._tempdir.name), max_procs=1)
+
+    def tearDown(self) -> None:
+        self._tempdir.cleanup()
+
+    def test_reports_progress_until_done(self) -> None:
+        updates: List[FFmpegProgress] = []
+        run_ffmpeg(
+            ["-f", "lavfi", "-i", "anullsrc=r=16000:cl=mono:d=5", "-f", "null", "-"],
+            on_progress=updates.append,
+            slots=self.slots,
+        )
+        self.assertTrue(updates)
+        self.assertTrue(updates[-1].done)
+        self.assertAlmostEqual(updates[-1].out_seconds, 5.0, delta=0.1)
+
+    def test_timeout_kills_process(self) -> None:
+        with self.assertRaises(FFmpegTimeout):
+            run_ffmpeg(
+                ["-re", "-f", "lavfi", "-i", "anullsrc=d=30", "-f", "null", "-"],
+                timeout=0.3,
+                slots=self.slots,
+            )
+
+    def test_failure_carries_stderr_tail(self) -> None:
+        with self.assertRaises(FFmpegError) as ctx:
+            run_ffmpeg(
+                ["-loglevel", "error", "-i", str(Path(self._tempdir.name) / "missing.wav"), "-f", "null", "-"],
+                slots=self.slots,
+            )
+        self.assertNotEqual(ctx.exception.returncode, 0)
+        self.assertTrue(ctx.exception.stderr_tail)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    from pydub import AudioSegment  # type: ignore
+    from pydub.generators import Sine  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    AudioSegment = None  # type: ignore
+    Sine = None  # type: ignore
+
+from session_pipeline.probe import ProbeError, audio_duration_seconds, clear_probe_cache
+
+
+class AudioProbeTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        if AudioSegment is None:
+            raise unittest.SkipTest("pydub is unavailable; skipping probe tests.")
+
+    def setUp(self) -> None:
+        clear_probe_cache()
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self._tempdir.name)
+
+    def tearDown(self) -> None:
+        self._tempdir.cleanup()
+
+    def test_wav_and_flac_durations_come_from_headers(self) -> None:
+        self.assertAlmostEqual(audio_duration_seconds(self._write("tone.wav", 1500)), 1.5, places=3)
+        self.assertAlmostEqual(audio_duration_seconds(self._write("tone.flac", 750)), 0.75, places=3)
+
+    @unittest.skipUnless(shutil.which("ffprobe"), "ffprobe is unavailable")
+    def test_compressed_formats_use_ffprobe(self) -> None:
+        self.assertAlmostEqual(audio_duration_seconds(self._write("tone.mp3", 2000)), 2.0, delta=0.1)
+
+    def test_rewritten_file_is_probed_again(self) -> None:
+        path = self._write("tone.wav", 1000)
+        self.assertAlmostEqual(audio_duration_seconds(path), 1.0, places=3)
+        self._write("tone.wav", 2500)
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertAlmostEqual(audio_duration_seconds(path), 2.5, places=3)
+
+    def test_unreadable_files_raise(self) -> None:
+        garbage = self.temp_path / "garbage.wav"
+        garbage.write_bytes(b"not audio at all")
+        with self.assertRaises(ProbeError):
+            audio_duration_seconds(garbage)
+        with self.assertRaises(ProbeError):
+            audio_duration_seconds(self.temp_path / "missing.wav")
+
+    def _write(self, name: str, duration_ms: int) -> Path:
+        path = self.temp_path / name
+        audio = Sine(440).to_audio_segment(duration=duration_ms).set_frame_rate(16_000).set_channels(1)
+        audio.export(path, format=path.suffix.lstrip(".")).close()
+        return path
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+import gzip
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+try:
+    from session_pipeline.backends import MockBackend, MockSettings  # type: ignore
+    from session_pipeline.response_cache import ResponseCache  # type: ignore
+    from session_pipeline.transcription import transcribe_audio_chunks  # type: ignore
+except ImportError:
+    ResponseCache = None  # type: ignore
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        if ResponseCache is None:
+            self.skipTest("session_pipeline.response_cache is unavailable, skipping cache tests.")
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self._tempdir.name)
+        self.cache = ResponseCache(self.temp_path / "cache")
+        self.chunk = self.temp_path / "chunk_000.flac"
+        self.chunk.write_bytes(b"chunk audio")
+
+    def tearDown(self) -> None:
+        self._tempdir.cleanup()
+
+    def _fetch(self, calls, response):
+        def fetch():
+            calls.append(response)
+            return response
+
+        return fetch
+
+    def test_hits_depend_on_audio_bytes_and_parameters(self) -> None:
+        calls = []
+        parameters = {"model": "whisper-1", "response_format": "verbose_json"}
+
+        response, hit = self.cache.get_or_fetch(self.chunk, parameters, self._fetch(calls, {"text": "a"}))
+        self.assertEqual((response, hit), ({"text": "a"}, False))
+        response, hit = self.cache.get_or_fetch(self.chunk, dict(parameters), self._fetch(calls, {"text": "b"}))
+        self.assertEqual((response, hit), ({"text": "a"}, True))
+
+        _, hit = self.cache.get_or_fetch(self.chunk, {**parameters, "model": "gpt-4o-transcribe"}, self._fetch(calls, {}))
+        self.assertFalse(hit)
+        copy = self.temp_path / "renamed.flac"
+        copy.write_bytes(self.chunk.read_bytes())
+        _, hit = self.cache.get_or_fetch(copy, parameters, self._fetch(calls, {}))
+        self.assertTrue(hit)
+        self.chunk.write_bytes(b"re-cut chunk audio")
+        _, hit = self.cache.get_or_fetch(self.chunk, parameters, self._fetch(calls, {}))
+        self.assertFalse(hit)
+        self.assertEqual(len(calls), 3)
+
+    def test_entries_are_compressed_and_corrupt_entries_miss(self) -> None:
+        key = self.cache.key_for(self.chunk, {"response_format": "vtt"})
+        path = self.cache.put(key, "WEBVTT\n\n" + "00:00:00.000 --> 00:00:01.000\nhello\n\n" * 200)
+        self.assertEqual(path.read_bytes()[:2], b"\x1f\x8b")
+        self.assertLess(path.stat().st_size, 1000)
+        self.assertTrue(self.cache.get(key).startswith("WEBVTT"))
+
+        path.write_bytes(gzip.compress(b"{not json"))
+        self.assertIsNone(self.cache.get(key))
+        self.assertFalse(path.exists())
+
+    def test_failed_fetch_stores_nothing_and_refresh_refetches(self) -> None:
+        def fail():
+            raise RuntimeError("429")
+
+        with self.assertRaises(RuntimeError):
+            self.cache.get_or_fetch(self.chunk, {}, fail)
+        self.assertEqual(list(self.cache.cache_dir.glob("*.json.gz")), [])
+
+        calls = []
+        self.cache.get_or_fetch(self.chunk, {}, self._fetch(calls, {"text": "old"}))
+        response, hit = self.cache.get_or_fetch(self.chunk, {}, self._fetch(calls, {"text": "new"}), refresh=True)
+        self.assertEqual((response, hit), ({"text": "new"}, False))
+        self.assertEqual(self.cache.get_or_fetch(self.chunk, {}, fail)[0], {"text": "new"})
+
+    def test_eviction_drops_least_recently_used_entries(self) -> None:
+        keys = [str(index) * 64 for index in range(4)]
+        sizes = []
+        for offset, key in enumerate(keys):
+            path = self.cache.put(key, {"text": os.urandom(120).hex()})
+            os.utime(path, (1_000 + offset, 1_000 + offset))
+            sizes.append(path.stat().st_size)
+        self.cache.max_bytes = sum(sizes) + min(sizes) // 2
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.cache.put("f" * 64, {"text": os.urandom(120).hex()})
+
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+        self.assertIsNotNone(self.cache.get("f" * 64))
+
+    def test_eviction_deletes_the_entry_lock_file(self) -> None:
+        calls = []
+        self.cache.get_or_fetch(self.chunk, {}, self._fetch(calls, {"text": "a"}))
+        self.assertEqual(len(list(self.cache.cache_dir.glob(".*.lock"))), 2)  # entry lock + cache lock
+
+        self.cache.max_bytes = 0
+        self.cache.evict()
+        self.assertEqual([path.name for path in self.cache.cache_dir.glob(".*.lock")], [".cache.lock"])
+
+    def test_transcribe_audio_chunks_reuses_cached_responses(self) -> None:
+        chunks = []
+        for index in range(3):
+            path = self.temp_path / f"chunk_{index:03d}.flac"
+            path.write_bytes(f"audio {index}".encode())
+            chunks.append({"index": index, "start_ms": index * 4000, "end_ms": (index + 1) * 4000, "path": str(path)})
+        backend = MockBackend(MockSettings(latency_scale=0.0, seed=0))
+
+        first = transcribe_audio_chunks(None, chunks, backend=backend, cache=self.cache)
+        second = transcribe_audio_chunks(None, chunks, backend=backend, cache=self.cache)
+
+        self.assertEqual(backend.stats.requests, 3)
+        self.assertEqual(first, second)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+try:
+    from session_pipeline import audio_processing
+except ImportError:  # pragma: no cover - optional dependency tree
+    audio_processing = None  # type: ignore
+
+
+class RnnoiseModelResolutionTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        if audio_processing is None:
+            raise unittest.SkipTest("Audio processing dependencies are unavailable; skipping related tests.")
+
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        root = Path(self._tempdir.name)
+        self.search_dir = root / "search"
+        self.vendored_dir = root / "vendored"
+        self.cache_dir = root / "cache"
+        for directory in (self.search_dir, self.vendored_dir, self.cache_dir):
+            directory.mkdir()
+        self._patches = [
+            mock.patch.object(audio_processing, "RNNOISE_VENDORED_DIR", self.vendored_dir),
+            mock.patch.object(audio_processing, "RNNOISE_CACHE_DIR", self.cache_dir),
+            mock.patch.dict(os.environ, {audio_processing.RNNOISE_PATH_ENV: str(self.search_dir)}),
+        ]
+        for patch in self._patches:
+            patch.start()
+        os.environ.pop(audio_processing.RNNOISE_MODEL_ENV, None)
+        os.environ.pop(audio_processing.OFFLINE_ENV, None)
+
+    def tearDown(self) -> None:
+        for patch in reversed(self._patches):
+            patch.stop()
+        self._tempdir.cleanup()
+
+    def test_search_order_prefers_env_path_then_vendored_then_cache(self) -> None:
+        cached = self._touch(self.cache_dir / "std.rnnn")
+        self.assertEqual(audio_processing.ensure_rnnoise_model(), cached)
+        vendored = self._touch(self.vendored_dir / "std.rnnn")
+        self.assertEqual(audio_processing.ensure_rnnoise_model(), vendored)
+        searched = self._touch(self.search_dir / "std.rnnn")
+        self.assertEqual(audio_processing.ensure_rnnoise_model(), searched)
+
+        explicit = self._touch(Path(self._tempdir.name) / "custom.rnnn")
+        with mock.patch.dict(os.environ, {audio_processing.RNNOISE_MODEL_ENV: str(explicit)}):
+            self.assertEqual(audio_processing.ensure_rnnoise_model(), explicit)
+
+    def test_offline_mode_refuses_to_download(self) -> None:
+        with mock.patch.dict(os.environ, {audio_processing.OFFLINE_ENV: "1"}):
+            with mock.patch.object(audio_processing.urllib.request, "urlretrieve") as retrieve:
+                with self.assertRaises(audio_processing.AudioProcessingError) as ctx:
+                    audio_processing.ensure_rnnoise_model()
+        retrieve.assert_not_called()
+        self.assertIn(str(self.vendored_dir), str(ctx.exception))
+
+    def test_warm_asset_cache_resolves_voice_memo_model(self) -> None:
+        vendored = self._touch(self.vendored_dir / "std.rnnn")
+        lines = []
+        assets = audio_processing.warm_asset_cache(log_fn=lines.append)
+        self.assertEqual(assets, {"std.rnnn": vendored})
+        self.assertTrue(any(line.startswith("voice-memo:") for line in lines))
+
+    def _touch(self, path: Path) -> Path:
+        path.write_bytes(b"model")
+        return path
+
+
+if __name__ == "__main__":
+    unittest.main()
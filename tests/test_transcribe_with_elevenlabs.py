@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+import time
+import unittest
+from io import BytesIO
+from pathlib import Path
+from unittest import mock
+
+try:
+    import transcribe_with_elevenlabs  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency tree
+    transcribe_with_elevenlabs = None  # type: ignore
+
+try:
+    import transcribe_with_whisper  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency tree
+    transcribe_with_whisper = None  # type: ignore
+
+try:
+    from pydub import AudioSegment  # type: ignore
+    from pydub.generators import Sine  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    AudioSegment = None  # type: ignore
+    Sine = None  # type: ignore
+
+
+class FakeSpeechToText:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.uploads = []
+
+    def convert(self, *, file, file_format, **kwargs):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.uploads.append((type(file), file_format))
+        try:
+            file.read()
+            time.sleep(self.delay)
+            return {"text": Path(file.name).stem, "words": []}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+class ElevenLabsRunnerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        if transcribe_with_elevenlabs is None or Sine is None:
+            self.skipTest("ElevenLabs runner dependencies are unavailable; skipping related tests.")
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self._tempdir.name)
+        cache_env = mock.patch.dict("os.environ", {"TAELGAR_RESPONSE_CACHE_DIR": str(self.temp_path / "responses")})
+        cache_env.start()
+        self.addCleanup(cache_env.stop)
+
+    def tearDown(self) -> None:
+        self._tempdir.cleanup()
+
+    def _write_tone(self, name: str, frequency: int = 440) -> Path:
+        path = self.temp_path / name
+        tone = Sine(frequency).to_audio_segment(duration=500).set_frame_rate(16_000).set_channels(1)
+        tone.export(path, format=path.suffix.lstrip(".")).close()
+        return path
+
+    def test_files_upload_concurrently_and_stream_from_disk(self) -> None:
+        sources = [self._write_tone(f"take{index}.wav", 440 + 110 * index) for index in range(4)]
+        speech_to_text = FakeSpeechToText(delay=0.3)
+        client = mock.Mock(speech_to_text=speech_to_text)
+
+        with mock.patch.object(transcribe_with_elevenlabs, "ElevenLabs", return_value=client), mock.patch.dict(
+            "os.environ", {"ELEVENLABS_API_KEY": "test"}
+        ), mock.patch("builtins.print"):
+            exit_code = transcribe_with_elevenlabs.main(
+                [
+                    str(self.temp_path),
+                    "--audio-profile",
+                    "passthrough",
+                    "--max-workers",
+                    "4",
+                    "--stream-upload",
+                ]
+            )
+
+        self.assertEqual(exit_code, 0)
+        self.assertGreater(speech_to_text.peak, 1)
+        self.assertTrue(all(upload_type is not BytesIO for upload_type, _ in speech_to_text.uploads))
+        for source in sources:
+            outputs = list(self.temp_path.glob(f"{source.stem}*.elevenlabs.json"))
+            self.assertEqual(len(outputs), 1)
+            self.assertTrue(json.loads(outputs[0].read_text(encoding="utf-8"))["text"].startswith(source.stem))
+
+    def test_runners_sharing_a_chunk_dir_do_not_prune_each_other(self) -> None:
+        if transcribe_with_whisper is None:
+            self.skipTest("Whisper runner dependencies are unavailable; skipping shared chunk test.")
+        audio = AudioSegment.silent(duration=0)
+        for _ in range(3):
+            audio += Sine(440).to_audio_segment(duration=1500).apply_gain(-6) + AudioSegment.silent(duration=1000)
+        recording = self.temp_path / "session.wav"
+        audio.set_frame_rate(16_000).set_channels(1).export(recording, format="wav").close()
+        chunks_dir = self.temp_path / "chunks"
+        common = ["--audio-profile", "normalize-only", "--discard-audio", "--prune-chunks"]
+
+        def run_elevenlabs(max_chunk_seconds: str) -> int:
+            client = mock.Mock(speech_to_text=FakeSpeechToText(delay=0.0))
+            with mock.patch.object(transcribe_with_elevenlabs, "ElevenLabs", return_value=client), mock.patch.dict(
+                "os.environ", {"ELEVENLABS_API_KEY": "test"}
+            ), mock.patch("builtins.print"):
+                return transcribe_with_elevenlabs.main(
+                    [str(recording), "--max-chunk-seconds", max_chunk_seconds, *common]
+                )
+
+        def chunk_sets():
+            return {path.parent.name: json.loads(path.read_text())["labels"] for path in chunks_dir.glob("*/chunk_manifest.json")}
+
+        self.assertEqual(run_elevenlabs("3"), 0)
+        transcripts = sorted(self.temp_path.glob("session_chunk_*.elevenlabs.json"))
+        self.assertGreater(len(transcripts), 1)
+        self.assertEqual(list(chunks_dir.rglob("*.elevenlabs.json")), [])
+        (elevenlabs_set,) = chunk_sets()
+
+        whisper_argv = [
+            str(recording),
+            "--session-id",
+            "session",
+            "--method",
+            "whisper-test",
+            "--out-dir",
+            str(self.temp_path / "out"),
+            "--max-chunk-seconds",
+            "2.6",
+            "--log-level",
+            "CRITICAL",
+            *common,
+        ]
+        with mock.patch.object(transcribe_with_whisper, "_build_openai_client", return_value=None), mock.patch.object(
+            transcribe_with_whisper, "transcribe_chunk", return_value={"text": "chunk", "words": []}
+        ):
+            self.assertEqual(transcribe_with_whisper.main(whisper_argv), 0)
+        sets = chunk_sets()
+        self.assertEqual(len(sets), 2)
+        self.assertEqual(sets[elevenlabs_set], ["elevenlabs:session"])
+        self.assertTrue(all(path.exists() for path in transcripts))
+
+        self.assertEqual(run_elevenlabs("2.9"), 0)
+        sets = chunk_sets()
+        self.assertNotIn(elevenlabs_set, sets)
+        self.assertEqual(sorted(sets.values()), [["elevenlabs:session"], ["whisper:session"]])
+
+    def test_streamed_upload_encodes_to_a_temporary_file(self) -> None:
+        source = self._write_tone("take.wav")
+        with transcribe_with_elevenlabs.open_upload(source, "flac", None, stream=True) as (handle, file_format):
+            upload_path = Path(handle.name)
+            self.assertEqual(file_format, "other")
+            self.assertEqual(upload_path.suffix, ".flac")
+            self.assertEqual(handle.read(4), b"fLaC")
+        self.assertFalse(upload_path.exists())
+        self.assertTrue(source.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,250 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+try:
+    import transcribe_with_whisper  # type: ignore
+    from session_pipeline import response_cache  # type: ignore
+    from transcribe_with_whisper import combine_chunk_transcripts  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency tree
+    transcribe_with_whisper = None  # type: ignore
+    response_cache = None  # type: ignore
+    combine_chunk_transcripts = None  # type: ignore
+
+try:
+    from pydub import AudioSegment  # type: ignore
+    from pydub.generators import Sine  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    AudioSegment = None  # type: ignore
+    Sine = None  # type: ignore
+
+
+def _word(text: str, start: float, end: float, **extra):
+    payload = {"word": text, "start": start, "end": end}
+    payload.update(extra)
+    return payload
+
+
+class CombineChunkTranscriptsTests(unittest.TestCase):
+    def setUp(self) -> None:
+        if combine_chunk_transcripts is None:
+            self.skipTest("OpenAI client dependencies are unavailable; skipping Whisper runner tests.")
+
+    def _combine(self, results):
+        return combine_chunk_transcripts(
+            results,
+            session_id="dufr-000",
+            method="whisper-test",
+            manifest_path=Path("chunk_manifest.json"),
+        )
+
+    def test_contiguous_chunks_keep_every_word(self) -> None:
+        results = [
+            {
+                "chunk": {"index": 0, "start_ms": 0, "end_ms": 2000, "path": "a.wav"},
+                "transcript": {"text": "hello there", "words": [_word("hello", 0.1, 0.5), _word("there", 0.6, 1.0)]},
+            },
+            {
+                "chunk": {"index": 1, "start_ms": 2000, "end_ms": 4000, "path": "b.wav"},
+                "transcript": {"text": "general", "words": [_word("general", 0.2, 0.8)]},
+            },
+        ]
+        payload = self._combine(results)
+        self.assertEqual([word["word"] for word in payload["words"]], ["hello", "there", "general"])
+        self.assertEqual(payload["words"][2]["start"], 2.2)
+        self.assertEqual(payload["text"], "hello there\n\ngeneral")
+
+    def test_overlapping_chunks_reconcile_seam_words(self) -> None:
+        # Seam at 10 s; each chunk carries 2 s of its neighbour's audio.
+        first = {
+            "chunk": {
+                "index": 0,
+                "start_ms": 0,
+                "end_ms": 12_000,
+                "path": "a.wav",
+                "overlap_before_ms": 0,
+                "overlap_after_ms": 2_000,
+            },
+            "transcript": {
+                "text": "we ride at dawn tomorrow nig",
+                "words": [
+                    _word("we", 8.5, 8.8),
+                    _word("ride", 9.0, 9.4),
+                    _word("at", 9.85, 10.1, probability=0.4),
+                    _word("dawn", 10.3, 10.7),
+                    _word("nig", 11.8, 12.0),
+                ],
+            },
+        }
+        second = {
+            "chunk": {
+                "index": 1,
+                "start_ms": 8_000,
+                "end_ms": 20_000,
+                "path": "b.wav",
+                "overlap_before_ms": 2_000,
+                "overlap_after_ms": 0,
+            },
+            "transcript": {
+                "text": "e ride at dawn tomorrow night",
+                "words": [
+                    _word("e", 0.5, 0.8),
+                    _word("ride", 1.0, 1.4),
+                    _word("at", 1.95, 2.1, probability=0.9),
+                    _word("dawn", 2.3, 2.7),
+                    _word("tomorrow", 3.0, 3.6),
+                    _word("night", 3.8, 4.2),
+                ],
+            },
+        }
+
+        payload = self._combine([first, second])
+        words = payload["words"]
+        self.assertEqual(
+            [word["word"] for word in words],
+            ["we", "ride", "at", "dawn", "tomorrow", "night"],
+        )
+        self.assertEqual(words[2]["probability"], 0.9)
+        self.assertTrue(all(not key.startswith("_") for word in words for key in word))
+        self.assertEqual(payload["text"], "we ride at dawn tomorrow night")
+        self.assertEqual(payload["metadata"]["chunks"][1]["overlap_before_seconds"], 2.0)
+
+
+class ResumeTranscriptionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        if transcribe_with_whisper is None or AudioSegment is None:
+            self.skipTest("Whisper runner or pydub dependencies are unavailable; skipping resume tests.")
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self._tempdir.name)
+        audio = AudioSegment.silent(duration=0)
+        for _ in range(3):
+            audio += Sine(440).to_audio_segment(duration=1500).apply_gain(-6) + AudioSegment.silent(duration=1000)
+        self.audio_path = self.temp_path / "session.wav"
+        audio.set_frame_rate(16_000).set_channels(1).export(self.audio_path, format="wav").close()
+        cache_env = mock.patch.dict("os.environ", {"TAELGAR_RESPONSE_CACHE_DIR": str(self.temp_path / "responses")})
+        cache_env.start()
+        self.addCleanup(cache_env.stop)
+
+    def tearDown(self) -> None:
+        self._tempdir.cleanup()
+
+    def _argv(self, method: str):
+        return [
+            str(self.audio_path),
+            "--session-id",
+            "dufr-000",
+            "--method",
+            method,
+            "--out-dir",
+            str(self.temp_path / "out"),
+            "--max-chunk-seconds",
+            "2.6",
+            "--audio-profile",
+            "normalize-only",
+            "--log-level",
+            "CRITICAL",
+        ]
+
+    def test_rerun_submits_only_failed_chunks(self) -> None:
+        submitted = []
+
+        def fake_transcribe(client, chunk, model):
+            submitted.append(chunk["index"])
+            if chunk["index"] == 1 and submitted.count(1) == 1:
+                raise ValueError("upload rejected")
+            return {"text": f"chunk {chunk['index']}", "words": []}
+
+        argv = self._argv("whisper-test")
+        with mock.patch.object(transcribe_with_whisper, "_build_openai_client", return_value=None), mock.patch.object(
+            transcribe_with_whisper, "transcribe_chunk", side_effect=fake_transcribe
+        ):
+            with self.assertLogs("transcribe_with_whisper", "ERROR") as logs:
+                self.assertEqual(transcribe_with_whisper.main(argv), 1)
+            self.assertIn("Re-run the same command", logs.output[-1])
+            chunk_count = len(submitted)
+            self.assertGreater(chunk_count, 1)
+
+            self.assertEqual(transcribe_with_whisper.main(argv), 0)
+            self.assertEqual(submitted[chunk_count:], [1])
+
+            self.assertEqual(transcribe_with_whisper.main(argv), 0)
+            self.assertEqual(len(submitted), chunk_count + 1)
+
+        merged = self.temp_path / "out" / "dufr-000" / "whisper-test" / "whisper-test.whisper.json"
+        self.assertIn("chunk 1", merged.read_text(encoding="utf-8"))
+
+    def test_rerun_with_another_audio_profile_redoes_audio_and_chunks(self) -> None:
+        submitted = []
+
+        def fake_transcribe(client, chunk, model):
+            submitted.append(chunk["index"])
+            return {"text": f"chunk {chunk['index']}", "words": []}
+
+        argv = self._argv("whisper-test")
+        profile_index = argv.index("--audio-profile") + 1
+        clean_path = self.temp_path / "session-clean.wav"
+        with mock.patch.object(transcribe_with_whisper, "_build_openai_client", return_value=None), mock.patch.object(
+            transcribe_with_whisper, "transcribe_chunk", side_effect=fake_transcribe
+        ):
+            argv[profile_index] = "passthrough"
+            self.assertEqual(transcribe_with_whisper.main(argv), 0)
+            first_audio = clean_path.read_bytes()
+            chunk_count = len(submitted)
+
+            self.assertEqual(transcribe_with_whisper.main(argv), 0)
+            self.assertEqual(len(submitted), chunk_count)
+
+            argv[profile_index] = "normalize-only"
+            self.assertEqual(transcribe_with_whisper.main(argv), 0)
+
+        self.assertNotEqual(clean_path.read_bytes(), first_audio)
+        self.assertGreaterEqual(len(submitted), 2 * chunk_count)
+
+    def test_cold_run_hashes_each_chunk_once_for_the_response_cache(self) -> None:
+        submitted = []
+
+        def fake_transcribe(client, chunk, model):
+            submitted.append(chunk["index"])
+            return {"text": f"chunk {chunk['index']}", "words": []}
+
+        hashed = []
+        real_sha256 = response_cache.sha256_file
+
+        def counting_sha256(path):
+            hashed.append(Path(path))
+            return real_sha256(path)
+
+        with mock.patch.object(transcribe_with_whisper, "_build_openai_client", return_value=None), mock.patch.object(
+            transcribe_with_whisper, "transcribe_chunk", side_effect=fake_transcribe
+        ), mock.patch.object(response_cache, "sha256_file", side_effect=counting_sha256):
+            self.assertEqual(transcribe_with_whisper.main(self._argv("whisper-test") + ["--discard-audio"]), 0)
+
+        self.assertGreater(len(submitted), 1)
+        self.assertEqual(len(hashed), len(submitted))
+        self.assertEqual(len(set(hashed)), len(submitted))
+
+    def test_response_cache_answers_a_new_method_without_a_client(self) -> None:
+        submitted = []
+
+        def fake_transcribe(client, chunk, model):
+            submitted.append(chunk["index"])
+            return {"text": f"chunk {chunk['index']}", "words": []}
+
+        with mock.patch.object(transcribe_with_whisper, "_build_openai_client", return_value=None), mock.patch.object(
+            transcribe_with_whisper, "transcribe_chunk", side_effect=fake_transcribe
+        ):
+            self.assertEqual(transcribe_with_whisper.main(self._argv("whisper-a") + ["--discard-audio"]), 0)
+        self.assertGreater(len(submitted), 1)
+
+        with mock.patch.object(
+            transcribe_with_whisper, "_build_openai_client", side_effect=AssertionError("client built")
+        ):
+            self.assertEqual(transcribe_with_whisper.main(self._argv("whisper-b") + ["--discard-audio"]), 0)
+
+        merged = self.temp_path / "out" / "dufr-000" / "whisper-b" / "whisper-b.whisper.json"
+        self.assertIn("chunk 1", merged.read_text(encoding="utf-8"))
+
+
+if __name__ == "__main__":
+    unittest.main()
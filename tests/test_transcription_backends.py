@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import tempfile
+import threading
+import unittest
+from argparse import Namespace
+from pathlib import Path
+
+from session_pipeline.backends import MockBackend, MockSettings, OpenAIBackend, TranscriptionBackend
+from session_pipeline.transcription import (
+    TranscriptionEngine,
+    is_throttled,
+    retry_after_seconds,
+    transcribe_audio_chunks,
+)
+
+try:
+    from openai import OpenAI  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    OpenAI = None  # type: ignore
+
+try:
+    from elevenlabs import ElevenLabs  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    ElevenLabs = None  # type: ignore
+
+try:
+    from pydub.generators import Sine  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency
+    Sine = None  # type: ignore
+
+try:
+    import mock_transcription_server  # type: ignore
+except ImportError:  # pragma: no cover - optional dependency tree
+    mock_transcription_server = None  # type: ignore
+
+
+def _chunks(count: int, seconds: float = 10.0):
+    step = int(seconds * 1000)
+    return [
+        {"index": index, "start_ms": index * step, "end_ms": (index + 1) * step, "path": f"chunk_{index:03d}.flac"}
+        for index in range(count)
+    ]
+
+
+class MockBackendTests(unittest.TestCase):
+    def test_transcribe_audio_chunks_accepts_a_backend(self) -> None:
+        backend = MockBackend(MockSettings(latency_scale=0.0, seed=1))
+        results = transcribe_audio_chunks(None, _chunks(5), backend=backend)
+
+        self.assertEqual([item["chunk"]["index"] for item in results], list(range(5)))
+        transcript = results[0]["transcript"]
+        self.assertEqual(len(transcript["words"]), 25)
+        self.assertLessEqual(transcript["words"][-1]["end"], 10.0)
+        self.assertEqual(backend.stats.requests, 5)
+
+    def test_server_side_concurrency_limit_is_absorbed_by_retries(self) -> None:
+        backend = MockBackend(
+            MockSettings(latency_scale=0.005, concurrency_limit=3, retry_after_seconds=0.01, seed=2)
+        )
+        engine = TranscriptionEngine(backend.profile, backoff_base=0.01, backoff_max=0.05)
+        outcomes = engine.run(_chunks(12), backend.transcribe)
+
+        self.assertTrue(all(outcome.ok for outcome in outcomes))
+        self.assertGreater(backend.stats.throttled, 0)
+        self.assertEqual(backend.stats.requests, 12 + backend.stats.throttled)
+
+    def test_incomplete_backends_fail_when_instantiated(self) -> None:
+        class TranscribeOnly(TranscriptionBackend):
+            def transcribe(self, chunk):
+                return {}
+
+        with self.assertRaises(TypeError):
+            TranscribeOnly()
+
+    def test_replay_dir_serves_recorded_responses(self) -> None:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            Path(temp_dir, "chunk_001.whisper.json").write_text('{"text": "recorded"}', encoding="utf-8")
+            backend = MockBackend(MockSettings(latency_scale=0.0, replay_dir=Path(temp_dir)))
+            self.assertEqual(backend.transcribe(_chunks(2)[1]), {"text": "recorded"})
+            self.assertIn("words", backend.transcribe(_chunks(1)[0]))
+
+
+class MockServerTests(unittest.TestCase):
+    def setUp(self) -> None:
+        if mock_transcription_server is None or OpenAI is None or ElevenLabs is None or Sine is None:
+            self.skipTest("SDK or audio dependencies are unavailable; skipping mock server tests.")
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.audio_path = Path(self._tempdir.name) / "chunk_000.wav"
+        tone = Sine(440).to_audio_segment(duration=2000).set_frame_rate(16_000).set_channels(1)
+        tone.export(self.audio_path, format="wav").close()
+
+    def tearDown(self) -> None:
+        self._tempdir.cleanup()
+
+    def _serve(self, **overrides):
+        options = dict(
+            latency_scale=0.0,
+            latency_jitter=0.0,
+            error_rate=0.0,
+            throttle_rate=0.0,
+            concurrency_limit=None,
+            retry_after=0.5,
+            replay_dir=None,
+            seed=0,
+        )
+        options.update(overrides)
+        server = mock_transcription_server.MockTranscriptionServer(
+            ("127.0.0.1", 0),
+            mock_transcription_server.make_handler(mock_transcription_server.build_backends(Namespace(**options))),
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    def test_openai_and_elevenlabs_clients_talk_to_the_mock(self) -> None:
+        base_url = self._serve()
+        chunk = {"index": 0, "path": self.audio_path}
+
+        openai_client = OpenAI(api_key="unused", base_url=f"{base_url}/v1", max_retries=0)
+        transcript = OpenAIBackend(openai_client).transcribe(chunk)
+        self.assertAlmostEqual(transcript["duration"], 2.0, places=2)
+        self.assertEqual(len(transcript["words"]), 5)
+
+        vtt = OpenAIBackend(openai_client, response_format="vtt", timestamp_granularities=None).transcribe(chunk)
+        self.assertTrue(vtt.startswith("WEBVTT"))
+
+        elevenlabs_client = ElevenLabs(api_key="unused", base_url=base_url)
+        with self.audio_path.open("rb") as handle:
+            response = elevenlabs_client.speech_to_text.convert(
+                file=handle,
+                model_id="scribe_v1",
+                request_options={"max_retries": 0},
+            )
+        self.assertEqual(response.words[0].speaker_id, "speaker_0")
+
+    def test_throttling_surfaces_as_sdk_rate_limit_errors(self) -> None:
+        base_url = self._serve(throttle_rate=1.0, retry_after=2.5)
+        client = OpenAI(api_key="unused", base_url=f"{base_url}/v1", max_retries=0)
+        with self.assertRaises(Exception) as caught:
+            OpenAIBackend(client).transcribe({"index": 0, "path": self.audio_path})
+        self.assertTrue(is_throttled(caught.exception))
+        self.assertEqual(retry_after_seconds(caught.exception), 2.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import threading
+import time
+import unittest
+from dataclasses import replace
+
+from session_pipeline.chunking import BACKEND_PROFILES
+from session_pipeline.transcription import (
+    AdaptiveConcurrency,
+    TokenBucket,
+    TranscriptionEngine,
+    is_retryable,
+    retry_after_seconds,
+)
+
+
+class FakeStatusError(Exception):
+    def __init__(self, status_code: int, headers=None) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class TranscriptionEngineTests(unittest.TestCase):
+    def _engine(self, **profile_overrides) -> TranscriptionEngine:
+        profile = replace(BACKEND_PROFILES["whisper"], requests_per_minute=None, **profile_overrides)
+        return TranscriptionEngine(profile, backoff_base=0.01, backoff_max=0.05, rng=random.Random(0))
+
+    def test_chunks_run_concurrently_and_keep_input_order(self) -> None:
+        delays = [0.2 + 0.01 * (index % 5) for index in range(20)]
+        completed = []
+
+        start = time.perf_counter()
+        outcomes = self._engine().run(
+            list(range(20)),
+            lambda index: time.sleep(delays[index]) or index * 10,
+            on_result=lambda outcome: completed.append(outcome.item),
+        )
+        elapsed = time.perf_counter() - start
+
+        self.assertLess(elapsed, max(delays) * 2)
+        self.assertEqual([outcome.result for outcome in outcomes], [index * 10 for index in range(20)])
+        self.assertEqual(sorted(completed), list(range(20)))
+
+    def test_throttled_requests_back_off_and_shrink_concurrency(self) -> None:
+        lock = threading.Lock()
+        state = {"active": 0, "retry_peak": 0, "calls": 0}
+
+        def call(item: int) -> int:
+            with lock:
+                state["calls"] += 1
+                state["active"] += 1
+                throttle = state["calls"] <= 8
+                if not throttle:
+                    state["retry_peak"] = max(state["retry_peak"], state["active"])
+            try:
+                time.sleep(0.02)
+                if throttle:
+                    raise FakeStatusError(429, {"retry-after-ms": "30"})
+                return item
+            finally:
+                with lock:
+                    state["active"] -= 1
+
+        outcomes = self._engine(initial_concurrency=8, max_concurrency=8).run(list(range(8)), call)
+
+        self.assertTrue(all(outcome.ok for outcome in outcomes))
+        self.assertTrue(all(outcome.attempts == 2 for outcome in outcomes))
+        self.assertLessEqual(state["retry_peak"], 4)
+
+    def test_non_retryable_errors_fail_without_retrying(self) -> None:
+        calls = []
+
+        def call(item: int) -> int:
+            calls.append(item)
+            raise FakeStatusError(400)
+
+        outcome = self._engine().run([1], call)[0]
+        self.assertFalse(outcome.ok)
+        self.assertEqual(outcome.attempts, 1)
+        self.assertEqual(calls, [1])
+
+    def test_error_classification_and_retry_after(self) -> None:
+        self.assertTrue(is_retryable(FakeStatusError(503)))
+        self.assertTrue(is_retryable(ConnectionResetError()))
+        self.assertFalse(is_retryable(ValueError("bad input")))
+        self.assertEqual(retry_after_seconds(FakeStatusError(429, {"Retry-After": "3"})), 3.0)
+        self.assertEqual(retry_after_seconds(FakeStatusError(429, {"retry-after-ms": "250"})), 0.25)
+        self.assertIsNone(retry_after_seconds(FakeStatusError(429)))
+
+
+class RateLimitPrimitiveTests(unittest.TestCase):
+    def test_adaptive_concurrency_grows_then_halves(self) -> None:
+        limiter = AdaptiveConcurrency(4, 32)
+        for _ in range(4):
+            limiter.on_success()
+        self.assertEqual(limiter.limit, 8)
+
+        limiter.on_throttle(0)
+        limiter.on_throttle(0)  # same round: counted once
+        self.assertEqual(limiter.limit, 4)
+
+        for _ in range(4):
+            limiter.on_success()
+        self.assertEqual(limiter.limit, 5)
+
+    def test_token_bucket_spaces_requests(self) -> None:
+        async def acquire_all() -> float:
+            bucket = TokenBucket(rate=50.0, capacity=1)
+            start = time.perf_counter()
+            for _ in range(6):
+                await bucket.acquire()
+            return time.perf_counter() - start
+
+        self.assertGreaterEqual(asyncio.run(acquire_all()), 0.09)
+
+
+if __name__ == "__main__":
+    unittest.main()
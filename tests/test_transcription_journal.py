@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from session_pipeline.transcription_journal import DONE, FAILED, PENDING, TranscriptionJournal
+
+
+class TranscriptionJournalTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tempdir = tempfile.TemporaryDirectory()
+        self.temp_path = Path(self._tempdir.name)
+        self.journal_path = self.temp_path / "transcription_journal.jsonl"
+
+    def tearDown(self) -> None:
+        self._tempdir.cleanup()
+
+    def test_replay_keeps_latest_state_and_verifies_transcripts(self) -> None:
+        transcript = self.temp_path / "chunk_000.whisper.json"
+        transcript.write_text(json.dumps({"text": "hello"}), encoding="utf-8")
+
+        with TranscriptionJournal.open(self.journal_path) as journal:
+            journal.mark("a/chunk_000.flac", PENDING)
+            journal.mark("a/chunk_001.flac", PENDING)
+            journal.mark_done("a/chunk_000.flac", settings="s1", transcript_path=transcript, attempts=1)
+            journal.mark("a/chunk_001.flac", FAILED, error="HTTP 500")
+
+        with self.journal_path.open("a", encoding="utf-8") as fh:
+            fh.write('{"key": "a/chunk_001.flac", "sta')  # torn write from a crash
+
+        with TranscriptionJournal.open(self.journal_path) as journal:
+            self.assertEqual(journal.state("a/chunk_000.flac"), DONE)
+            self.assertEqual(journal.state("a/chunk_001.flac"), FAILED)
+            self.assertTrue(journal.completed("a/chunk_000.flac", settings="s1", transcript_path=transcript))
+            self.assertFalse(journal.completed("a/chunk_000.flac", settings="s2", transcript_path=transcript))
+            self.assertFalse(journal.completed("a/chunk_001.flac", settings="s1", transcript_path=transcript))
+
+            transcript.write_text(json.dumps({"text": "hel"}), encoding="utf-8")
+            self.assertFalse(journal.completed("a/chunk_000.flac", settings="s1", transcript_path=transcript))
+
+        self.assertEqual(len(self.journal_path.read_text(encoding="utf-8").splitlines()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
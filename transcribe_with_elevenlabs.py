@@ -14,15 +14,20 @@ import argparse
 import json
 import os
 import sys
+import tempfile
+from contextlib import contextmanager
 from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import IO, Any, Dict, Iterator, List, Tuple
 
 from dotenv import load_dotenv
 from elevenlabs import ElevenLabs
-from pydub import AudioSegment
-from session_pipeline.audio import chunk_audio_file
+from session_pipeline.audio import CHUNK_FORMATS, encode_audio_bytes, encode_audio_file
 from session_pipeline.audio_processing import AUDIO_PROFILES, AudioProcessingError, prepare_clean_audio
+from session_pipeline.chunking import BACKEND_PROFILES, default_chunks_dir, prepare_audio_chunks
+from session_pipeline.probe import ProbeError, audio_duration_seconds
+from session_pipeline.response_cache import default_response_cache
+from session_pipeline.transcription import ChunkOutcome, TranscriptionEngine
 
 
 AUDIO_EXTENSIONS = {
@@ -38,6 +43,7 @@ AUDIO_EXTENSIONS = {
 }
 
 CHUNK_MAX_SECONDS = 60 * 60  # 1 hour
+ELEVENLABS_BASE_URL = "https://api.elevenlabs.io"
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -81,6 +87,71 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Write preprocessed audio to a temporary file and delete it after use.",
     )
+    parser.add_argument(
+        "--upload-format",
+        choices=sorted(CHUNK_FORMATS.keys()),
+        default="flac",
+        help="Codec for chunks and uploads: lossless flac, wav, or lossy opus (default: flac).",
+    )
+    parser.add_argument(
+        "--upload-bitrate",
+        help="Encoder bitrate for lossy upload formats, e.g. 32k (default: 32k for opus).",
+    )
+    parser.add_argument(
+        "--max-chunk-seconds",
+        type=float,
+        default=CHUNK_MAX_SECONDS,
+        help=(
+            "Split files longer than this into chunks of at most this length (default: 3600). "
+            "Chunks are shared with transcribe_with_whisper.py only when this, the audio profile "
+            "and the chunk format/bitrate match its settings."
+        ),
+    )
+    parser.add_argument(
+        "--chunk-dir",
+        type=Path,
+        help="Directory for chunked audio (default: chunks/ beside each recording).",
+    )
+    parser.add_argument(
+        "--prune-chunks",
+        action="store_true",
+        help=(
+            "Delete each recording's superseded ElevenLabs chunk sets from the chunk directory "
+            "(sets also used by transcribe_with_whisper.py are kept)."
+        ),
+    )
+    parser.add_argument(
+        "--base-url",
+        default=ELEVENLABS_BASE_URL,
+        help=(
+            "ElevenLabs API base URL, e.g. http://127.0.0.1:8765 for mock_transcription_server.py "
+            f"(default: {ELEVENLABS_BASE_URL})."
+        ),
+    )
+    parser.add_argument(
+        "--max-workers",
+        type=int,
+        help=(
+            "Ceiling for concurrent uploads. Concurrency starts at the ElevenLabs profile's "
+            "initial value and grows until the API throttles (default: profile maximum)."
+        ),
+    )
+    parser.add_argument(
+        "--stream-upload",
+        action="store_true",
+        help=(
+            "Stream each upload from disk (encoding to a temporary file when needed) instead of "
+            "buffering it in memory, so memory does not grow with chunk size times workers."
+        ),
+    )
+    parser.add_argument(
+        "--no-response-cache",
+        action="store_true",
+        help=(
+            "Neither read nor write the shared response cache (~/.cache/taelgar/responses, "
+            "override with TAELGAR_RESPONSE_CACHE_DIR)."
+        ),
+    )
     return parser
 
 
@@ -95,11 +166,13 @@ def main(argv: list[str] | None = None) -> int:
 
     load_dotenv()
     api_key = os.getenv("ELEVEN_LABS_API") or os.getenv("ELEVENLABS_API_KEY")
+    if not api_key and args.base_url != ELEVENLABS_BASE_URL:
+        api_key = "unused"  # local stand-ins do not check keys
     if not api_key:
         parser.error("ELEVEN_LABS_API or ELEVENLABS_API_KEY environment variable not set.")
         return 1
 
-    client = ElevenLabs(api_key=api_key, base_url="https://api.elevenlabs.io")
+    client = ElevenLabs(api_key=api_key, base_url=args.base_url)
 
     audio_files = resolve_input_files(input_path)
     if not audio_files:
@@ -107,7 +180,8 @@ def main(argv: list[str] | None = None) -> int:
         return 1
 
     failures: List[Path] = []
-    files_to_transcribe: List[Path] = []
+    # (file to upload, transcript path); chunk transcripts sit beside the recording, outside the chunk cache.
+    files_to_transcribe: List[tuple[Path, Path]] = []
     cleanup_after_transcription: List[Path] = []
     warned_output_ignored = False
 
@@ -125,7 +199,7 @@ def main(argv: list[str] | None = None) -> int:
                 log_fn=lambda message: print(message),
             )
             duration_seconds = get_audio_duration_seconds(clean_path)
-            if duration_seconds > CHUNK_MAX_SECONDS:
+            if duration_seconds > args.max_chunk_seconds:
                 print(
                     f"Chunking {audio_file} ({duration_seconds/3600:.2f} hours) before transcription..."
                 )
@@ -137,18 +211,27 @@ def main(argv: list[str] | None = None) -> int:
                     )
                     warned_output_ignored = True
 
-                chunks = chunk_audio_file(
+                chunks = prepare_audio_chunks(
                     clean_path,
-                    clean_path.parent,
-                    max_chunk_seconds=CHUNK_MAX_SECONDS,
-                    chunk_basename=clean_path.stem,
+                    (args.chunk_dir or default_chunks_dir(audio_file)).expanduser().resolve(),
+                    max_chunk_seconds=args.max_chunk_seconds,
+                    chunk_basename=audio_file.stem,
+                    chunk_format=args.upload_format,
+                    chunk_bitrate=args.upload_bitrate,
+                    label=f"elevenlabs:{audio_file.stem}",
+                    prune=args.prune_chunks,
                 )
-                chunk_paths = [Path(chunk["path"]) for chunk in chunks]
-                files_to_transcribe.extend(chunk_paths)
+                for chunk in chunks:
+                    chunk_path = Path(chunk["path"])
+                    files_to_transcribe.append(
+                        (chunk_path, audio_file.parent / f"{chunk_path.name}.elevenlabs.json")
+                    )
                 if cleanup_marker:
                     cleanup_marker.unlink(missing_ok=True)
             else:
-                files_to_transcribe.append(clean_path)
+                files_to_transcribe.append(
+                    (clean_path, clean_path.with_suffix(clean_path.suffix + ".elevenlabs.json"))
+                )
                 if cleanup_marker:
                     cleanup_after_transcription.append(clean_path.resolve())
         except AudioProcessingError as exc:
@@ -167,36 +250,71 @@ def main(argv: list[str] | None = None) -> int:
 
     cleanup_targets = {path.resolve() for path in cleanup_after_transcription}
 
-    for audio_file in files_to_transcribe:
-        try:
-            output_path = (
-                args.output
-                if args.output and len(files_to_transcribe) == 1
-                else audio_file.with_suffix(audio_file.suffix + ".elevenlabs.json")
-            )
-            if output_path.exists():
-                print(f"Skipping {audio_file}: output exists")
-                continue
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+    def cleanup(audio_file: Path) -> None:
+        resolved = audio_file.resolve()
+        if resolved in cleanup_targets and resolved.exists():
+            resolved.unlink(missing_ok=True)
+
+    jobs: List[tuple[Path, Path]] = []
+    for audio_file, default_output in files_to_transcribe:
+        output_path = args.output if args.output and len(files_to_transcribe) == 1 else default_output
+        if output_path.exists():
+            print(f"Skipping {audio_file}: output exists")
+            cleanup(audio_file)
+            continue
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        jobs.append((audio_file, output_path))
+
+    cache = None if args.no_response_cache else default_response_cache()
+    cache_parameters = {
+        "service": "elevenlabs",
+        "endpoint": args.base_url.rstrip("/"),
+        "model_id": args.model_id,
+        "diarize": True,
+        "num_speakers": args.num_speakers,
+        "diarization_threshold": args.diarization_threshold,
+        "upload_format": args.upload_format,
+        "upload_bitrate": args.upload_bitrate,
+    }
 
-            payload = transcribe_file(
+    def run_job(job: tuple[Path, Path]) -> Tuple[Dict[str, Any], bool]:
+        def fetch() -> Dict[str, Any]:
+            return transcribe_file(
                 client=client,
-                audio_path=audio_file,
+                audio_path=job[0],
                 num_speakers=args.num_speakers,
                 diarization_threshold=args.diarization_threshold,
                 model_id=args.model_id,
+                upload_format=args.upload_format,
+                upload_bitrate=args.upload_bitrate,
+                stream_upload=args.stream_upload,
             )
 
-            output_text = json.dumps(payload, indent=2, ensure_ascii=False)
+        if cache is None:
+            return fetch(), False
+        return cache.get_or_fetch(job[0], cache_parameters, fetch)
+
+    def handle_outcome(outcome: ChunkOutcome) -> None:
+        audio_file, output_path = outcome.item
+        try:
+            if outcome.error is not None:
+                failures.append(audio_file)
+                print(f"Failed to transcribe {audio_file}: {outcome.error}", file=sys.stderr)
+                return
+            transcription, hit = outcome.result
+            output_text = json.dumps(transcription, indent=2, ensure_ascii=False)
             output_path.write_text(output_text, encoding="utf-8")
-            print(f"{audio_file} -> {output_path}")
-        except Exception as exc:
-            failures.append(audio_file)
-            print(f"Failed to transcribe {audio_file}: {exc}", file=sys.stderr)
+            print(f"{audio_file} -> {output_path}{' (response cache)' if hit else ''}")
         finally:
-            resolved = audio_file.resolve()
-            if resolved in cleanup_targets and resolved.exists():
-                resolved.unlink(missing_ok=True)
+            cleanup(audio_file)
+
+    engine = TranscriptionEngine(BACKEND_PROFILES["elevenlabs"], max_concurrency=args.max_workers)
+    if jobs:
+        print(
+            f"Transcribing {len(jobs)} file(s) (concurrency {engine.initial_concurrency}, "
+            f"up to {engine.max_concurrency})..."
+        )
+    engine.run(jobs, run_job, on_result=handle_outcome)
 
     if failures:
         print(f"{len(failures)} file(s) failed.", file=sys.stderr)
@@ -244,14 +362,15 @@ def transcribe_file(
     num_speakers: int | None,
     diarization_threshold: float | None,
     model_id: str,
+    upload_format: str = "wav",
+    upload_bitrate: str | None = None,
+    stream_upload: bool = False,
 ) -> Dict[str, Any]:
-    file_obj = BytesIO(audio_path.read_bytes())
-    file_obj.name = audio_path.name  # type: ignore[attr-defined]
-    convert_kwargs = {
-        "file": file_obj,
+    convert_kwargs: Dict[str, Any] = {
         "model_id": model_id,
         "diarize": True,
-        "file_format": "pcm_s16le_16",
+        # TranscriptionEngine owns retries; the SDK's own would stack with them.
+        "request_options": {"max_retries": 0},
     }
     if num_speakers is not None:
         if num_speakers <= 0:
@@ -260,7 +379,8 @@ def transcribe_file(
     if diarization_threshold is not None:
         convert_kwargs["diarization_threshold"] = diarization_threshold
 
-    transcription = client.speech_to_text.convert(**convert_kwargs)
+    with open_upload(audio_path, upload_format, upload_bitrate, stream=stream_upload) as (file_obj, file_format):
+        transcription = client.speech_to_text.convert(file=file_obj, file_format=file_format, **convert_kwargs)
 
     if hasattr(transcription, "model_dump"):
         return transcription.model_dump()
@@ -269,11 +389,54 @@ def transcribe_file(
     return json.loads(json.dumps(transcription, default=str))
 
 
+@contextmanager
+def open_upload(
+    audio_path: Path,
+    upload_format: str,
+    upload_bitrate: str | None,
+    *,
+    stream: bool,
+) -> Iterator[Tuple[IO[bytes], str]]:
+    """
+    Yield ``(file object, ElevenLabs file_format)`` for uploading ``audio_path``.
+
+    By default the upload is buffered in memory. With ``stream`` the SDK reads
+    an open file handle in blocks instead: the source itself when it is
+    already in ``upload_format``, otherwise a temporary encoded copy.
+    """
+
+    if upload_format == "wav" and audio_path.suffix.lower() == ".wav":
+        if stream:
+            with audio_path.open("rb") as handle:
+                yield handle, "pcm_s16le_16"
+            return
+        buffer = BytesIO(audio_path.read_bytes())
+        buffer.name = audio_path.name  # type: ignore[attr-defined]
+        yield buffer, "pcm_s16le_16"
+        return
+
+    upload_name = audio_path.with_suffix(CHUNK_FORMATS[upload_format].extension).name
+    if not stream:
+        buffer = BytesIO(encode_audio_bytes(audio_path, upload_format, bitrate=upload_bitrate))
+        buffer.name = upload_name  # type: ignore[attr-defined]
+        yield buffer, "other"
+        return
+
+    with tempfile.TemporaryDirectory(prefix="elevenlabs-upload-") as temp_dir:
+        upload_path = encode_audio_file(
+            audio_path,
+            Path(temp_dir) / upload_name,
+            upload_format,
+            bitrate=upload_bitrate,
+        )
+        with upload_path.open("rb") as handle:
+            yield handle, "other"
+
+
 def get_audio_duration_seconds(path: Path) -> float:
     try:
-        audio = AudioSegment.from_file(path)
-        return len(audio) / 1000.0
-    except Exception as exc:  # pragma: no cover - defensive
+        return audio_duration_seconds(path)
+    except ProbeError as exc:  # pragma: no cover - defensive
         print(f"Warning: failed to inspect duration for {path}: {exc}", file=sys.stderr)
         return float("inf")
 
@@ -13,17 +13,34 @@ from __future__ import annotations
 import argparse
 import json
 import logging
+import math
 import os
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from dotenv import load_dotenv
 from openai import OpenAI
 
+from session_pipeline.audio import CHUNK_FORMATS
 from session_pipeline.audio_processing import AUDIO_PROFILES, AudioProcessingError, prepare_clean_audio
-from session_pipeline.chunking import prepare_audio_chunks
+from session_pipeline.backends import OpenAIBackend, openai_cache_parameters
+from session_pipeline.chunking import (
+    BACKEND_PROFILES,
+    chunk_bytes_per_second,
+    default_chunks_dir,
+    plan_chunk_size,
+    prepare_audio_chunks,
+)
 from session_pipeline.io_utils import write_json
+from session_pipeline.preprocess_state import settings_key
+from session_pipeline.probe import audio_duration_seconds
+from session_pipeline.response_cache import default_response_cache
+from session_pipeline.silence import SILENCE_DETECTORS
+from session_pipeline.transcription import ChunkOutcome, TranscriptionEngine
+from session_pipeline.transcription_journal import FAILED, IN_FLIGHT, JOURNAL_FILE_NAME, PENDING, TranscriptionJournal
+
+RESPONSE_FORMAT = "verbose_json"
+TIMESTAMP_GRANULARITIES = ["word"]
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -50,6 +67,15 @@ def build_parser() -> argparse.ArgumentParser:
         default=900.0,
         help="Maximum chunk length in seconds (default: 900s / 15 minutes).",
     )
+    parser.add_argument(
+        "--auto-chunk-size",
+        action="store_true",
+        help=(
+            "Choose the chunk length from the session duration, --max-workers and the Whisper "
+            "backend profile instead of --max-chunk-seconds. The upload size limit is applied at "
+            "--chunk-format's byte rate (raw PCM as the bound for flac and wav, --chunk-bitrate for opus)."
+        ),
+    )
     parser.add_argument(
         "--min-silence-ms",
         type=int,
@@ -62,10 +88,54 @@ def build_parser() -> argparse.ArgumentParser:
         default=-40,
         help="Silence threshold in dBFS (default: -40).",
     )
+    parser.add_argument(
+        "--chunk-overlap-seconds",
+        type=float,
+        default=0.0,
+        help="Audio overlap added to each side of every chunk; seam words are de-duplicated (default: 0).",
+    )
+    parser.add_argument(
+        "--silence-detector",
+        choices=SILENCE_DETECTORS,
+        default="ffmpeg",
+        help="Silence analysis backend used for chunk boundaries (default: ffmpeg).",
+    )
+    parser.add_argument(
+        "--chunk-format",
+        choices=sorted(CHUNK_FORMATS.keys()),
+        default="flac",
+        help="Codec for chunk files and uploads: lossless flac, wav, or lossy opus (default: flac).",
+    )
+    parser.add_argument(
+        "--chunk-bitrate",
+        help="Encoder bitrate for lossy chunk formats, e.g. 32k (default: 32k for opus).",
+    )
     parser.add_argument(
         "--chunk-dir",
         type=Path,
-        help="Optional explicit directory for chunked audio (defaults to <method>/chunks).",
+        help=(
+            "Optional explicit directory for chunked audio (defaults to chunks/ beside the source "
+            "recording, shared by every method and by transcribe_with_elevenlabs.py)."
+        ),
+    )
+    parser.add_argument(
+        "--prune-chunks",
+        action="store_true",
+        help=(
+            "Delete this session's superseded Whisper chunk sets from the chunk directory "
+            "(sets also used by another runner or session are kept)."
+        ),
+    )
+    parser.add_argument(
+        "--stream-chunks",
+        action="store_true",
+        help="Chunk without decoding the whole session into memory (constant-memory chunker).",
+    )
+    parser.add_argument(
+        "--chunk-workers",
+        type=int,
+        default=1,
+        help="Number of chunk files to export concurrently (default: 1).",
     )
     parser.add_argument(
         "--audio-profile",
@@ -83,15 +153,40 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Ignore existing chunk manifests and regenerate chunks.",
     )
+    parser.add_argument(
+        "--force-retranscribe",
+        action="store_true",
+        help=(
+            f"Resubmit every chunk, even those {JOURNAL_FILE_NAME} or the response cache "
+            "records as already transcribed with the same model."
+        ),
+    )
+    parser.add_argument(
+        "--no-response-cache",
+        action="store_true",
+        help=(
+            "Neither read nor write the shared response cache (~/.cache/taelgar/responses, "
+            "override with TAELGAR_RESPONSE_CACHE_DIR)."
+        ),
+    )
     parser.add_argument(
         "--api-key",
         help="Optional OpenAI API key override (defaults to OPEN_API_TAELGAR or OPENAI_API_KEY in the environment).",
     )
+    parser.add_argument(
+        "--base-url",
+        help=(
+            "OpenAI-compatible API base URL, e.g. http://127.0.0.1:8765/v1 for "
+            "mock_transcription_server.py (default: the OpenAI API)."
+        ),
+    )
     parser.add_argument(
         "--max-workers",
         type=int,
-        default=8,
-        help="Maximum concurrent transcription requests (default: 2).",
+        help=(
+            "Ceiling for concurrent transcription requests. Concurrency starts at the Whisper "
+            "profile's initial value and grows until the API throttles (default: profile maximum)."
+        ),
     )
     parser.add_argument(
         "--log-level",
@@ -117,9 +212,10 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     session_dir = args.out_dir.expanduser().resolve() / args.session_id
     method_dir = session_dir / args.method
-    chunks_dir = (args.chunk_dir or (method_dir / "chunks")).expanduser().resolve()
+    chunks_dir = (args.chunk_dir or default_chunks_dir(audio_path)).expanduser().resolve()
     transcripts_dir = method_dir / "chunk_transcripts"
     manifest_path = method_dir / "chunk_manifest.json"
+    journal_path = method_dir / JOURNAL_FILE_NAME
     combined_path = method_dir / f"{args.method}.whisper.json"
 
     method_dir.mkdir(parents=True, exist_ok=True)
@@ -134,10 +230,33 @@ def main(argv: Sequence[str] | None = None) -> int:
             channels=1,
             output_format="wav",
             log_fn=lambda message: logger.info(message),
+            # A journal means an earlier run of this method produced the clean audio; it is reused
+            # only if its settings sidecar matches this run's profile.
+            reuse_existing=journal_path.exists() and not args.force_retranscribe,
         )
     except AudioProcessingError as exc:
         parser.error(f"Failed to preprocess audio: {exc}")
 
+    engine = TranscriptionEngine(BACKEND_PROFILES["whisper"], max_concurrency=args.max_workers)
+
+    max_chunk_seconds = args.max_chunk_seconds
+    if args.auto_chunk_size:
+        duration_seconds = audio_duration_seconds(clean_audio_path)
+        plan = plan_chunk_size(
+            duration_seconds,
+            workers=engine.initial_concurrency,
+            profile=engine.profile,
+            bytes_per_audio_second=chunk_bytes_per_second(args.chunk_format, args.chunk_bitrate),
+        )
+        max_chunk_seconds = plan.chunk_seconds
+        logger.info(
+            "Auto chunk size: %.1fs (%d chunk(s) in %d wave(s), ~%.0fs estimated)",
+            plan.chunk_seconds,
+            plan.chunk_count,
+            plan.waves,
+            plan.estimated_seconds,
+        )
+
     logger.info("Preparing audio chunks from %s", clean_audio_path)
 
     chunk_entries = prepare_audio_chunks(
@@ -145,47 +264,137 @@ def main(argv: Sequence[str] | None = None) -> int:
         chunks_dir,
         manifest_path=manifest_path,
         reuse_existing=not args.force_rechunk,
-        max_chunk_seconds=args.max_chunk_seconds,
-        chunk_basename=f"{args.session_id}-{args.method}",
+        max_chunk_seconds=max_chunk_seconds,
+        chunk_basename=args.session_id,
         min_silence_len=args.min_silence_ms,
         silence_thresh=args.silence_threshold,
+        streaming=args.stream_chunks,
+        max_workers=args.chunk_workers,
+        silence_detector=args.silence_detector,
+        overlap_seconds=args.chunk_overlap_seconds,
+        chunk_format=args.chunk_format,
+        chunk_bitrate=args.chunk_bitrate,
+        label=f"whisper:{args.session_id}",
+        prune=args.prune_chunks,
     )
 
     if not chunk_entries:
         parser.error("No chunks were produced; cannot transcribe.")
 
-    client = _build_openai_client(args.api_key)
-
-    logger.info(
-        "Transcribing %d chunk(s) with model %s using %d worker(s)...",
-        len(chunk_entries),
-        args.model,
-        max(1, args.max_workers),
-    )
-
     transcription_results: List[Dict[str, Any]] = []
     errors: List[Tuple[int, BaseException]] = []
-
-    with ThreadPoolExecutor(max_workers=max(1, args.max_workers)) as executor:
-        future_map = {
-            executor.submit(transcribe_chunk, client, chunk, args.model): chunk
-            for chunk in chunk_entries
+    # The audio profile is part of the key so a re-run with another profile starts the journal afresh.
+    settings = settings_key(
+        {
+            "model": args.model,
+            "response_format": RESPONSE_FORMAT,
+            "timestamp_granularities": TIMESTAMP_GRANULARITIES,
+            "audio_profile": args.audio_profile,
         }
-        for future in as_completed(future_map):
-            chunk = future_map[future]
-            chunk_path = Path(chunk["path"])
-            try:
-                transcript = future.result()
-                out_path = transcripts_dir / f"{chunk_path.stem}.whisper.json"
+    )
+
+    with TranscriptionJournal.open(journal_path) as journal:
+        pending: List[Dict[str, Any]] = []
+        for chunk in chunk_entries:
+            key = _journal_key(chunk, chunks_dir)
+            out_path = _chunk_transcript_path(transcripts_dir, chunk)
+            if not args.force_retranscribe and journal.completed(key, settings=settings, transcript_path=out_path):
+                transcript = json.loads(out_path.read_text(encoding="utf-8"))
+                transcription_results.append({"chunk": chunk, "transcript": transcript})
+                continue
+            journal.mark(key, PENDING, index=chunk["index"])
+            pending.append(chunk)
+
+        if transcription_results:
+            logger.info(
+                "Resuming: %d of %d chunk(s) already transcribed according to %s",
+                len(transcription_results),
+                len(chunk_entries),
+                journal_path,
+            )
+
+        cache = None if args.no_response_cache else default_response_cache()
+        cache_parameters = openai_cache_parameters(
+            model=args.model,
+            response_format=RESPONSE_FORMAT,
+            timestamp_granularities=TIMESTAMP_GRANULARITIES,
+            base_url=args.base_url,
+        )
+        # Keys from the pre-check, by chunk index, so misses are not hashed again on submission.
+        cache_keys: Dict[int, str] = {}
+        if cache is not None and pending and not args.force_retranscribe:
+            uncached: List[Dict[str, Any]] = []
+            for chunk in pending:
+                cache_keys[chunk["index"]] = cache.key_for(Path(chunk["path"]), cache_parameters)
+                transcript = cache.get(cache_keys[chunk["index"]])
+                if transcript is None:
+                    uncached.append(chunk)
+                    continue
+                out_path = _chunk_transcript_path(transcripts_dir, chunk)
                 write_json(out_path, transcript)
+                journal.mark_done(
+                    _journal_key(chunk, chunks_dir), settings=settings, transcript_path=out_path, attempts=0
+                )
                 transcription_results.append({"chunk": chunk, "transcript": transcript})
-                logger.info("Wrote chunk transcript %s", out_path)
-            except Exception as exc:  # pragma: no cover - defensive logging
-                errors.append((chunk.get("index"), exc))
-                logger.error("Chunk %s failed: %s", chunk.get("index"), exc)
+            if len(uncached) < len(pending):
+                logger.info(
+                    "%d chunk(s) served from the response cache at %s", len(pending) - len(uncached), cache.cache_dir
+                )
+            pending = uncached
+
+        if pending:
+            client = _build_openai_client(args.api_key, base_url=args.base_url)
+            logger.info(
+                "Transcribing %d chunk(s) with model %s (concurrency %d, up to %d)...",
+                len(pending),
+                args.model,
+                engine.initial_concurrency,
+                engine.max_concurrency,
+            )
+
+            def submit(chunk: Dict[str, Any]) -> Dict[str, Any]:
+                journal.mark(_journal_key(chunk, chunks_dir), IN_FLIGHT, index=chunk["index"])
+                if cache is None:
+                    return transcribe_chunk(client, chunk, args.model)
+                transcript, _ = cache.get_or_fetch(
+                    Path(chunk["path"]),
+                    cache_parameters,
+                    lambda: transcribe_chunk(client, chunk, args.model),
+                    refresh=args.force_retranscribe,
+                    key=cache_keys.get(chunk["index"]),
+                )
+                return transcript
+
+            def handle_outcome(outcome: ChunkOutcome) -> None:
+                chunk = outcome.item
+                key = _journal_key(chunk, chunks_dir)
+                if outcome.error is not None:
+                    errors.append((chunk.get("index"), outcome.error))
+                    journal.mark(key, FAILED, index=chunk["index"], attempts=outcome.attempts, error=str(outcome.error))
+                    logger.error(
+                        "Chunk %s failed after %d attempt(s): %s", chunk.get("index"), outcome.attempts, outcome.error
+                    )
+                    return
+                out_path = _chunk_transcript_path(transcripts_dir, chunk)
+                write_json(out_path, outcome.result)
+                journal.mark_done(key, settings=settings, transcript_path=out_path, attempts=outcome.attempts)
+                transcription_results.append({"chunk": chunk, "transcript": outcome.result})
+                logger.info("Wrote chunk transcript %s (%.1fs)", out_path, outcome.elapsed_seconds)
+
+            engine.run(pending, submit, on_result=handle_outcome)
+
+    if cleanup_path and cleanup_path.exists():
+        cleanup_path.unlink(missing_ok=True)
 
     if errors:
-        raise SystemExit(f"{len(errors)} chunk(s) failed; see logs for details.")
+        logger.error(
+            "%d of %d chunk(s) failed. Re-run the same command to retry only those; "
+            "finished chunks are recorded in %s.",
+            len(errors),
+            len(chunk_entries),
+            journal_path,
+        )
+        return 1
 
     transcription_results.sort(key=lambda item: (item["chunk"]["start_ms"], item["chunk"]["index"]))
 
@@ -201,9 +410,6 @@ def main(argv: Sequence[str] | None = None) -> int:
         "Wrote %d chunk transcript(s) to %s", len(transcription_results), transcripts_dir
     )
     logger.info("Wrote merged transcript to %s", combined_path)
-
-    if cleanup_path and cleanup_path.exists():
-        cleanup_path.unlink(missing_ok=True)
     return 0
 
 
@@ -216,6 +422,13 @@ def combine_chunk_transcripts(
 ) -> Dict[str, Any]:
     """
     Combine per-chunk verbose_json payloads into a single session-level transcript.
+
+    Chunks cut with overlap (``overlap_before_ms``/``overlap_after_ms`` in the
+    manifest) transcribe the audio around each seam twice. Each chunk then only
+    contributes the segments and words whose midpoint falls inside its own
+    unpadded span, and any word still duplicated across a seam is resolved in
+    favour of the higher-confidence copy (or, without confidences, the copy
+    further from its chunk's cut edge).
     """
 
     combined_segments: List[Dict[str, Any]] = []
@@ -225,6 +438,10 @@ def combine_chunk_transcripts(
     language = None
     model_name = None
     max_end = 0.0
+    has_overlap = any(
+        int(item["chunk"].get("overlap_before_ms") or 0) or int(item["chunk"].get("overlap_after_ms") or 0)
+        for item in results
+    )
 
     for item in results:
         chunk = item["chunk"]
@@ -234,18 +451,27 @@ def combine_chunk_transcripts(
         end_ms = int(chunk.get("end_ms", start_ms))
         offset = start_ms / 1000.0
         chunk_duration = max(0.0, (end_ms - start_ms) / 1000.0)
+        overlap_before = int(chunk.get("overlap_before_ms") or 0) / 1000.0
+        overlap_after = int(chunk.get("overlap_after_ms") or 0) / 1000.0
+        core_start = offset + overlap_before
+        core_end = offset + chunk_duration - overlap_after
+        chunk_index = chunk.get("index")
 
         metadata_chunks.append(
             {
-                "index": chunk.get("index"),
+                "index": chunk_index,
                 "path": str(chunk_path),
                 "offset_seconds": round(offset, 6),
                 "duration_seconds": round(chunk_duration, 6),
+                "overlap_before_seconds": round(overlap_before, 6),
+                "overlap_after_seconds": round(overlap_after, 6),
             }
         )
 
+        seams = (core_start if overlap_before else None, core_end if overlap_after else None)
+
         text = (transcript.get("text") or "").strip()
-        if text:
+        if text and not has_overlap:
             combined_texts.append(text)
         language = language or transcript.get("language")
         model_name = model_name or transcript.get("model")
@@ -267,10 +493,17 @@ def combine_chunk_transcripts(
                     word_copy["start"] = round(offset + word_start, 6)
                     word_copy["end"] = round(offset + word_end, 6)
                     adjusted_words.append(word_copy)
-                    combined_words.append(word_copy)
+                    if not has_overlap:
+                        combined_words.append(word_copy)
+                    elif _owns_midpoint(word_copy["start"], word_copy["end"], seams):
+                        combined_words.append(
+                            _tag_seam_word(dict(word_copy), chunk_index, offset, offset + chunk_duration, seams)
+                        )
                 if adjusted_words:
                     words_from_segments = True
                 seg_copy["words"] = adjusted_words
+                if has_overlap and not _owns_midpoint(seg_copy["start"], seg_copy["end"], seams):
+                    continue
                 combined_segments.append(seg_copy)
                 max_end = max(max_end, seg_copy["end"])
 
@@ -282,6 +515,10 @@ def combine_chunk_transcripts(
                 word_end = float(word.get("end", word_start))
                 word_copy["start"] = round(offset + word_start, 6)
                 word_copy["end"] = round(offset + word_end, 6)
+                if has_overlap:
+                    if not _owns_midpoint(word_copy["start"], word_copy["end"], seams):
+                        continue
+                    _tag_seam_word(word_copy, chunk_index, offset, offset + chunk_duration, seams)
                 combined_words.append(word_copy)
                 max_end = max(max_end, word_copy["end"])
 
@@ -290,8 +527,19 @@ def combine_chunk_transcripts(
     combined_segments.sort(key=lambda seg: seg.get("start", 0.0))
     combined_words.sort(key=lambda word: (word.get("start", 0.0), word.get("end", 0.0)))
 
+    if has_overlap:
+        combined_words = _dedupe_seam_words(combined_words)
+        if combined_segments:
+            combined_texts = [(seg.get("text") or "").strip() for seg in combined_segments]
+        else:
+            combined_texts = [" ".join((word.get("word") or "").strip() for word in combined_words)]
+        combined_texts = [text for text in combined_texts if text]
+        separator = " "
+    else:
+        separator = "\n\n"
+
     combined_payload: Dict[str, Any] = {
-        "text": "\n\n".join(combined_texts).strip(),
+        "text": separator.join(combined_texts).strip(),
         "language": language,
         "model": model_name,
         "duration": round(max_end, 6),
@@ -307,47 +555,111 @@ def combine_chunk_transcripts(
     return combined_payload
 
 
-def transcribe_chunk(client: OpenAI, chunk: Dict[str, Any], model: str) -> Dict[str, Any]:
+def _owns_midpoint(start: float, end: float, seams: Tuple[Optional[float], Optional[float]]) -> bool:
+    """Return True if ``[start, end]`` is centred inside the chunk core bounded by ``seams``.
+
+    A ``None`` seam is an unpadded edge, i.e. the start or end of the session.
     """
-    Transcribe a single chunk using the OpenAI client and return the verbose JSON payload.
+
+    midpoint = (start + end) / 2.0
+    core_start, core_end = seams
+    return (core_start is None or midpoint >= core_start) and (core_end is None or midpoint < core_end)
+
+
+def _tag_seam_word(
+    word: Dict[str, Any],
+    chunk_index: Any,
+    audio_start: float,
+    audio_end: float,
+    seams: Tuple[Optional[float], Optional[float]],
+) -> Dict[str, Any]:
+    """Record which chunk produced ``word`` and how far it sits from a padded cut edge."""
+
+    before = word["start"] - audio_start if seams[0] is not None else float("inf")
+    after = audio_end - word["end"] if seams[1] is not None else float("inf")
+    word["_chunk"] = chunk_index
+    word["_edge_distance"] = min(before, after)
+    return word
+
+
+def _dedupe_seam_words(words: List[Dict[str, Any]], *, min_overlap_ratio: float = 0.5) -> List[Dict[str, Any]]:
     """
+    Drop words transcribed by two overlapping chunks, keeping the more reliable copy.
 
-    chunk_path = Path(chunk["path"])
-    with chunk_path.open("rb") as audio_file:
-        response = client.audio.transcriptions.create(
-            model=model,
-            file=audio_file,
-            response_format="verbose_json",
-            timestamp_granularities=["word"],
-        )
+    ``words`` must be sorted by start time and carry the ``_chunk`` and
+    ``_edge_distance`` bookkeeping keys, which are stripped from the result.
+    """
+
+    kept: List[Dict[str, Any]] = []
+    for word in words:
+        previous = kept[-1] if kept else None
+        if previous is not None and previous["_chunk"] != word["_chunk"]:
+            shared = min(previous["end"], word["end"]) - max(previous["start"], word["start"])
+            shortest = min(previous["end"] - previous["start"], word["end"] - word["start"])
+            if shortest <= 0:
+                is_duplicate = shared >= 0 and _word_key(previous) == _word_key(word)
+            else:
+                is_duplicate = shared / shortest >= min_overlap_ratio
+            if is_duplicate:
+                if _word_score(word) > _word_score(previous):
+                    kept[-1] = word
+                continue
+        kept.append(word)
+
+    for word in kept:
+        word.pop("_chunk", None)
+        word.pop("_edge_distance", None)
+    return kept
+
+
+def _word_key(word: Dict[str, Any]) -> str:
+    return "".join(ch for ch in str(word.get("word") or word.get("text") or "").lower() if ch.isalnum())
+
+
+def _word_score(word: Dict[str, Any]) -> Tuple[float, float]:
+    """Rank duplicate words by ASR confidence when present, then by distance from the cut."""
 
-    return _normalise_response(response)
+    confidence = word.get("probability", word.get("confidence"))
+    if confidence is None and word.get("logprob") is not None:
+        confidence = math.exp(float(word["logprob"]))
+    return (float(confidence) if confidence is not None else 0.0, float(word.get("_edge_distance", 0.0)))
 
 
-def _normalise_response(response: Any) -> Dict[str, Any]:
-    """Ensure the OpenAI response is a standard dictionary."""
+def _journal_key(chunk: Dict[str, Any], chunks_dir: Path) -> str:
+    """Identify a chunk by its path under the chunk cache, which changes whenever it is re-cut."""
 
-    if isinstance(response, dict):
-        return response
-    if hasattr(response, "to_dict"):
-        return response.to_dict()  # type: ignore[attr-defined]
-    if hasattr(response, "model_dump"):
-        return response.model_dump()  # type: ignore[attr-defined]
-    if isinstance(response, (bytes, bytearray)):
-        response = response.decode("utf-8")
-    if isinstance(response, str):
-        return json.loads(response)
-    return json.loads(json.dumps(response, default=str))
+    return os.path.relpath(Path(chunk["path"]), chunks_dir)
+
+
+def _chunk_transcript_path(transcripts_dir: Path, chunk: Dict[str, Any]) -> Path:
+    return transcripts_dir / f"{Path(chunk['path']).stem}.whisper.json"
+
+
+def transcribe_chunk(client: OpenAI, chunk: Dict[str, Any], model: str) -> Dict[str, Any]:
+    """
+    Transcribe a single chunk using the OpenAI client and return the verbose JSON payload.
+    """
+
+    backend = OpenAIBackend(
+        client,
+        model=model,
+        response_format=RESPONSE_FORMAT,
+        timestamp_granularities=TIMESTAMP_GRANULARITIES,
+    )
+    return backend.transcribe(chunk)
 
 
-def _build_openai_client(api_key_override: str | None) -> OpenAI:
+def _build_openai_client(api_key_override: str | None, *, base_url: str | None = None) -> OpenAI:
     """Instantiate an OpenAI client using dotenv-backed API key discovery."""
 
     load_dotenv()
     api_key = api_key_override or os.getenv("OPEN_API_TAELGAR") or os.getenv("OPENAI_API_KEY")
+    if not api_key and base_url:
+        api_key = "unused"  # local stand-ins do not check keys
     if not api_key:
         raise SystemExit("OpenAI API key not found. Set OPEN_API_TAELGAR or pass --api-key.")
-    return OpenAI(api_key=api_key)
+    # Retries and backoff are handled by TranscriptionEngine, which also adapts concurrency to 429s.
+    return OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
 
 
 if __name__ == "__main__":